@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import logging
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+from app.config.enums.account import AccountStates
+from app.config.enums.transaction import TransactionType
+from app.config.logging import configure_logging
+from app.config.settings import Settings
+from app.database import initialize_database
+from app.database.repositories.transaction_repository import TransactionRepository
+from app.utils.cpf import generate_cpf
+
+logger = logging.getLogger(__name__)
+
+DAILY_LIMIT = 2000.0
+WITHDRAW_PROBABILITY = 0.3
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA locking_mode = EXCLUSIVE",
+    "PRAGMA cache_size = -512000",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class DatasetGenerator:
+    """Bulk loads owners, accounts and a transaction history straight into the SQLite file.
+
+    Transactions are generated in time order and follow the business rules (no overdraft, daily
+    withdrawal limit), so balances and the daily withdrawal counters stay consistent. The load
+    runs on a raw ``sqlite3`` connection with journaling and fsync disabled and the transaction
+    indexes dropped, so an interrupted run leaves a database that must be regenerated.
+    """
+
+    def __init__(
+        self,
+        accounts: int,
+        transactions_per_account: int,
+        hot_fraction: float,
+        hot_share: float,
+        days: int,
+        batch_size: int,
+        seed: int,
+    ):
+        self._accounts = accounts
+        self._transactions = accounts * transactions_per_account
+        self._hot_accounts = max(1, int(accounts * hot_fraction)) if hot_share > 0 else 0
+        self._hot_share = hot_share
+        self._days = days
+        self._batch_size = batch_size
+        self._random = random.Random(seed)
+
+    def generate(self, database_path: str) -> dict:
+        conn = sqlite3.connect(database_path, isolation_level=None)
+        try:
+            for pragma in LOAD_PRAGMAS:
+                conn.execute(pragma)
+
+            started_at = time.perf_counter()
+            first_owner_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM account_owner").fetchone()[0]
+            first_account_id = conn.execute("SELECT COALESCE(MAX(account_id), 0) + 1 FROM account").fetchone()[0]
+            existing_cpfs = {cpf for cpf, in conn.execute("SELECT cpf FROM account_owner")}
+            period_start = datetime.now().replace(microsecond=0) - timedelta(days=self._days)
+
+            self._insert_accounts(conn, first_owner_id, first_account_id, existing_cpfs, period_start)
+            account_ids = list(range(first_account_id, first_account_id + self._accounts))
+
+            indexes = conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transaction' "
+                "AND sql IS NOT NULL"
+            ).fetchall()
+            for name, _ in indexes:
+                conn.execute(f'DROP INDEX "{name}"')
+
+            balances = self._insert_transactions(conn, account_ids, period_start)
+            conn.execute("BEGIN")
+            conn.executemany(
+                "UPDATE account SET balance = ?, updated_at = ? WHERE account_id = ?",
+                [(round(balance, 2), updated_at, account_id) for account_id, (balance, updated_at) in balances.items()],
+            )
+            conn.execute("COMMIT")
+            loaded_at = time.perf_counter()
+
+            for _, sql in indexes:
+                conn.execute(sql)
+            conn.execute("ANALYZE")
+            indexed_at = time.perf_counter()
+        finally:
+            conn.close()
+
+        return {
+            "owners": self._accounts,
+            "accounts": self._accounts,
+            "transactions": self._transactions,
+            "load_seconds": round(loaded_at - started_at, 2),
+            "index_seconds": round(indexed_at - loaded_at, 2),
+            "rows_per_minute": int(self._transactions / (loaded_at - started_at) * 60) if loaded_at > started_at else 0,
+        }
+
+    def _insert_accounts(
+        self, conn: sqlite3.Connection, first_owner_id: int, first_account_id: int, existing_cpfs: set,
+        period_start: datetime,
+    ):
+        created_at = period_start.isoformat(sep=" ", timespec="microseconds")
+        owners, accounts = [], []
+        cpf_number = first_owner_id
+        for index in range(self._accounts):
+            cpf = generate_cpf(cpf_number)
+            while cpf in existing_cpfs:
+                cpf_number += 1
+                cpf = generate_cpf(cpf_number)
+            cpf_number += 1
+
+            owner_id = first_owner_id + index
+            owners.append((owner_id, f"Synthetic Owner {owner_id}", cpf, created_at))
+            accounts.append((
+                first_account_id + index, "0001", self._random.randint(1, 1000), AccountStates.ACTIVE.value,
+                0, DAILY_LIMIT, owner_id, created_at,
+            ))
+
+        conn.execute("BEGIN")
+        conn.executemany("INSERT INTO account_owner (id, name, cpf, created_at) VALUES (?, ?, ?, ?)", owners)
+        conn.executemany(
+            "INSERT INTO account (account_id, agency, checking_account_number, state, balance, daily_limit, "
+            "account_owner_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            accounts,
+        )
+        conn.execute("COMMIT")
+
+    def _insert_transactions(self, conn: sqlite3.Connection, account_ids: List[int], period_start: datetime) -> dict:
+        balances = {}
+        started_at = time.perf_counter()
+        inserted = 0
+        batch = []
+        for row in self._transaction_rows(account_ids, period_start, balances):
+            batch.append(row)
+            if len(batch) >= self._batch_size:
+                inserted += self._insert_batch(conn, batch)
+                batch = []
+                elapsed = time.perf_counter() - started_at
+                logger.info(
+                    "Inserted %s of %s transactions, %.0f rows/s", inserted, self._transactions, inserted / elapsed,
+                )
+
+        if batch:
+            self._insert_batch(conn, batch)
+        return balances
+
+    @staticmethod
+    def _insert_batch(conn: sqlite3.Connection, batch: List[Tuple]) -> int:
+        conn.execute("BEGIN")
+        conn.executemany(
+            'INSERT INTO "transaction" (account_id, amount, transaction_type, created_at) VALUES (?, ?, ?, ?)',
+            batch,
+        )
+        conn.execute("COMMIT")
+        return len(batch)
+
+    def _transaction_rows(self, account_ids: List[int], period_start: datetime, balances: dict) -> Iterator[Tuple]:
+        """Yields transactions in time order, turning withdrawals that would break a rule into deposits."""
+        rng = self._random
+        hot_accounts = account_ids[:self._hot_accounts]
+        step = timedelta(days=self._days) / max(self._transactions, 1)
+        daily_withdrawn = {}
+        deposit, withdraw = TransactionType.DEPOSIT.value, TransactionType.WITHDRAW.value
+        for index in range(self._transactions):
+            if hot_accounts and rng.random() < self._hot_share:
+                account_id = rng.choice(hot_accounts)
+            else:
+                account_id = rng.choice(account_ids)
+
+            created_at = (period_start + step * index).isoformat(sep=" ", timespec="microseconds")
+            balance = balances.get(account_id, (0.0, None))[0]
+            amount = round(rng.uniform(1, 300), 2)
+            transaction_type = deposit
+            if rng.random() < WITHDRAW_PROBABILITY and amount <= balance:
+                day, withdrawn = daily_withdrawn.get(account_id, (None, 0.0))
+                if day != created_at[:10]:
+                    day, withdrawn = created_at[:10], 0.0
+                if withdrawn + amount <= DAILY_LIMIT:
+                    transaction_type = withdraw
+                    daily_withdrawn[account_id] = (day, withdrawn + amount)
+
+            balances[account_id] = (balance - amount if transaction_type == withdraw else balance + amount, created_at)
+            yield account_id, amount, transaction_type, created_at
+
+
+async def rebuild_counters() -> int:
+    return await TransactionRepository().rebuild_daily_withdrawal_totals()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bulk generate owners, accounts and transaction history into the configured database (DB_PATH).",
+    )
+    parser.add_argument("--accounts", type=int, default=10000, help="Owners/accounts to create.")
+    parser.add_argument("--transactions-per-account", type=int, default=100, help="Average transactions per account.")
+    parser.add_argument("--hot-fraction", type=float, default=0.01, help="Fraction of accounts that are hot.")
+    parser.add_argument("--hot-share", type=float, default=0.5, help="Fraction of transactions sent to hot accounts.")
+    parser.add_argument("--days", type=int, default=365, help="History span in days, ending now.")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Rows inserted per database transaction.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed.")
+    args = parser.parse_args()
+    configure_logging()
+
+    database_path = Settings.get_settings().db_path
+    # The generator writes through its own sqlite3 connection; peewee only creates the schema.
+    initialize_database().close()
+
+    generator = DatasetGenerator(
+        accounts=args.accounts,
+        transactions_per_account=args.transactions_per_account,
+        hot_fraction=args.hot_fraction,
+        hot_share=args.hot_share,
+        days=args.days,
+        batch_size=args.batch_size,
+        seed=args.seed,
+    )
+    logger.info("Generating %s accounts and %s transactions into %s",
+                args.accounts, args.accounts * args.transactions_per_account, database_path)
+    report = generator.generate(database_path)
+
+    started_at = time.perf_counter()
+    report["daily_withdrawal_totals"] = asyncio.run(rebuild_counters())
+    report["counters_seconds"] = round(time.perf_counter() - started_at, 2)
+    logger.info("Dataset report: %s", report)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+from typing import Iterator
+
+from app.config.logging import configure_logging
+from app.database import initialize_database
+from app.services.onboarding_service import OnboardingService
+
+logger = logging.getLogger(__name__)
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    """Streams rows with ``name`` and ``cpf`` from a CSV (with header) or NDJSON file."""
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line in file:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        yield {"raw": line}
+        else:
+            yield from csv.DictReader(file)
+
+
+async def import_file(path: str, rejects_path: str, chunk_size: int):
+    with open(rejects_path, "w", newline="", encoding="utf-8") as rejects_file:
+        rejects = csv.writer(rejects_file)
+        rejects.writerow(["line", "name", "cpf", "reason"])
+
+        def on_reject(line_number: int, row: dict, reason: str):
+            rejects.writerow([line_number, row.get("name"), row.get("cpf"), reason])
+
+        return await OnboardingService().import_owners(read_rows(path), on_reject=on_reject, chunk_size=chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bulk create account owners and their accounts from a CSV or NDJSON file.",
+    )
+    parser.add_argument("path", help="CSV file with a name,cpf header, or NDJSON file (.ndjson/.jsonl).")
+    parser.add_argument("--rejects", default=None, help="Where to write rejected rows (default: <path>.rejects.csv).")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows inserted per database transaction.")
+    args = parser.parse_args()
+    configure_logging()
+    initialize_database()
+
+    rejects_path = args.rejects or f"{os.path.splitext(args.path)[0]}.rejects.csv"
+    report = asyncio.run(import_file(args.path, rejects_path, args.chunk_size))
+    logger.info("Import report: %s. Rejected rows written to %s", report.dict(), rejects_path)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+import logging
+
+from app.config.logging import configure_logging
+from app.database import initialize_database
+from app.database.repositories.transaction_repository import TransactionRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(account_id: int = None) -> int:
+    transaction_repository = TransactionRepository()
+    return await transaction_repository.rebuild_daily_withdrawal_totals(account_id=account_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Regenerate the daily_withdrawal_total counters from the transaction ledger.",
+    )
+    parser.add_argument("--account-id", type=int, default=None, help="Only rebuild the counters of this account.")
+    args = parser.parse_args()
+    configure_logging()
+    initialize_database()
+
+    logger.info("Rebuilding daily withdrawal totals for account: %s", args.account_id or 'all')
+    rows = asyncio.run(rebuild(account_id=args.account_id))
+    logger.info("Rebuilt %s daily withdrawal totals", rows)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class DatabaseProfile(str, Enum):
+    DURABLE = "durable"
+    THROUGHPUT = "throughput"
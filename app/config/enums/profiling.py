@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ProfileSortKey(str, Enum):
+    TOTTIME = "tottime"
+    CUMULATIVE = "cumulative"
+    NCALLS = "ncalls"
@@ -4,3 +4,8 @@ from enum import Enum
 class TransactionType(Enum):
     DEPOSIT = 1
     WITHDRAW = 2
+
+
+class StatementExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
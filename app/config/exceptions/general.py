@@ -55,3 +55,33 @@ class DailyLimitReached(ExceptionMessageBuilder):
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
         super(DailyLimitReached, self).__init__(ex_info=ex_info)
+
+
+class DatabaseBusy(ExceptionMessageBuilder):
+    def __init__(self, ex_info: ExceptionInterface = None, object_name: str = ""):
+        ex_info = ex_info or ExceptionInterface(
+            title="Service busy",
+            message="Too many pending database operations, try again later.",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+        super(DatabaseBusy, self).__init__(ex_info=ex_info)
+
+
+class InvalidCursor(ExceptionMessageBuilder):
+    def __init__(self, ex_info: ExceptionInterface = None, object_name: str = ""):
+        ex_info = ex_info or ExceptionInterface(
+            title="Invalid cursor",
+            message="The pagination cursor is malformed.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+        super(InvalidCursor, self).__init__(ex_info=ex_info)
+
+
+class DebugAccessDenied(ExceptionMessageBuilder):
+    def __init__(self, ex_info: ExceptionInterface = None, object_name: str = ""):
+        ex_info = ex_info or ExceptionInterface(
+            title="Access denied",
+            message="Debug endpoints require the X-Profile header with the profiling token.",
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+        super(DebugAccessDenied, self).__init__(ex_info=ex_info)
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import os
+from typing import Optional
+
 from pydantic import BaseSettings, Field
 
+from app.config.enums.database import DatabaseProfile
+
 _settings = None
 
 
@@ -11,6 +16,211 @@ class Settings(BaseSettings):
         default=8000,
         description="Set this locally if you want to start the server on a port other than the default.",
     )
+    fast_api_host: str = Field(
+        env="FAST_API_HOST",
+        default="0.0.0.0",
+        description="Interface the server binds to.",
+    )
+    fast_api_workers: int = Field(
+        env="FAST_API_WORKERS",
+        default=1,
+        description="Number of worker processes serving the API.",
+    )
+    fast_api_backlog: int = Field(
+        env="FAST_API_BACKLOG",
+        default=2048,
+        description="Maximum number of pending connections waiting to be accepted.",
+    )
+    fast_api_keep_alive_seconds: int = Field(
+        env="FAST_API_KEEP_ALIVE_SECONDS",
+        default=5,
+        description="How long an idle keep-alive connection stays open.",
+    )
+    fast_api_limit_concurrency: Optional[int] = Field(
+        env="FAST_API_LIMIT_CONCURRENCY",
+        default=None,
+        description="Maximum concurrent connections or tasks per worker before answering 503.",
+    )
+    fast_api_graceful_shutdown_seconds: int = Field(
+        env="FAST_API_GRACEFUL_SHUTDOWN_SECONDS",
+        default=30,
+        description="How long a worker waits for in-flight requests and queued writes on shutdown.",
+    )
+    db_path: str = Field(
+        env="DB_PATH",
+        default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "accounts.db"),
+        description="SQLite database file.",
+    )
+    db_profile: DatabaseProfile = Field(
+        env="DB_PROFILE",
+        default=DatabaseProfile.DURABLE,
+        description="Named SQLite pragma profile: durable (fsync on every commit) or throughput.",
+    )
+    db_journal_mode: Optional[str] = Field(
+        env="DB_JOURNAL_MODE", default=None, description="Overrides the profile journal_mode."
+    )
+    db_synchronous: Optional[str] = Field(
+        env="DB_SYNCHRONOUS", default=None, description="Overrides the profile synchronous level."
+    )
+    db_cache_size: Optional[int] = Field(
+        env="DB_CACHE_SIZE", default=None, description="Overrides the profile cache_size (negative values are KiB)."
+    )
+    db_mmap_size: Optional[int] = Field(
+        env="DB_MMAP_SIZE", default=None, description="Overrides the profile mmap_size in bytes."
+    )
+    db_busy_timeout_ms: Optional[int] = Field(
+        env="DB_BUSY_TIMEOUT_MS", default=None, description="Overrides the profile busy_timeout in milliseconds."
+    )
+    db_temp_store: Optional[str] = Field(
+        env="DB_TEMP_STORE", default=None, description="Overrides the profile temp_store."
+    )
+    db_reader_max_workers: int = Field(
+        env="DB_READER_MAX_WORKERS",
+        default=4,
+        description="Number of reader threads (and read-only SQLite connections) serving read repository calls.",
+    )
+    db_executor_max_queue_size: int = Field(
+        env="DB_EXECUTOR_MAX_QUEUE_SIZE",
+        default=1000,
+        description="Maximum number of repository calls waiting on each executor before new calls are rejected.",
+    )
+    db_slow_query_threshold_ms: float = Field(
+        env="DB_SLOW_QUERY_THRESHOLD_MS",
+        default=100.0,
+        description="Statements slower than this are written to the slow-query log. Set 0 to disable it.",
+    )
+    db_slow_query_log_params: bool = Field(
+        env="DB_SLOW_QUERY_LOG_PARAMS",
+        default=False,
+        description="Include the statement parameters in the slow-query log instead of redacting them.",
+    )
+    db_slow_query_explain: bool = Field(
+        env="DB_SLOW_QUERY_EXPLAIN",
+        default=True,
+        description="Attach EXPLAIN QUERY PLAN the first time each slow statement shape is logged.",
+    )
+    db_verify_query_plans: bool = Field(
+        env="DB_VERIFY_QUERY_PLANS",
+        default=True,
+        description="Check at startup that the hot queries are served by indexes.",
+    )
+    openapi_cache_path: Optional[str] = Field(
+        env="OPENAPI_CACHE_PATH",
+        default=None,
+        description="File the generated OpenAPI schema is kept in across restarts. Unset keeps it in memory only.",
+    )
+    statement_default_page_size: int = Field(
+        env="STATEMENT_DEFAULT_PAGE_SIZE",
+        default=100,
+        description="Statement rows returned when the client does not send a limit.",
+    )
+    statement_max_page_size: int = Field(
+        env="STATEMENT_MAX_PAGE_SIZE",
+        default=500,
+        description="Largest page a client can request from the paginated statement endpoint.",
+    )
+    statement_export_chunk_size: int = Field(
+        env="STATEMENT_EXPORT_CHUNK_SIZE",
+        default=1000,
+        description="Number of rows read from the database per chunk when streaming a statement export.",
+    )
+    batch_max_items: int = Field(
+        env="BATCH_MAX_ITEMS",
+        default=10000,
+        description="Maximum number of items accepted by the batch transaction endpoint.",
+    )
+    batch_group_size: int = Field(
+        env="BATCH_GROUP_SIZE",
+        default=1000,
+        description="Number of batch items applied per database transaction.",
+    )
+    transaction_writer_max_batch_size: int = Field(
+        env="TRANSACTION_WRITER_MAX_BATCH_SIZE",
+        default=64,
+        description="Maximum number of deposits/withdrawals committed together by the writer queue.",
+    )
+    transaction_writer_max_linger_ms: float = Field(
+        env="TRANSACTION_WRITER_MAX_LINGER_MS",
+        default=1.0,
+        description="How long the writer queue waits for more requests before committing a partial batch.",
+    )
+    account_cache_max_size: int = Field(
+        env="ACCOUNT_CACHE_MAX_SIZE",
+        default=10000,
+        description="Number of accounts kept in the in-process read cache. Set 0 to disable it.",
+    )
+    account_cache_ttl_seconds: float = Field(
+        env="ACCOUNT_CACHE_TTL_SECONDS",
+        default=30.0,
+        description="How long a cached account is served. Bounds staleness across processes.",
+    )
+    account_cache_multi_worker: bool = Field(
+        env="ACCOUNT_CACHE_MULTI_WORKER",
+        default=False,
+        description=(
+            "Keep the per-worker account cache on with FAST_API_WORKERS > 1, accepting reads up to the TTL stale."
+        ),
+    )
+    tracing_sample_rate: float = Field(
+        env="TRACING_SAMPLE_RATE",
+        default=0.0,
+        description="Fraction of requests traced span by span. Set 0 to disable tracing.",
+    )
+    tracing_buffer_size: int = Field(
+        env="TRACING_BUFFER_SIZE",
+        default=1000,
+        description="Number of recent traces kept in memory for the /debug/traces endpoint.",
+    )
+    tracing_token: Optional[str] = Field(
+        env="TRACING_TOKEN",
+        default=None,
+        description="Secret required in the X-Trace-Token header by the /debug/traces routes. Unset unmounts them.",
+    )
+    tracing_export_path: Optional[str] = Field(
+        env="TRACING_EXPORT_PATH",
+        default=None,
+        description="JSON Lines file every sampled trace is appended to.",
+    )
+    profiling_sample_rate: float = Field(
+        env="PROFILING_SAMPLE_RATE",
+        default=0.0,
+        description="Fraction of requests run under cProfile. Set 0 to only profile on request.",
+    )
+    profiling_token: Optional[str] = Field(
+        env="PROFILING_TOKEN",
+        default=None,
+        description="Secret that, sent in the X-Profile header, profiles that request. Unset disables the header.",
+    )
+    profiling_top_n: int = Field(
+        env="PROFILING_TOP_N",
+        default=30,
+        description="Number of most expensive functions kept per profile.",
+    )
+    profiling_buffer_size: int = Field(
+        env="PROFILING_BUFFER_SIZE",
+        default=100,
+        description="Number of recent request profiles kept in memory for the /debug/profiles endpoint.",
+    )
+    log_level: str = Field(
+        env="LOG_LEVEL",
+        default="INFO",
+        description="Root log level.",
+    )
+    log_levels: str = Field(
+        env="LOG_LEVELS",
+        default="",
+        description="Per-logger levels, e.g. 'app.database=WARNING,uvicorn.access=ERROR'.",
+    )
+    log_format: str = Field(
+        env="LOG_FORMAT",
+        default="json",
+        description="json for one structured record per line, text for human-readable lines.",
+    )
+    log_success_sample_rate: float = Field(
+        env="LOG_SUCCESS_SAMPLE_RATE",
+        default=1.0,
+        description="Fraction of the application's INFO records that are kept. Warnings and errors are never sampled.",
+    )
 
     @classmethod
     def get_settings(cls) -> Settings:
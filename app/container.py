@@ -0,0 +1,86 @@
+import contextlib
+import logging
+import time
+from typing import Dict
+
+from app.config.settings import Settings
+from app.database import connect_database, ensure_schema
+from app.database.cache import get_account_cache
+from app.database.executor import get_reader_executor, get_writer_executor, shutdown_database_executors
+from app.database.query_plan import verify_query_plans
+from app.database.repositories.account_owner_repository import AccountOwnerRepository
+from app.database.repositories.account_repository import AccountRepository
+from app.database.repositories.transaction_repository import TransactionRepository
+from app.database.transaction_writer import get_transaction_writer
+from app.services.account_service import AccountService
+from app.services.transaction_service import TransactionService
+from app.utils.startup import get_startup_report
+
+logger = logging.getLogger(__name__)
+
+
+class Container:
+    """The application's long-lived objects, built once by the lifespan and shared by every request.
+
+    ``start`` builds them in dependency order, timing each phase into ``startup_timings``
+    (milliseconds); ``close`` tears them down in reverse order.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.startup_timings: Dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def _phase(self, name: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_timings[name] = round((time.perf_counter() - started_at) * 1000, 3)
+
+    def start(self):
+        with self._phase("database"):
+            self.database = connect_database()
+
+        with self._phase("schema_check"):
+            if ensure_schema(self.database):
+                logger.info("Created or updated the database schema")
+
+        if self.settings.db_verify_query_plans:
+            with self._phase("query_plans"):
+                verify_query_plans()
+
+        with self._phase("infrastructure"):
+            self.account_cache = get_account_cache()
+            self.reader_executor = get_reader_executor()
+            self.writer_executor = get_writer_executor()
+            self.transaction_writer = get_transaction_writer()
+
+        with self._phase("repositories"):
+            self.account_repository = AccountRepository()
+            self.account_owner_repository = AccountOwnerRepository()
+            self.transaction_repository = TransactionRepository()
+
+        with self._phase("services"):
+            self.account_service = AccountService(
+                account_repository=self.account_repository,
+                account_owner_repository=self.account_owner_repository,
+            )
+            self.transaction_service = TransactionService(
+                account_repository=self.account_repository,
+                transaction_repository=self.transaction_repository,
+                transaction_writer=self.transaction_writer,
+            )
+
+        report = get_startup_report()
+        for name, duration_ms in self.startup_timings.items():
+            report.add(name, duration_ms)
+        logger.info(
+            "Application container started in %.1f ms: %s", sum(self.startup_timings.values()), self.startup_timings
+        )
+
+    async def close(self):
+        logger.info("Draining queued transactions before shutdown")
+        await self.transaction_writer.close()
+        await shutdown_database_executors()
+        self.database.close()
@@ -1,16 +1,77 @@
+import zlib
+
+from peewee import SqliteDatabase
+
 from app.database.models.account import AccountEntity
 
 from app.database.models.account_owner import AccountOwnerEntity
+from app.database.models.daily_withdrawal_total import DailyWithdrawalTotalEntity
 from app.database.models.transaction import TransactionEntity
-from app.database.provider import DataBaseProvider
+from app.database.provider import DataBaseProvider, initialization_lock
 
 models = [
     AccountOwnerEntity,
     AccountEntity,
     TransactionEntity,
+    DailyWithdrawalTotalEntity,
 ]
 
 provider = DataBaseProvider.get_provider()
 db = provider
-db.connect()
-db.create_tables(models=[*models])
+
+
+def schema_fingerprint() -> int:
+    """Checksum of the tables, columns and indexes declared by ``models``.
+
+    Built from the model metadata instead of the generated DDL, so computing it does not pay
+    for peewee's SQL compilation. Masked to 31 bits to fit SQLite's signed ``user_version``.
+    """
+    parts = []
+    for model in models:
+        meta = model._meta
+        parts.append(repr((meta.table_name, meta.indexes, meta.constraints)))
+        for field in meta.sorted_fields:
+            rel_model = getattr(field, "rel_model", None)
+            parts.append(repr((
+                field.column_name, field.field_type, getattr(field, "max_length", None), field.null,
+                field.unique, field.index, field.primary_key, rel_model and rel_model._meta.table_name,
+            )))
+    return zlib.crc32("\n".join(parts).encode()) & 0x7FFFFFFF
+
+
+def connect_database():
+    """Connects the calling thread, applying the configured pragmas."""
+    db.connect(reuse_if_open=True)
+    DataBaseProvider.log_effective_pragmas(db)
+    return db
+
+
+def ensure_schema(database: SqliteDatabase = db) -> bool:
+    """Creates any missing table or index, unless the file already holds this schema.
+
+    The fingerprint of the schema is kept in ``PRAGMA user_version`` once the tables exist, so a
+    restart against an up-to-date file costs one pragma read instead of a ``CREATE ... IF NOT
+    EXISTS`` round per table and index. Returns whether the DDL had to run.
+    """
+    fingerprint = schema_fingerprint()
+    if database.pragma("user_version") == fingerprint:
+        return False
+
+    with initialization_lock(database.database):
+        # Another worker may have created the schema while this one waited for the lock.
+        if database.pragma("user_version") == fingerprint:
+            return False
+        database.create_tables(models=[*models])
+        database.pragma("user_version", fingerprint)
+    return True
+
+
+def initialize_database():
+    """Connects the calling thread and creates any missing table.
+
+    Run once at startup (the application container, or a maintenance command) rather than on import,
+    so importing a repository never touches the database file.
+    """
+    connect_database()
+    ensure_schema()
+    return db
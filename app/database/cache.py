@@ -0,0 +1,174 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from app.config.settings import Settings
+from app.interfaces.account import AccountInterface
+from app.utils.metrics import registry, render_stats
+
+_account_cache = None
+_account_cache_lock = threading.Lock()
+
+
+class AccountCache:
+    """In-process LRU cache of ``AccountInterface`` keyed by ``account_id`` with a TTL and a size bound.
+
+    Keys map onto a fixed set of generation counters that ``invalidate`` bumps, so a read that started
+    before a write committed cannot put the row it read back into the cache afterwards.
+    """
+
+    GENERATION_STRIPES = 1024
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._generations = [0] * self.GENERATION_STRIPES
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0
+
+    def get(self, account_id: int) -> Optional[AccountInterface]:
+        with self._lock:
+            entry = self._entries.get(account_id)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, account = entry
+            if expires_at <= time.monotonic():
+                del self._entries[account_id]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(account_id)
+            self._hits += 1
+            return account.copy()
+
+    def generation(self, account_id: int) -> int:
+        with self._lock:
+            return self._generations[account_id % self.GENERATION_STRIPES]
+
+    def set(self, account_id: int, account: AccountInterface, generation: int = None):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generations[account_id % self.GENERATION_STRIPES]:
+                return
+
+            self._entries[account_id] = (time.monotonic() + self._ttl_seconds, account)
+            self._entries.move_to_end(account_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, account_ids: Iterable[int]):
+        with self._lock:
+            for account_id in account_ids:
+                self._entries.pop(account_id, None)
+                self._generations[account_id % self.GENERATION_STRIPES] += 1
+                self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generations = [generation + 1 for generation in self._generations]
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "ttl_seconds": self._ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+def account_cache_max_size(settings: Settings) -> int:
+    """The configured cache size, or 0 when several workers would serve each other's stale balances.
+
+    Writes only invalidate the cache of the worker that made them, so with more than one worker a
+    client could read back an old balance right after its own deposit; that needs an explicit opt-in.
+    """
+    if settings.fast_api_workers > 1 and not settings.account_cache_multi_worker:
+        return 0
+    return settings.account_cache_max_size
+
+
+def get_account_cache() -> AccountCache:
+    global _account_cache
+    if _account_cache is None:
+        with _account_cache_lock:
+            if _account_cache is None:
+                settings = Settings.get_settings()
+                _account_cache = AccountCache(
+                    max_size=account_cache_max_size(settings),
+                    ttl_seconds=settings.account_cache_ttl_seconds,
+                )
+
+    return _account_cache
+
+
+def collect_account_cache_stats():
+    if _account_cache is not None:
+        yield from render_stats("account_cache", "Account cache", _account_cache.get_stats())
+
+
+registry.register_collector(collect_account_cache_stats)
+
+
+def read_through_account_cache(func):
+    """Serves ``func(self, account_id)`` from the account cache, loading and caching it on a miss."""
+
+    @functools.wraps(func)
+    async def wrapper(self, account_id: int) -> AccountInterface:
+        cache = get_account_cache()
+        account = cache.get(account_id)
+        if account is not None:
+            return account
+
+        generation = cache.generation(account_id)
+        account = await func(self, account_id)
+        cache.set(account_id, account, generation=generation)
+        return account
+
+    return wrapper
+
+
+def invalidate_account_cache(account_ids: Callable[..., Iterable[int]] = None):
+    """Drops the accounts touched by a mutating repository method once its transaction has committed.
+
+    ``account_ids`` receives the method arguments and returns the affected ids; without it the
+    whole cache is cleared.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            result = await func(self, *args, **kwargs)
+            cache = get_account_cache()
+            if account_ids is None:
+                cache.clear()
+            else:
+                cache.invalidate(account_ids(*args, **kwargs))
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,191 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config.exceptions.general import DatabaseBusy
+from app.config.settings import Settings
+from app.database import db
+from app.database.provider import current_repository_method
+from app.utils.metrics import registry, render_stats
+from app.utils.profiling import current_profile
+from app.utils.tracing import span
+
+_reader_executor = None
+_writer_executor = None
+_executor_lock = threading.Lock()
+
+
+class DatabaseExecutor:
+    """Bounded thread pool that runs blocking peewee calls off the event loop.
+
+    Each worker thread opens its own SQLite connection (peewee keeps connection
+    state per thread), so at most ``max_workers`` connections are ever open.
+    Read-only executors open ``mode=ro`` connections.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int, read_only: bool = False):
+        self._max_workers = max_workers
+        self._max_queue_size = max_queue_size
+        self._read_only = read_only
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="db-reader" if read_only else "db-writer",
+            initializer=self._init_worker,
+            initargs=(read_only,),
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._cancelled = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @staticmethod
+    def _init_worker(read_only: bool):
+        if read_only:
+            db.use_read_only_connections()
+        db.connect(reuse_if_open=True)
+
+    async def run(self, func, *args, **kwargs):
+        with self._lock:
+            if self._queued >= self._max_queue_size:
+                self._rejected += 1
+                raise DatabaseBusy()
+            self._queued += 1
+            self._submitted += 1
+
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, time.perf_counter(), func, args, kwargs)
+        try:
+            future = self._pool.submit(call)
+        except RuntimeError:
+            # Submitted after shutdown: no worker will ever take the call and release its slot.
+            with self._lock:
+                self._queued -= 1
+                self._submitted -= 1
+                self._rejected += 1
+            raise
+        future.add_done_callback(self._release_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _release_cancelled(self, future):
+        # A call cancelled while still queued (its awaiting task was cancelled) never runs ``_call``.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._cancelled += 1
+
+    def _call(self, submitted_at: float, func, args, kwargs):
+        wait = time.perf_counter() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        method = getattr(func, "__qualname__", "other")
+        current_repository_method.set(method)
+        profile = current_profile.get()
+        try:
+            with span(method, "repository", wait_ms=round(wait * 1000, 3)):
+                if profile is not None:
+                    return profile.run_call(func, *args, **kwargs)
+                return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            started = self._submitted - self._queued - self._cancelled
+            return {
+                "read_only": self._read_only,
+                "max_workers": self._max_workers,
+                "max_queue_size": self._max_queue_size,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "cancelled": self._cancelled,
+                "avg_wait_seconds": self._total_wait / started if started else 0.0,
+                "max_wait_seconds": self._max_wait,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+
+def get_reader_executor() -> DatabaseExecutor:
+    global _reader_executor
+    if _reader_executor is None:
+        with _executor_lock:
+            if _reader_executor is None:
+                settings = Settings.get_settings()
+                _reader_executor = DatabaseExecutor(
+                    max_workers=settings.db_reader_max_workers,
+                    max_queue_size=settings.db_executor_max_queue_size,
+                    read_only=True,
+                )
+
+    return _reader_executor
+
+
+def get_writer_executor() -> DatabaseExecutor:
+    """Single-thread executor owning the only read-write connection, so writes never contend for the lock."""
+    global _writer_executor
+    if _writer_executor is None:
+        with _executor_lock:
+            if _writer_executor is None:
+                settings = Settings.get_settings()
+                _writer_executor = DatabaseExecutor(
+                    max_workers=1,
+                    max_queue_size=settings.db_executor_max_queue_size,
+                )
+
+    return _writer_executor
+
+
+def collect_executor_stats():
+    for name, executor in (("reader", _reader_executor), ("writer", _writer_executor)):
+        if executor is not None:
+            yield from render_stats(f"db_{name}_executor", f"Database {name} executor", executor.get_stats())
+
+
+registry.register_collector(collect_executor_stats)
+
+
+async def shutdown_database_executors():
+    """Waits for running repository calls, closes the writer connection and stops both pools."""
+    global _reader_executor, _writer_executor
+    with _executor_lock:
+        reader_executor, _reader_executor = _reader_executor, None
+        writer_executor, _writer_executor = _writer_executor, None
+
+    if writer_executor is not None:
+        await writer_executor.run(db.close)
+        writer_executor.shutdown(wait=True)
+    if reader_executor is not None:
+        reader_executor.shutdown(wait=True)
+
+
+def run_in_executor(func=None, *, read_only: bool = False):
+    """Turns a blocking repository method into a coroutine served by the reader or the writer executor."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            executor = get_reader_executor() if read_only else get_writer_executor()
+            return await executor.run(func, *args, **kwargs)
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
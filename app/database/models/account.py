@@ -7,7 +7,6 @@ from peewee import (
     DateTimeField,
     DecimalField,
 )
-from playhouse.shortcuts import model_to_dict
 
 from app.database.models.account_owner import AccountOwnerEntity
 from app.database.provider import BaseModel
@@ -16,6 +15,13 @@ from app.config.enums.account import AccountStates
 
 from app.interfaces.account import AccountInterface
 
+# Owner columns carried next to the account ones, so the nested owner comes from the same statement.
+OWNER_COLUMNS = {
+    "owner_name": AccountOwnerEntity.name,
+    "owner_cpf": AccountOwnerEntity.cpf,
+    "owner_created_at": AccountOwnerEntity.created_at,
+}
+
 
 class AccountEntity(BaseModel):
     account_id = AutoField(primary_key=True)
@@ -32,6 +38,53 @@ class AccountEntity(BaseModel):
     class Meta:
         table_name = "account"
 
-    def to_interface(self):
-        fields = model_to_dict(self)
-        return AccountInterface(**fields)
+    @classmethod
+    def select_with_owner(cls):
+        """Account rows joined with their owner's columns, as flat dicts for ``interface_from_row``."""
+        return (cls
+                .select(cls, *(column.alias(name) for name, column in OWNER_COLUMNS.items()))
+                .join(AccountOwnerEntity)
+                .dicts())
+
+    @classmethod
+    def returning_with_owner(cls) -> list:
+        """``RETURNING`` columns of a write that also bring the owner, through correlated subqueries
+        (SQLite does not let ``RETURNING`` reference joined tables)."""
+        return [cls] + [
+            (AccountOwnerEntity
+             .select(column)
+             .where(AccountOwnerEntity.id == cls.account_owner)
+             .alias(name))
+            for name, column in OWNER_COLUMNS.items()
+        ]
+
+    @staticmethod
+    def interface_from_row(row: dict) -> AccountInterface:
+        """Trusted conversion of an account row, skipping validation.
+
+        Rows carrying the ``OWNER_COLUMNS`` get the owner nested, like the responses always had;
+        the others keep the owner id.
+        """
+        account_owner = row["account_owner"]
+        if "owner_name" in row:
+            account_owner = AccountOwnerEntity.interface_from_row({
+                "id": account_owner,
+                "name": row["owner_name"],
+                "cpf": row["owner_cpf"],
+                # Subquery columns in RETURNING come back untyped.
+                "created_at": AccountOwnerEntity.created_at.python_value(row["owner_created_at"]),
+            })
+
+        return AccountInterface.from_row({
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "deleted_at": None,
+            "account_id": row["account_id"],
+            "agency": row["agency"],
+            "checking_account_number": row["checking_account_number"],
+            "state": AccountStates(row["state"]),
+            "balance": float(row["balance"]),
+            "daily_limit": float(row["daily_limit"]),
+            "account_owner": account_owner,
+            "closed_at": row["closed_at"],
+        })
@@ -5,7 +5,6 @@ from peewee import (
     DateTimeField
 )
 from app.database.provider import BaseModel
-from playhouse.shortcuts import model_to_dict
 
 from app.interfaces.account_owner import AccountOwnerInterface
 
@@ -19,6 +18,14 @@ class AccountOwnerEntity(BaseModel):
     class Meta:
         table_name = "account_owner"
 
-    def to_interface(self):
-        fields = model_to_dict(self)
-        return AccountOwnerInterface(**fields)
+    @staticmethod
+    def interface_from_row(row: dict) -> AccountOwnerInterface:
+        """Trusted conversion of an owner row (``.dicts()`` projection or ``__data__``), skipping validation."""
+        return AccountOwnerInterface.from_row({
+            "created_at": row["created_at"],
+            "updated_at": None,
+            "deleted_at": None,
+            "id": row["id"],
+            "name": row["name"],
+            "cpf": row["cpf"],
+        })
@@ -0,0 +1,19 @@
+from peewee import (
+    CompositeKey,
+    DateField,
+    DecimalField,
+    ForeignKeyField,
+)
+
+from app.database.models.account import AccountEntity
+from app.database.provider import BaseModel
+
+
+class DailyWithdrawalTotalEntity(BaseModel):
+    account = ForeignKeyField(AccountEntity, backref="daily_withdrawal_totals")
+    day = DateField()
+    total = DecimalField(default=0.0)
+
+    class Meta:
+        table_name = "daily_withdrawal_total"
+        primary_key = CompositeKey("account", "day")
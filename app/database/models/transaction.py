@@ -6,7 +6,6 @@ from peewee import (
     DateTimeField,
     DecimalField,
 )
-from playhouse.shortcuts import model_to_dict
 
 from app.database.models.account import AccountEntity
 from app.database.provider import BaseModel
@@ -15,14 +14,27 @@ from app.interfaces.transaction import TransactionInterface
 
 class TransactionEntity(BaseModel):
     transaction_id = AutoField(primary_key=True)
-    account = ForeignKeyField(AccountEntity, backref="transactions")
+    account = ForeignKeyField(AccountEntity, backref="transactions", index=False)
     amount = DecimalField()
     transaction_type = IntegerField()  # 'deposit' or 'withdrawal'
     created_at = DateTimeField(default=datetime.now)
 
     class Meta:
         table_name = "transaction"
+        indexes = (
+            (("account", "created_at"), False),
+            (("account", "transaction_type", "created_at"), False),
+        )
 
-    def to_interface(self):
-        fields = model_to_dict(self)
-        return TransactionInterface(**fields)
+    @staticmethod
+    def interface_from_row(row: dict) -> TransactionInterface:
+        """Trusted conversion of a statement row, skipping validation; the account stays an id."""
+        return TransactionInterface.from_row({
+            "created_at": row["created_at"],
+            "updated_at": None,
+            "deleted_at": None,
+            "transaction_id": row["transaction_id"],
+            "account": row["account"],
+            "amount": float(row["amount"]),
+            "transaction_type": row["transaction_type"],
+        })
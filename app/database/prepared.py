@@ -0,0 +1,70 @@
+import threading
+from typing import Callable, Dict, List, Optional
+
+from peewee import Alias, Database, Field, Model, Query, Value
+
+
+class Parameter:
+    def __init__(self, name: str):
+        self.name = name
+
+
+def param(name: str) -> Value:
+    """Placeholder for a value bound when a ``PreparedQuery`` runs.
+
+    The value reaches SQLite as given (no ``db_value`` conversion), so it must already be a type
+    sqlite3 binds: int, float, str, bytes, datetime or None.
+    """
+    return Value(Parameter(name), converter=False)
+
+
+class _CompiledQuery:
+    def __init__(self, query: Query):
+        self.sql, self.params = query.sql()
+        self.keys: List[str] = []
+        self.converters: List[Optional[Callable]] = []
+        for column in query._returning or ():
+            node = column.unwrap() if isinstance(column, Alias) else column
+            # Fields are keyed by name; aliased columns and subqueries by their alias.
+            self.keys.append(node.name if node is column and isinstance(node, Field) else column._alias)
+            self.converters.append(node.python_value if isinstance(node, Field) else None)
+
+
+class PreparedQuery:
+    """A peewee query compiled to SQL once, then run with new ``param`` values on every call.
+
+    Building and compiling a peewee query costs more than SQLite takes to run a primary-key lookup,
+    so the hot repository statements are compiled on first use (per bound database) and their rows
+    come back as dicts keyed like ``.dicts()``, converted by the selected fields.
+    """
+
+    def __init__(self, model: Model, build: Callable[[], Query]):
+        self._model = model
+        self._build = build
+        self._compiled: Dict[Database, _CompiledQuery] = {}
+        self._lock = threading.Lock()
+
+    def _get_compiled(self, database: Database) -> _CompiledQuery:
+        compiled = self._compiled.get(database)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(database)
+                if compiled is None:
+                    compiled = self._compiled[database] = _CompiledQuery(self._build())
+        return compiled
+
+    def rows(self, **values) -> List[dict]:
+        database = self._model._meta.database
+        compiled = self._get_compiled(database)
+        params = [values[value.name] if isinstance(value, Parameter) else value for value in compiled.params]
+        cursor = database.execute_sql(compiled.sql, params)
+        keys, converters = compiled.keys, compiled.converters
+        return [
+            dict(zip(keys, [value if convert is None or value is None else convert(value)
+                            for convert, value in zip(converters, row)]))
+            for row in cursor
+        ]
+
+    def first(self, **values) -> Optional[dict]:
+        rows = self.rows(**values)
+        return rows[0] if rows else None
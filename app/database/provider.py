@@ -1,16 +1,173 @@
-import os
+import contextlib
+import logging
+import pathlib
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
 
 from peewee import Model, SqliteDatabase
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from app.config.enums.database import DatabaseProfile
+from app.config.settings import Settings
+from app.database.slow_query import SlowQueryLog, normalize_sql
+from app.utils.metrics import db_queries_total, db_query_duration_seconds
+from app.utils.tracing import is_tracing, record_span
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PROFILES = {
+    DatabaseProfile.DURABLE: {
+        "journal_mode": "wal",
+        "synchronous": "full",
+        "cache_size": -64000,
+        "mmap_size": 0,
+        "busy_timeout": 5000,
+        "temp_store": "default",
+    },
+    DatabaseProfile.THROUGHPUT: {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "cache_size": -256000,
+        "mmap_size": 268435456,
+        "busy_timeout": 5000,
+        "temp_store": "memory",
+    },
+}
+
+_database = None
+
+current_repository_method: ContextVar[str] = ContextVar("current_repository_method", default="other")
+
+
+class RoutedSqliteDatabase(SqliteDatabase):
+    """SQLite database whose connections are read-only in threads marked as readers.
+
+    peewee keeps one connection per thread, so a thread that calls ``use_read_only_connections``
+    before connecting gets a ``mode=ro`` connection: with WAL it reads a consistent snapshot next to
+    the writer and cannot take the write lock by mistake.
+    """
+
+    def __init__(self, *args, slow_query_log: SlowQueryLog = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._role = threading.local()
+        self._slow_query_log = slow_query_log
+
+    def use_read_only_connections(self):
+        self._role.read_only = True
+
+    @property
+    def is_read_only(self) -> bool:
+        return getattr(self._role, "read_only", False)
+
+    def _connect(self):
+        if not self.is_read_only or self.database == ":memory:":
+            return super()._connect()
+
+        uri = f"{pathlib.Path(self.database).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, timeout=self._timeout, isolation_level=None, uri=True, **self.connect_params)
+        try:
+            self._add_conn_hooks(conn)
+            conn.execute("PRAGMA query_only = 1")
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def execute_sql(self, sql, params=None, commit=None):
+        """Runs a statement, recording its metrics and logging it when slow.
+
+        The duration covers executing the statement up to its first result row; rows fetched
+        later by the caller are not included.
+        """
+        started_at = time.perf_counter()
+        try:
+            return super().execute_sql(sql, params, commit)
+        finally:
+            finished_at = time.perf_counter()
+            duration = finished_at - started_at
+            method = current_repository_method.get()
+            db_queries_total.inc(method)
+            db_query_duration_seconds.observe(duration, method)
+            if is_tracing():
+                record_span("sql", "sql", started_at, finished_at, statement=normalize_sql(sql))
+            if self._slow_query_log is not None:
+                self._slow_query_log.record(self._state.conn, sql, params, duration, method)
+
+    def commit(self):
+        started_at = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            if is_tracing():
+                record_span("sql", "sql", started_at, time.perf_counter(), statement="COMMIT")
+
 
 class DataBaseProvider:
     @staticmethod
-    def get_provider():
-        db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'accounts.db')
-        return SqliteDatabase(db_path)
+    def get_pragmas(settings: Settings) -> dict:
+        pragmas = dict(DATABASE_PROFILES[settings.db_profile])
+        overrides = {
+            "journal_mode": settings.db_journal_mode,
+            "synchronous": settings.db_synchronous,
+            "cache_size": settings.db_cache_size,
+            "mmap_size": settings.db_mmap_size,
+            "busy_timeout": settings.db_busy_timeout_ms,
+            "temp_store": settings.db_temp_store,
+        }
+        pragmas.update({name: value for name, value in overrides.items() if value is not None})
+        return pragmas
+
+    @staticmethod
+    def get_provider() -> RoutedSqliteDatabase:
+        """Returns the process-wide database handle, built once from Settings."""
+        global _database
+        if _database is None:
+            settings = Settings.get_settings()
+            pragmas = DataBaseProvider.get_pragmas(settings)
+            _database = RoutedSqliteDatabase(
+                settings.db_path,
+                pragmas=pragmas,
+                timeout=pragmas["busy_timeout"] / 1000,
+                slow_query_log=SlowQueryLog(
+                    threshold_seconds=settings.db_slow_query_threshold_ms / 1000,
+                    log_params=settings.db_slow_query_log_params,
+                    explain=settings.db_slow_query_explain,
+                ),
+            )
+
+        return _database
+
+    @staticmethod
+    def log_effective_pragmas(database: SqliteDatabase):
+        settings = Settings.get_settings()
+        effective = {
+            name: database.execute_sql(f"PRAGMA {name}").fetchone()[0]
+            for name in DATABASE_PROFILES[settings.db_profile]
+        }
+        logger.info("Database %s ready with profile %s: %s", database.database, settings.db_profile.value, effective)
+
+
+@contextlib.contextmanager
+def initialization_lock(database_path: str):
+    """Serializes database initialization across worker processes that start at the same time."""
+    if fcntl is None or database_path == ":memory:":
+        yield
+        return
+
+    with open(f"{database_path}.init.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 
 class BaseModel(Model):
     class Meta:
-        provider = DataBaseProvider.get_provider()
-        database = provider
+        database = DataBaseProvider.get_provider()
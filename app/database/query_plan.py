@@ -0,0 +1,44 @@
+import logging
+from datetime import date
+from typing import Dict, List
+
+from peewee import SqliteDatabase
+
+from app.database import db
+from app.database.models.transaction import TransactionEntity
+from app.database.repositories.transaction_repository import TransactionRepository
+from app.database.slow_query import find_plan_problems
+
+logger = logging.getLogger(__name__)
+
+
+def hot_queries() -> dict:
+    today = date.today()
+    return {
+        "statement_by_period": TransactionRepository._transactions_by_period_query(0, today, today),
+        "daily_withdrawal_total": TransactionRepository._daily_withdrawal_total_query(0, today),
+        "ledger_withdrawals_by_account": (TransactionRepository
+                                          ._ledger_withdrawals_query()
+                                          .where(TransactionEntity.account == 0)),
+    }
+
+
+def explain_query_plan(query, database: SqliteDatabase = db) -> List[str]:
+    sql, params = query.sql()
+    cursor = database.execute_sql("EXPLAIN QUERY PLAN " + sql, params)
+    return [row[-1] for row in cursor.fetchall()]
+
+
+def verify_query_plans(database: SqliteDatabase = db) -> Dict[str, List[str]]:
+    """Runs EXPLAIN QUERY PLAN over the hot queries and logs the ones not served by an index."""
+    problems = {}
+    for name, query in hot_queries().items():
+        plan = explain_query_plan(query, database)
+        query_problems = find_plan_problems(plan)
+        if query_problems:
+            problems[name] = query_problems
+            logger.warning("Query %s is not fully served by an index: %s", name, plan)
+        else:
+            logger.info("Query %s plan: %s", name, plan)
+
+    return problems
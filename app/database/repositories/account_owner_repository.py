@@ -1,37 +1,48 @@
-from peewee import DoesNotExist
-
 from app.config.exceptions.general import ObjectNotFound
 from app.database import db
+from app.database.cache import invalidate_account_cache
+from app.database.executor import run_in_executor
 from app.database.models.account_owner import AccountOwnerEntity
+from app.database.prepared import PreparedQuery, param
 from app.interfaces.account_owner import AccountOwnerInterface
 
+ACCOUNT_OWNER_QUERY = PreparedQuery(
+    AccountOwnerEntity,
+    lambda: AccountOwnerEntity.select().where(AccountOwnerEntity.id == param("id")),
+)
+
 
 class AccountOwnerRepository:
     def __init__(self):
         pass
 
+    @run_in_executor
     @db.atomic()
-    async def create_account_owner(self, account_owner: AccountOwnerInterface) -> AccountOwnerInterface:
+    def create_account_owner(self, account_owner: AccountOwnerInterface) -> AccountOwnerInterface:
         try:
-            fields = account_owner.dict()
-            account_owner_entity = AccountOwnerEntity.create(**fields)
+            query = (AccountOwnerEntity
+                     .insert(name=account_owner.name, cpf=account_owner.cpf, created_at=account_owner.created_at)
+                     .returning(AccountOwnerEntity)
+                     .dicts())
 
-            return account_owner_entity.to_interface()
+            return AccountOwnerEntity.interface_from_row(next(iter(query.execute())))
         except Exception as e:
             raise e
 
+    @run_in_executor(read_only=True)
     @db.atomic()
-    async def get_account_owner_by_id(self, id: int) -> AccountOwnerInterface:
-        try:
-            query = AccountOwnerEntity.get(AccountOwnerEntity.id == id)
-            return query.to_interface()
-        except DoesNotExist:
+    def get_account_owner_by_id(self, id: int) -> AccountOwnerInterface:
+        row = ACCOUNT_OWNER_QUERY.first(id=id)
+        if row is None:
             raise ObjectNotFound(
                 object_name="account_owner_entity",
             )
+        return AccountOwnerEntity.interface_from_row(row)
 
+    @invalidate_account_cache()
+    @run_in_executor
     @db.atomic()
-    async def delete_account_owner(self, cpf: str):
+    def delete_account_owner(self, cpf: str):
         try:
             query = AccountOwnerEntity.delete().where(AccountOwnerEntity.cpf == cpf)
             query.execute()
@@ -1,12 +1,39 @@
+import random
 from datetime import datetime
-from peewee import DoesNotExist
+from typing import List, Set
+from peewee import chunked, fn
 
 from app.config.enums.account import AccountStates
 from app.config.exceptions.general import ObjectNotFound
 from app.database import db
+from app.database.cache import invalidate_account_cache, read_through_account_cache
+from app.database.executor import run_in_executor
 from app.database.models.account import AccountEntity
+from app.database.models.account_owner import AccountOwnerEntity
+from app.database.prepared import PreparedQuery, param
 
 from app.interfaces.account import AccountInterface
+from app.interfaces.account_owner import AccountOwnerInterface
+
+BULK_CHUNK_SIZE = 500
+
+ACCOUNT_WITH_OWNER_QUERY = PreparedQuery(
+    AccountEntity,
+    lambda: AccountEntity.select_with_owner().where(AccountEntity.account_id == param("account_id")),
+)
+
+# Block, unblock and close only move the state; ``closed_at`` is kept unless a close sets it.
+SET_ACCOUNT_STATE_QUERY = PreparedQuery(
+    AccountEntity,
+    lambda: (AccountEntity
+             .update(
+                 state=param("state"),
+                 updated_at=param("updated_at"),
+                 closed_at=fn.COALESCE(param("closed_at"), AccountEntity.closed_at),
+             )
+             .where(AccountEntity.account_id == param("account_id"))
+             .returning(*AccountEntity.returning_with_owner())),
+)
 
 
 class AccountRepository():
@@ -15,85 +42,125 @@ class AccountRepository():
     ):
         pass
 
+    @run_in_executor
     @db.atomic()
-    async def create_account(self, account: AccountInterface) -> AccountInterface:
+    def create_account(self, account: AccountInterface) -> AccountInterface:
         try:
-            fields = account.dict()
-            account_entity = AccountEntity.create(**fields)
+            query = (AccountEntity
+                     .insert(
+                         agency=account.agency,
+                         checking_account_number=account.checking_account_number,
+                         state=account.state.value,
+                         balance=account.balance,
+                         daily_limit=account.daily_limit,
+                         account_owner=account.account_owner,
+                         created_at=account.created_at,
+                     )
+                     .returning(*AccountEntity.returning_with_owner())
+                     .dicts())
 
-            return account_entity.to_interface()
+            return AccountEntity.interface_from_row(next(iter(query.execute())))
         except Exception as e:
             raise e
 
+    @read_through_account_cache
+    @run_in_executor(read_only=True)
     @db.atomic()
-    async def get_account_by_id(self, account_id: int) -> AccountInterface:
-        try:
-            account_entity = AccountEntity.get(AccountEntity.account_id == account_id)
-            return account_entity.to_interface()
-        except DoesNotExist:
+    def get_account_by_id(self, account_id: int) -> AccountInterface:
+        row = ACCOUNT_WITH_OWNER_QUERY.first(account_id=account_id)
+        if row is None:
             raise ObjectNotFound(
                 object_name="account_entity",
             )
+        return AccountEntity.interface_from_row(row)
 
+    @invalidate_account_cache(lambda account_id: [account_id])
+    @run_in_executor
     @db.atomic()
-    async def block_account(self, account_id: int) -> AccountInterface:
+    def block_account(self, account_id: int) -> AccountInterface:
         try:
-            updated_at = datetime.now()
-            query = AccountEntity.update(
-                state=AccountStates.BLOCKED.value, updated_at=updated_at
-            ).where(AccountEntity.account_id == account_id)
-            query.execute()
-
-            account_entity = AccountEntity.get(AccountEntity.account_id == account_id)
-            return account_entity.to_interface()
+            return self._set_account_state(account_id, AccountStates.BLOCKED)
         except Exception as e:
             raise e
 
+    @invalidate_account_cache(lambda account_id: [account_id])
+    @run_in_executor
     @db.atomic()
-    async def unblock_account(self, account_id: int) -> AccountInterface:
+    def unblock_account(self, account_id: int) -> AccountInterface:
         try:
-            updated_at = datetime.now()
-            query = AccountEntity.update(
-                state=AccountStates.ACTIVE.value, updated_at=updated_at
-            ).where(AccountEntity.account_id == account_id)
-            query.execute()
-
-            account_entity = AccountEntity.get(AccountEntity.account_id == account_id)
-            return account_entity.to_interface()
+            return self._set_account_state(account_id, AccountStates.ACTIVE)
         except Exception as e:
             raise e
     
+    @invalidate_account_cache(lambda account_id, *args, **kwargs: [account_id])
+    @run_in_executor
     @db.atomic()
-    async def close_account(self, account_id: int, state: str) -> AccountInterface:
+    def close_account(self, account_id: int, state: str) -> AccountInterface:
         try:
-            updated_at = datetime.now()
-            closed_at = datetime.now()
-            query = AccountEntity.update(
-                state=AccountStates.CLOSED.value, updated_at=updated_at, closed_at=closed_at
-            ).where(AccountEntity.account_id == account_id)
-            query.execute()
-
-            account_entity = AccountEntity.get(AccountEntity.account_id == account_id)
-            return account_entity.to_interface()
+            return self._set_account_state(account_id, AccountStates.CLOSED, closed_at=datetime.now())
         except Exception as e:
             raise e
 
-    @db.atomic()
-    async def update_account(self, account: AccountInterface) -> AccountInterface:
+    @staticmethod
+    def _set_account_state(account_id: int, state: AccountStates, closed_at: datetime = None) -> AccountInterface:
+        row = SET_ACCOUNT_STATE_QUERY.first(
+            account_id=account_id, state=state.value, updated_at=datetime.now(), closed_at=closed_at
+        )
+        return AccountRepository._account_from_returning(row)
+
+    @staticmethod
+    def _account_from_returning(row: dict) -> AccountInterface:
+        """The new account row comes from the write's RETURNING clause, without a second SELECT."""
+        if row is None:
+            raise ObjectNotFound(
+                object_name="account_entity",
+            )
+        return AccountEntity.interface_from_row(row)
+
+    @run_in_executor
+    @db.atomic("IMMEDIATE")
+    def bulk_create_accounts_with_owners(self, owners: List[AccountOwnerInterface]) -> Set[str]:
+        """Creates the owners and one account for each of them with set-wise statements.
+
+        CPF conflicts are resolved with one lookup per chunk under the write lock; owners whose
+        CPF is already registered are skipped and their CPFs are returned.
+        """
         try:
-            query = AccountEntity.update(
-                agency=account.agency,
-                checking_account_number=account.checking_account_number,
-                state=account.state,
-                balance=account.balance,
-                daily_limit=account.daily_limit,
-                account_owner=account.account_owner.id,
-                updated_at=datetime.now(),
-                closed_at=account.closed_at,
-            ).where(AccountEntity.account_id == account.account_id)
-            query.execute()
-
-            account_entity = AccountEntity.get(AccountEntity.account_id == account.account_id)
-            return account_entity.to_interface()
+            now = datetime.now()
+            existing_cpfs = set()
+            for cpfs in chunked([owner.cpf for owner in owners], BULK_CHUNK_SIZE):
+                existing_cpfs.update(
+                    cpf for cpf, in (AccountOwnerEntity
+                                     .select(AccountOwnerEntity.cpf)
+                                     .where(AccountOwnerEntity.cpf.in_(cpfs))
+                                     .tuples())
+                )
+
+            new_owners = [owner for owner in owners if owner.cpf not in existing_cpfs]
+            for chunk in chunked(new_owners, BULK_CHUNK_SIZE):
+                AccountOwnerEntity.insert_many([
+                    {"name": owner.name, "cpf": owner.cpf, "created_at": now} for owner in chunk
+                ]).execute()
+
+            owner_ids = {}
+            for cpfs in chunked([owner.cpf for owner in new_owners], BULK_CHUNK_SIZE):
+                owner_ids.update(
+                    (AccountOwnerEntity
+                     .select(AccountOwnerEntity.cpf, AccountOwnerEntity.id)
+                     .where(AccountOwnerEntity.cpf.in_(cpfs))
+                     .tuples())
+                )
+
+            for chunk in chunked(new_owners, BULK_CHUNK_SIZE):
+                AccountEntity.insert_many([
+                    {
+                        "checking_account_number": random.randint(1, 1000),
+                        "account_owner": owner_ids[owner.cpf],
+                        "created_at": now,
+                    }
+                    for owner in chunk
+                ]).execute()
+
+            return existing_cpfs
         except Exception as e:
             raise e
@@ -1,54 +1,416 @@
 from datetime import date, datetime, timedelta
-from typing import List
-from peewee import fn
+from decimal import Decimal
+from typing import List, Optional, Tuple, Union
+from peewee import EXCLUDED, Case, chunked, fn
+from peewee import Tuple as ValuesTuple
 
+from app.config.enums.account import AccountStates
 from app.config.enums.transaction import TransactionType
+from app.config.exceptions.general import (
+    DailyLimitReached,
+    ExceptionMessageBuilder,
+    InsufficientBalance,
+    ObjectNotFound,
+    TransactionNotAllowed,
+)
 from app.database import db
+from app.database.cache import invalidate_account_cache
+from app.database.executor import run_in_executor
+from app.database.prepared import PreparedQuery, param
+from app.database.models.account import AccountEntity
+from app.database.models.daily_withdrawal_total import DailyWithdrawalTotalEntity
 from app.database.models.transaction import TransactionEntity
 from app.interfaces.transaction import TransactionInterface
 
+BATCH_CHUNK_SIZE = 500
+
+APPLY_DEPOSIT_QUERY = PreparedQuery(AccountEntity, lambda: TransactionRepository._apply_transaction_query(False))
+APPLY_WITHDRAW_QUERY = PreparedQuery(AccountEntity, lambda: TransactionRepository._apply_transaction_query(True))
+
+# Read in the same transaction when the conditional UPDATE matched no row, to tell which rule failed.
+ACCOUNT_RULES_QUERY = PreparedQuery(
+    AccountEntity,
+    lambda: (AccountEntity
+             .select(
+                 AccountEntity.state,
+                 AccountEntity.balance,
+                 AccountEntity.daily_limit,
+                 (TransactionRepository
+                  ._daily_withdrawal_total_query(param("account_id"), param("day"))
+                  .alias("withdrawn_today")),
+             )
+             .where(AccountEntity.account_id == param("account_id"))),
+)
+
+INSERT_TRANSACTION_QUERY = PreparedQuery(
+    TransactionEntity,
+    lambda: (TransactionEntity
+             .insert(
+                 account=param("account_id"),
+                 amount=param("amount"),
+                 transaction_type=param("transaction_type"),
+                 created_at=param("now"),
+             )
+             .returning(TransactionEntity.transaction_id)),
+)
+
+INCREMENT_DAILY_WITHDRAWAL_TOTAL_QUERY = PreparedQuery(
+    DailyWithdrawalTotalEntity,
+    lambda: (DailyWithdrawalTotalEntity
+             .insert(account=param("account_id"), day=param("day"), total=param("amount"))
+             .on_conflict(
+                 conflict_target=[DailyWithdrawalTotalEntity.account, DailyWithdrawalTotalEntity.day],
+                 update={DailyWithdrawalTotalEntity.total: DailyWithdrawalTotalEntity.total + EXCLUDED.total},
+             )),
+)
+
 
 class TransactionRepository():
 
+    @invalidate_account_cache(lambda transaction: [transaction.account])
+    @run_in_executor
     @db.atomic()
-    async def create_transaction(self, transaction: TransactionInterface) -> TransactionInterface:
+    def apply_transaction(self, transaction: TransactionInterface) -> TransactionInterface:
+        """Moves the account balance and records the transaction in a single database transaction."""
+        return self._apply_transaction(transaction)
+
+    @invalidate_account_cache(lambda transactions: {transaction.account for transaction in transactions})
+    @run_in_executor
+    @db.atomic("IMMEDIATE")
+    def apply_transactions_group(
+        self, transactions: List[TransactionInterface]
+    ) -> List[Union[TransactionInterface, Exception]]:
+        """Applies independent deposits/withdrawals under a single commit (group commit).
+
+        Each transaction runs inside its own savepoint, so a failing one is rolled back alone
+        while the others are kept. The result list is aligned with ``transactions``: the created
+        transaction or the exception raised for each one.
+        """
+        outcomes = []
+        for transaction in transactions:
+            try:
+                with db.atomic():
+                    outcomes.append(self._apply_transaction(transaction))
+            except Exception as e:
+                outcomes.append(e)
+
+        return outcomes
+
+    def _apply_transaction(self, transaction: TransactionInterface) -> TransactionInterface:
+        """The balance is changed by one UPDATE whose WHERE holds every business rule, so it applied
+        exactly when it returned the account row. Otherwise the account is read again, in the same
+        transaction, to tell which rule failed.
+        """
         try:
-            fields = transaction.dict()
-            transaction_entity = TransactionEntity.create(**fields)
+            account_id = transaction.account
+            amount = transaction.amount
+            now = transaction.created_at
+            is_withdraw = transaction.transaction_type == TransactionType.WITHDRAW.value
+
+            update_query = APPLY_WITHDRAW_QUERY if is_withdraw else APPLY_DEPOSIT_QUERY
+            account_row = update_query.first(account_id=account_id, amount=amount, now=now, day=now.date())
+            if account_row is None:
+                raise self._rejection(account_id, amount, now.date())
 
-            return transaction_entity.to_interface()
+            transaction_row = INSERT_TRANSACTION_QUERY.first(
+                account_id=account_id, amount=amount, transaction_type=transaction.transaction_type, now=now,
+            )
+            if is_withdraw:
+                INCREMENT_DAILY_WITHDRAWAL_TOTAL_QUERY.rows(account_id=account_id, day=now.date(), amount=amount)
+
+            return TransactionInterface.from_row({
+                "created_at": now,
+                "updated_at": None,
+                "deleted_at": None,
+                "transaction_id": transaction_row["transaction_id"],
+                "account": AccountEntity.interface_from_row(account_row),
+                "amount": amount,
+                "transaction_type": transaction.transaction_type,
+            })
         except Exception as e:
             raise e
 
-    @db.atomic()
-    async def get_total_withdrawals(self, account_id: int, date: datetime.date):
+    @staticmethod
+    def _rejection(account_id: int, amount: float, day: date) -> ExceptionMessageBuilder:
+        """The rule that kept the conditional UPDATE of ``_apply_transaction`` from matching the account."""
+        account_row = ACCOUNT_RULES_QUERY.first(account_id=account_id, day=day)
+        if account_row is None:
+            return ObjectNotFound(object_name="account_entity")
+        if account_row["state"] != AccountStates.ACTIVE.value:
+            return TransactionNotAllowed()
+        if account_row["balance"] < amount:
+            return InsufficientBalance()
+        return DailyLimitReached()
+
+    @classmethod
+    def _apply_transaction_query(cls, is_withdraw: bool):
+        """Guarded balance UPDATE of ``_apply_transaction``, prepared once per transaction type."""
+        amount = param("amount")
+        allowed = AccountEntity.state == AccountStates.ACTIVE.value
+        sources = []
+        if is_withdraw:
+            withdrawn_today = (cls._daily_withdrawal_total_query(param("account_id"), param("day"))
+                               .alias("withdrawn_today"))
+            allowed &= (
+                (AccountEntity.balance >= amount) &
+                (withdrawn_today.c.total + amount <= AccountEntity.daily_limit)
+            )
+            new_balance = AccountEntity.balance - amount
+            sources.append(withdrawn_today)
+        else:
+            new_balance = AccountEntity.balance + amount
+
+        return (AccountEntity
+                .update(balance=new_balance, updated_at=param("now"))
+                .from_(*sources)
+                .where((AccountEntity.account_id == param("account_id")) & allowed)
+                .returning(*AccountEntity.returning_with_owner()))
+
+    @invalidate_account_cache(lambda transactions: {transaction.account for transaction in transactions})
+    @run_in_executor
+    @db.atomic("IMMEDIATE")
+    def apply_transactions_batch(
+        self, transactions: List[TransactionInterface]
+    ) -> List[Union[TransactionInterface, ExceptionMessageBuilder]]:
+        """Applies many deposits/withdrawals in one database transaction with grouped statements.
+
+        The write lock is taken up front (BEGIN IMMEDIATE), the affected accounts and today's
+        withdrawal counters are read once, every item is checked in order against that state,
+        and the accepted items are written with one INSERT per chunk plus one aggregated
+        balance UPDATE and counter upsert per chunk of accounts; the ids and the updated
+        accounts come back through RETURNING. The result list is aligned with ``transactions``:
+        the created transaction, embedding its account like a single deposit/withdraw, or the
+        rule violation for each item.
+        """
         try:
-            total_withdrawals = (TransactionEntity
-                                .select(fn.SUM(TransactionEntity.amount))
+            now = datetime.now()
+            today = now.date()
+            account_ids = list({transaction.account for transaction in transactions})
+
+            accounts = {}
+            withdrawn_today = {}
+            for ids in chunked(account_ids, BATCH_CHUNK_SIZE):
+                accounts.update(
+                    (row["account_id"], row)
+                    for row in (AccountEntity
+                                .select(
+                                    AccountEntity.account_id,
+                                    AccountEntity.state,
+                                    AccountEntity.balance,
+                                    AccountEntity.daily_limit,
+                                )
+                                .where(AccountEntity.account_id.in_(ids))
+                                .dicts())
+                )
+                withdrawn_today.update(
+                    (row["account"], row["total"])
+                    for row in (DailyWithdrawalTotalEntity
+                                .select(DailyWithdrawalTotalEntity.account, DailyWithdrawalTotalEntity.total)
                                 .where(
-                                    (TransactionEntity.account == account_id) &
-                                    (TransactionEntity.transaction_type == TransactionType.WITHDRAW.value) &
-                                    (TransactionEntity.created_at >= date) &
-                                    (TransactionEntity.created_at < date + timedelta(days=1))
+                                    (DailyWithdrawalTotalEntity.account.in_(ids)) &
+                                    (DailyWithdrawalTotalEntity.day == today)
+                                )
+                                .dicts())
+                )
+
+            results = []
+            accepted = []
+            balances_after = {}
+            balance_deltas = {}
+            withdrawal_deltas = {}
+            for transaction in transactions:
+                account = accounts.get(transaction.account)
+                amount = Decimal(str(transaction.amount))
+                if account is None:
+                    results.append(ObjectNotFound(object_name="account_entity"))
+                    continue
+                if account["state"] != AccountStates.ACTIVE.value:
+                    results.append(TransactionNotAllowed())
+                    continue
+
+                if transaction.transaction_type == TransactionType.WITHDRAW.value:
+                    if account["balance"] < amount:
+                        results.append(InsufficientBalance())
+                        continue
+                    withdrawn = withdrawn_today.get(transaction.account, 0)
+                    if withdrawn + amount > account["daily_limit"]:
+                        results.append(DailyLimitReached())
+                        continue
+                    withdrawn_today[transaction.account] = withdrawn + amount
+                    withdrawal_deltas[transaction.account] = withdrawal_deltas.get(transaction.account, 0) + amount
+                    amount = -amount
+
+                account["balance"] += amount
+                balance_deltas[transaction.account] = balance_deltas.get(transaction.account, 0) + amount
+                balances_after[len(results)] = float(account["balance"])
+                accepted.append(len(results))
+                results.append(transaction)
+
+            updated_accounts = {}
+            for ids in chunked(list(balance_deltas), BATCH_CHUNK_SIZE):
+                updated_accounts.update(
+                    (row["account_id"], AccountEntity.interface_from_row(row))
+                    for row in (AccountEntity
+                                .update(
+                                    balance=AccountEntity.balance + Case(
+                                        AccountEntity.account_id,
+                                        [(account_id, balance_deltas[account_id]) for account_id in ids],
+                                    ),
+                                    updated_at=now,
                                 )
-                                .scalar() or 0)
-            return total_withdrawals
+                                .where(AccountEntity.account_id.in_(ids))
+                                .returning(*AccountEntity.returning_with_owner())
+                                .dicts()
+                                .execute())
+                )
+
+            for indexes in chunked(accepted, BATCH_CHUNK_SIZE):
+                insert_query = (TransactionEntity
+                                .insert_many([
+                                    {
+                                        "account": results[index].account,
+                                        "amount": results[index].amount,
+                                        "transaction_type": results[index].transaction_type,
+                                        "created_at": now,
+                                    }
+                                    for index in indexes
+                                ])
+                                .returning(TransactionEntity.transaction_id)
+                                .tuples())
+                # SQLite hands out rowids in insertion order, so the ascending ids follow ``indexes``.
+                transaction_ids = sorted(row[0] for row in insert_query.execute())
+                for index, transaction_id in zip(indexes, transaction_ids):
+                    transaction = results[index]
+                    # Like a single deposit/withdraw, the account is embedded as of right after this item.
+                    account = updated_accounts[transaction.account].copy(update={"balance": balances_after[index]})
+                    results[index] = TransactionInterface.from_row({
+                        "created_at": now,
+                        "updated_at": None,
+                        "deleted_at": None,
+                        "transaction_id": transaction_id,
+                        "account": account,
+                        "amount": transaction.amount,
+                        "transaction_type": transaction.transaction_type,
+                    })
+
+            for ids in chunked(list(withdrawal_deltas), BATCH_CHUNK_SIZE):
+                (DailyWithdrawalTotalEntity
+                 .insert_many([
+                     {"account": account_id, "day": today, "total": withdrawal_deltas[account_id]}
+                     for account_id in ids
+                 ])
+                 .on_conflict(
+                     conflict_target=[DailyWithdrawalTotalEntity.account, DailyWithdrawalTotalEntity.day],
+                     update={DailyWithdrawalTotalEntity.total: DailyWithdrawalTotalEntity.total + EXCLUDED.total},
+                 )
+                 .execute())
+
+            return results
         except Exception as e:
             raise e
 
+    @staticmethod
+    def _daily_withdrawal_total_query(account_id: int, day: date):
+        return (DailyWithdrawalTotalEntity
+                .select(fn.COALESCE(fn.SUM(DailyWithdrawalTotalEntity.total), 0).alias("total"))
+                .where(
+                    (DailyWithdrawalTotalEntity.account == account_id) &
+                    (DailyWithdrawalTotalEntity.day == day)
+                ))
+
+    @run_in_executor
     @db.atomic()
-    async def get_transactions_by_period(
-        self, account_id: int, start_date: date, end_date: date
-    ) -> List[TransactionEntity]:
+    def rebuild_daily_withdrawal_totals(self, account_id: int = None) -> int:
+        """Regenerates the daily withdrawal counters from the transaction ledger."""
         try:
-            query = (TransactionEntity
-                    .select()
-                    .where(
-                        (TransactionEntity.account == account_id) &
-                        (fn.DATE(TransactionEntity.created_at) >= start_date) &
-                        (fn.DATE(TransactionEntity.created_at) <= end_date)
+            delete_query = DailyWithdrawalTotalEntity.delete()
+            ledger_query = self._ledger_withdrawals_query()
+            if account_id is not None:
+                delete_query = delete_query.where(DailyWithdrawalTotalEntity.account == account_id)
+                ledger_query = ledger_query.where(TransactionEntity.account == account_id)
+
+            delete_query.execute()
+            return (DailyWithdrawalTotalEntity
+                    .insert_from(
+                        ledger_query,
+                        fields=[
+                            DailyWithdrawalTotalEntity.account,
+                            DailyWithdrawalTotalEntity.day,
+                            DailyWithdrawalTotalEntity.total,
+                        ],
                     )
-                    .order_by(TransactionEntity.created_at.desc()))
-            return list(query)
+                    .as_rowcount()
+                    .execute())
+        except Exception as e:
+            raise e
+
+    @staticmethod
+    def _ledger_withdrawals_query():
+        return (TransactionEntity
+                .select(
+                    TransactionEntity.account,
+                    fn.DATE(TransactionEntity.created_at),
+                    fn.SUM(TransactionEntity.amount),
+                )
+                .where(TransactionEntity.transaction_type == TransactionType.WITHDRAW.value)
+                .group_by(TransactionEntity.account, fn.DATE(TransactionEntity.created_at)))
+
+    @staticmethod
+    def _transactions_by_period_query(
+        account_id: int, start_date: date, end_date: date, after: Optional[Tuple[datetime, int]] = None
+    ):
+        """Statement query, newest first, optionally resuming right after the ``after`` keyset position."""
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        if after is None:
+            upper_bound = TransactionEntity.created_at < end
+        else:
+            after_created_at, after_transaction_id = after
+            upper_bound = (
+                (TransactionEntity.created_at <= after_created_at) &
+                (ValuesTuple(TransactionEntity.created_at, TransactionEntity.transaction_id) <
+                 ValuesTuple(after_created_at, after_transaction_id))
+            )
+
+        return (TransactionEntity
+                .select()
+                .where(
+                    (TransactionEntity.account == account_id) &
+                    (TransactionEntity.created_at >= start) &
+                    upper_bound
+                )
+                .order_by(TransactionEntity.created_at.desc(), TransactionEntity.transaction_id.desc()))
+
+    @classmethod
+    def _statement_rows_query(
+        cls, account_id: int, start_date: date, end_date: date, after: Optional[Tuple[datetime, int]] = None
+    ):
+        """Flat projection of the statement columns; the account is returned as its id, never loaded.
+
+        Rows are turned into interfaces by ``TransactionEntity.interface_from_row``, without validation.
+        """
+        return (cls._transactions_by_period_query(account_id, start_date, end_date, after=after)
+                .select(
+                    TransactionEntity.transaction_id,
+                    TransactionEntity.account,
+                    TransactionEntity.amount,
+                    TransactionEntity.transaction_type,
+                    TransactionEntity.created_at,
+                )
+                .dicts())
+
+    @run_in_executor(read_only=True)
+    @db.atomic()
+    def get_transactions_page(
+        self,
+        account_id: int,
+        start_date: date,
+        end_date: date,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[TransactionInterface]:
+        try:
+            query = self._statement_rows_query(account_id, start_date, end_date, after=after).limit(limit)
+            return [TransactionEntity.interface_from_row(row) for row in query.iterator()]
         except Exception as e:
             raise e
@@ -0,0 +1,91 @@
+import json
+import logging
+import re
+import threading
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE_STATEMENTS = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+MAX_PARAM_LENGTH = 64
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(sql: str) -> str:
+    """Reduces a statement to its shape: literals and placeholder lists collapse to ``?``."""
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?, ...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def find_plan_problems(plan: List[str]) -> List[str]:
+    return [
+        step for step in plan
+        if (step.startswith("SCAN") and "USING" not in step) or "TEMP B-TREE FOR ORDER BY" in step
+    ]
+
+
+class SlowQueryLog:
+    """Logs statements slower than a threshold as one JSON record each.
+
+    The record has the normalized SQL, the parameters (or ``?`` placeholders when redacted), the
+    duration and the repository method that ran it. The first time a shape is seen slow, its
+    ``EXPLAIN QUERY PLAN`` is captured on the same connection and attached, together with the
+    plan steps that are not served by an index.
+    """
+
+    MAX_EXPLAINED_SHAPES = 1000
+
+    def __init__(self, threshold_seconds: float, log_params: bool, explain: bool):
+        self._threshold_seconds = threshold_seconds
+        self._log_params = log_params
+        self._explain = explain
+        self._explained_shapes = set()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._threshold_seconds > 0
+
+    def record(self, conn, sql: str, params: Optional[Sequence], duration: float, method: str):
+        if not self.enabled or duration < self._threshold_seconds:
+            return
+
+        shape = normalize_sql(sql)
+        entry = {
+            "sql": shape,
+            "params": self._format_params(params),
+            "duration_ms": round(duration * 1000, 3),
+            "method": method,
+        }
+        if self._explain and shape.lstrip("(").upper().startswith(EXPLAINABLE_STATEMENTS) and self._first_seen(shape):
+            entry["plan"] = self._explain_plan(conn, sql, params)
+            entry["plan_problems"] = find_plan_problems(entry["plan"])
+
+        logger.warning("Slow query %s", json.dumps(entry, default=str))
+
+    def _format_params(self, params: Optional[Sequence]) -> list:
+        if not params:
+            return []
+        if not self._log_params:
+            return ["?"] * len(params)
+        return [repr(param)[:MAX_PARAM_LENGTH] for param in params]
+
+    def _first_seen(self, shape: str) -> bool:
+        with self._lock:
+            if shape in self._explained_shapes or len(self._explained_shapes) >= self.MAX_EXPLAINED_SHAPES:
+                return False
+            self._explained_shapes.add(shape)
+            return True
+
+    @staticmethod
+    def _explain_plan(conn, sql: str, params: Optional[Sequence]) -> List[str]:
+        try:
+            return [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params or ()).fetchall()]
+        except Exception as e:
+            return [f"unavailable: {e}"]
@@ -0,0 +1,171 @@
+import asyncio
+import contextvars
+import logging
+import threading
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.config.exceptions.general import DatabaseBusy
+from app.config.settings import Settings
+from app.database.repositories.transaction_repository import TransactionRepository
+from app.interfaces.transaction import TransactionInterface
+from app.utils.metrics import registry, render_stats
+from app.utils.profiling import RequestProfile, current_profile
+from app.utils.tracing import SpanParents, capture_parents, linked_span
+
+logger = logging.getLogger(__name__)
+
+_transaction_writer = None
+_transaction_writer_lock = threading.Lock()
+
+
+class PendingTransaction(NamedTuple):
+    transaction: TransactionInterface
+    future: asyncio.Future
+    span_parents: Optional[SpanParents]
+    profile: Optional[RequestProfile]
+
+
+class TransactionWriter:
+    """Single writer task that commits queued deposits and withdrawals in micro-batches.
+
+    Callers ``submit`` a transaction and await their own result. The writer takes whatever is
+    queued (up to ``max_batch_size``, waiting at most ``max_linger_seconds`` for more) and applies
+    it with one ``apply_transactions_group`` call, so a burst of requests pays for one commit
+    instead of one each and never competes for the SQLite write lock.
+    """
+
+    def __init__(
+        self,
+        transaction_repository: TransactionRepository,
+        max_batch_size: int,
+        max_linger_seconds: float,
+        max_queue_size: int,
+    ):
+        self._transaction_repository = transaction_repository
+        self._max_batch_size = max_batch_size
+        self._max_linger_seconds = max_linger_seconds
+        self._max_queue_size = max_queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batches = 0
+        self._transactions = 0
+        self._largest_batch = 0
+        self._rejected = 0
+
+    async def submit(self, transaction: TransactionInterface) -> TransactionInterface:
+        self._ensure_started()
+        if self._queue.full():
+            self._rejected += 1
+            raise DatabaseBusy()
+
+        future = self._loop.create_future()
+        self._queue.put_nowait(PendingTransaction(transaction, future, capture_parents(), current_profile.get()))
+        return await future
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+            # A fresh context keeps the request id of whichever request started the writer out of
+            # the logs of every batch it commits afterwards.
+            self._task = loop.create_task(self._run(), context=contextvars.Context())
+
+    async def _run(self):
+        while True:
+            pending = await self._queue.get()
+            if pending is None:
+                return
+
+            batch, stop = await self._collect_batch(pending)
+            await self._commit(batch)
+            if stop:
+                return
+
+    async def _collect_batch(self, first: PendingTransaction) -> Tuple[List[PendingTransaction], bool]:
+        batch = [first]
+        if self._max_linger_seconds > 0 and self._queue.qsize() < self._max_batch_size - 1:
+            await asyncio.sleep(self._max_linger_seconds)
+
+        while len(batch) < self._max_batch_size and not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if pending is None:
+                return batch, True
+            batch.append(pending)
+
+        return batch, False
+
+    async def _commit(self, batch: List[PendingTransaction]):
+        # The commit is recorded once in the trace of every sampled request in the batch, and
+        # profiled on behalf of the first profiled one.
+        profile = next((pending.profile for pending in batch if pending.profile is not None), None)
+        profile_token = current_profile.set(profile)
+        try:
+            with linked_span("TransactionWriter.commit", "writer", [pending.span_parents for pending in batch],
+                             batch_size=len(batch)):
+                outcomes = await self._transaction_repository.apply_transactions_group(
+                    [pending.transaction for pending in batch]
+                )
+        except Exception as e:
+            logger.error("Unable to commit a group of %s transactions. Error: %s", len(batch), e)
+            outcomes = [e] * len(batch)
+        finally:
+            current_profile.reset(profile_token)
+
+        self._batches += 1
+        self._transactions += len(batch)
+        self._largest_batch = max(self._largest_batch, len(batch))
+        for pending, outcome in zip(batch, outcomes):
+            if pending.future.done():
+                continue
+            if isinstance(outcome, Exception):
+                pending.future.set_exception(outcome)
+            else:
+                pending.future.set_result(outcome)
+
+    async def close(self):
+        """Commits everything already queued, then stops the writer task."""
+        if self._task is None or self._task.done():
+            return
+        if self._loop is not asyncio.get_running_loop():
+            return
+
+        await self._queue.put(None)
+        await self._task
+
+    def get_stats(self) -> dict:
+        return {
+            "max_batch_size": self._max_batch_size,
+            "max_linger_seconds": self._max_linger_seconds,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self._batches,
+            "transactions": self._transactions,
+            "avg_batch_size": self._transactions / self._batches if self._batches else 0.0,
+            "largest_batch": self._largest_batch,
+            "rejected": self._rejected,
+        }
+
+
+def collect_transaction_writer_stats():
+    if _transaction_writer is not None:
+        yield from render_stats("transaction_writer", "Transaction writer queue", _transaction_writer.get_stats())
+
+
+registry.register_collector(collect_transaction_writer_stats)
+
+
+def get_transaction_writer() -> TransactionWriter:
+    global _transaction_writer
+    if _transaction_writer is None:
+        with _transaction_writer_lock:
+            if _transaction_writer is None:
+                settings = Settings.get_settings()
+                _transaction_writer = TransactionWriter(
+                    transaction_repository=TransactionRepository(),
+                    max_batch_size=settings.transaction_writer_max_batch_size,
+                    max_linger_seconds=settings.transaction_writer_max_linger_ms / 1000,
+                    max_queue_size=settings.db_executor_max_queue_size,
+                )
+
+    return _transaction_writer
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-from fastapi import status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi import Depends, status
 from fastapi_utils.cbv import cbv
 from fastapi_utils.inferring_router import InferringRouter
 import logging
@@ -15,21 +13,20 @@ from app.interfaces.account import (
     RequestUnblockAccountInterface,
 )
 from app.interfaces.account_owner import RequestCreateAccountOwnerInterface, RequestRemoveAccountOwnerInterface
+from app.handlers.http.dependencies import get_account_service
+from app.handlers.http.tracing_handler import TracedRoute
 from app.services.account_service import AccountService
 
 from app.utils import generate_error_response
+from app.utils.serialization import FastJSONResponse
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-logger = logging.getLogger()
-router = InferringRouter()
+logger = logging.getLogger(__name__)
+router = InferringRouter(route_class=TracedRoute)
 
 
 @cbv(router)
 class AccountHandler:
-    def __init__(
-        self,
-    ):
-        self._account_service = AccountService()
+    account_service: AccountService = Depends(get_account_service)
 
     @staticmethod
     def get_router():
@@ -43,15 +40,15 @@ class AccountHandler:
     )
     async def create_owner(self, payload: RequestCreateAccountOwnerInterface):
         try:
-            response = await self._account_service.create_owner(payload=payload)
-            return JSONResponse(content=jsonable_encoder(response), status_code=status.HTTP_200_OK)
+            response = await self.account_service.create_owner(payload=payload)
+            return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
 
     @router.delete(
@@ -62,15 +59,15 @@ class AccountHandler:
     )
     async def remove_owner(self, payload: RequestRemoveAccountOwnerInterface):
         try:
-            await self._account_service.remove_owner(payload=payload)
-            return JSONResponse(content="Account owner successfully removed", status_code=status.HTTP_200_OK)
+            await self.account_service.remove_owner(payload=payload)
+            return FastJSONResponse(content="Account owner successfully removed", status_code=status.HTTP_200_OK)
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
 
     @router.post(
@@ -81,15 +78,15 @@ class AccountHandler:
     )
     async def create_account(self, payload: RequestCreateAccountInterface):
         try:
-            response = await self._account_service.create_account(payload=payload)
-            return JSONResponse(content=jsonable_encoder(response), status_code=status.HTTP_200_OK)
+            response = await self.account_service.create_account(payload=payload)
+            return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
 
     @router.get(
@@ -100,15 +97,15 @@ class AccountHandler:
     )
     async def get_account(self, account_id: int):
         try:
-            response = await self._account_service.get_account(account_id=account_id)
-            return JSONResponse(content=jsonable_encoder(response), status_code=status.HTTP_200_OK)
+            response = await self.account_service.get_account(account_id=account_id)
+            return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
 
     @router.post(
@@ -119,15 +116,15 @@ class AccountHandler:
     )
     async def block_account(self, payload: RequestBlockAccountInterface):
         try:
-            response = await self._account_service.block_account(payload=payload)
-            return JSONResponse(content=jsonable_encoder(response), status_code=status.HTTP_200_OK)
+            response = await self.account_service.block_account(payload=payload)
+            return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
 
     @router.post(
@@ -138,15 +135,15 @@ class AccountHandler:
     )
     async def unblock_account(self, payload: RequestUnblockAccountInterface):
         try:
-            response = await self._account_service.unblock_account(payload=payload)
-            return JSONResponse(content=jsonable_encoder(response), status_code=status.HTTP_200_OK)
+            response = await self.account_service.unblock_account(payload=payload)
+            return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
 
     @router.post(
@@ -157,13 +154,13 @@ class AccountHandler:
     )
     async def close_account(self, payload: RequestCloseAccountInterface):
         try:
-            response = await self._account_service.close_account(payload=payload)
-            return JSONResponse(content=jsonable_encoder(response), status_code=status.HTTP_200_OK)
+            response = await self.account_service.close_account(payload=payload)
+            return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
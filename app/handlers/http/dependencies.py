@@ -0,0 +1,44 @@
+import hmac
+from typing import Optional
+
+from fastapi import Depends, Request
+
+from app.config.exceptions.general import DebugAccessDenied
+from app.config.settings import Settings
+from app.container import Container
+from app.handlers.http.profiling_handler import PROFILE_HEADER
+from app.handlers.http.tracing_handler import TRACE_TOKEN_HEADER
+from app.services.account_service import AccountService
+from app.services.transaction_service import TransactionService
+
+# Coroutines, so FastAPI resolves them on the event loop: a plain function would be sent to the
+# thread pool on every request, and the first one would also pay for starting that pool.
+
+
+async def get_container(request: Request) -> Container:
+    """The container built by the application lifespan."""
+    return request.app.state.container
+
+
+async def get_account_service(container: Container = Depends(get_container)) -> AccountService:
+    return container.account_service
+
+
+async def get_transaction_service(container: Container = Depends(get_container)) -> TransactionService:
+    return container.transaction_service
+
+
+def _require_token(request: Request, header: str, token: Optional[str]):
+    value = request.headers.get(header, "")
+    if not token or not hmac.compare_digest(value.encode(), token.encode()):
+        raise DebugAccessDenied()
+
+
+async def require_profiling_token(request: Request):
+    """Guards the /debug/profiles routes with the same ``X-Profile`` token check as the profiling middleware."""
+    _require_token(request, PROFILE_HEADER.decode(), Settings.get_settings().profiling_token)
+
+
+async def require_tracing_token(request: Request):
+    """Guards the /debug/traces routes with the ``X-Trace-Token`` header."""
+    _require_token(request, TRACE_TOKEN_HEADER, Settings.get_settings().tracing_token)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+
+from fastapi import status
+from fastapi.responses import PlainTextResponse
+from fastapi_utils.cbv import cbv
+from fastapi_utils.inferring_router import InferringRouter
+
+from app.utils.metrics import http_request_duration_seconds, http_requests_in_flight, registry
+from app.utils.startup import get_startup_report
+
+router = InferringRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@cbv(router)
+class MetricsHandler:
+    @staticmethod
+    def get_router():
+        return router
+
+    @router.get(
+        "/metrics",
+        description="Prometheus metrics",
+        status_code=status.HTTP_200_OK,
+        tags=["MetricsHandler"],
+        response_class=PlainTextResponse,
+    )
+    async def get_metrics(self):
+        return PlainTextResponse(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording in-flight requests and latency per route template.
+
+    The route label is the matched path template (``/v1/accounts/{account_id}``), read from the
+    scope after routing, so path parameters never create new series. The first request served
+    also closes the process' startup report.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.startup_report = get_startup_report()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started_at = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec(method)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_request_duration_seconds.observe(
+                time.perf_counter() - started_at, method, route_path, str(status_code),
+            )
+            if self.startup_report.first_request_pending:
+                self.startup_report.record_first_request(started_at, f"{method} {route_path}")
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import random
+import threading
+import time
+import uuid
+
+from fastapi import Query, status
+from fastapi_utils.cbv import cbv
+from fastapi_utils.inferring_router import InferringRouter
+
+from app.config.enums.profiling import ProfileSortKey
+from app.config.exceptions.general import ObjectNotFound
+from app.utils.profiling import ProfileStore, RequestProfile, current_profile, get_profile_store
+from app.utils.request_context import get_request_id
+from app.utils.serialization import FastJSONResponse
+
+router = InferringRouter()
+
+PROFILE_HEADER = b"x-profile"
+
+# cProfile hooks the whole event loop thread, so only one request per process is profiled at a time.
+_profiler_lock = threading.Lock()
+
+
+def profiling_token_matches(value: bytes, token: bytes) -> bool:
+    """Constant-time comparison of an ``X-Profile`` header value with the profiling token."""
+    return hmac.compare_digest(value, token)
+
+
+def profile_not_found(name: str) -> FastJSONResponse:
+    ex = ObjectNotFound("Profile not found or no longer buffered", object_name=name)
+    return FastJSONResponse(content={"title": ex.title, "message": ex.message}, status_code=ex.status_code)
+
+
+@cbv(router)
+class ProfilingHandler:
+    @staticmethod
+    def get_router():
+        return router
+
+    @router.get(
+        "/profiles",
+        description="Most recent request profiles, newest first, and the profiled count per route",
+        status_code=status.HTTP_200_OK,
+        tags=["ProfilingHandler"],
+    )
+    async def list_profiles(self, limit: int = Query(default=50, ge=1, le=1000)):
+        store = get_profile_store()
+        return FastJSONResponse(
+            content={"routes": store.routes(), "profiles": store.recent(limit=limit)},
+            status_code=status.HTTP_200_OK,
+        )
+
+    @router.get(
+        "/profiles/aggregate",
+        description=(
+            "Most expensive functions over every profiled request of a route, "
+            "e.g. 'POST /v1/transactions/withdraw'"
+        ),
+        status_code=status.HTTP_200_OK,
+        tags=["ProfilingHandler"],
+    )
+    async def get_route_profile(
+        self,
+        route: str,
+        sort: ProfileSortKey = ProfileSortKey.TOTTIME,
+    ):
+        profile = get_profile_store().aggregate(route, sort.value)
+        if profile is None:
+            return profile_not_found("route_profile")
+        return FastJSONResponse(content=profile, status_code=status.HTTP_200_OK)
+
+    @router.get(
+        "/profiles/{profile_id}",
+        description="Most expensive functions of one profiled request",
+        status_code=status.HTTP_200_OK,
+        tags=["ProfilingHandler"],
+    )
+    async def get_profile(self, profile_id: str):
+        profile = get_profile_store().get(profile_id)
+        if profile is None:
+            return profile_not_found("profile")
+        return FastJSONResponse(content=profile, status_code=status.HTTP_200_OK)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware running selected requests under cProfile.
+
+    A request is profiled when it carries ``X-Profile: <PROFILING_TOKEN>`` or falls in the sampled
+    fraction. The event loop part is profiled while the request is in flight, so other requests
+    interleaved on the loop can show up in it; repository calls it makes are profiled on their
+    executor thread. Only added to the app when profiling is configured.
+    """
+
+    def __init__(self, app, sample_rate: float, token: str = None, store: ProfileStore = None):
+        self.app = app
+        self._sample_rate = sample_rate
+        self._token = token.encode() if token else None
+        self._store = store
+
+    def _requested(self, scope) -> bool:
+        if self._token is not None:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return profiling_token_matches(value, self._token)
+        return random.random() < self._sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope) or not _profiler_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(get_request_id() or uuid.uuid4().hex)
+        token = current_profile.set(profile)
+        started_at = time.perf_counter()
+        profile.event_loop_profile.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profile.event_loop_profile.disable()
+            profile.duration_ms = round((time.perf_counter() - started_at) * 1000, 3)
+            current_profile.reset(token)
+            _profiler_lock.release()
+            route = scope.get("route")
+            profile.name = f'{scope["method"]} {getattr(route, "path", "unmatched")}'
+            await asyncio.get_running_loop().run_in_executor(None, (self._store or get_profile_store()).add, profile)
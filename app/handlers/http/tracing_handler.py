@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import random
+import time
+import uuid
+
+from fastapi import Query, status
+from fastapi.routing import APIRoute
+from fastapi_utils.cbv import cbv
+from fastapi_utils.inferring_router import InferringRouter
+
+from app.config.exceptions.general import ObjectNotFound
+from app.utils.request_context import get_request_id
+from app.utils.serialization import FastJSONResponse
+from app.utils.tracing import Trace, TraceStore, get_trace_store, span, start_trace
+
+router = InferringRouter()
+
+TRACE_TOKEN_HEADER = "x-trace-token"
+
+
+@cbv(router)
+class TracingHandler:
+    @staticmethod
+    def get_router():
+        return router
+
+    @router.get(
+        "/traces",
+        description="Most recent sampled request traces, newest first",
+        status_code=status.HTTP_200_OK,
+        tags=["TracingHandler"],
+    )
+    async def list_traces(
+        self,
+        limit: int = Query(default=50, ge=1, le=1000),
+        min_duration_ms: float = Query(default=0.0, ge=0),
+    ):
+        return FastJSONResponse(
+            content=get_trace_store().recent(limit=limit, min_duration_ms=min_duration_ms),
+            status_code=status.HTTP_200_OK,
+        )
+
+    @router.get(
+        "/traces/{trace_id}",
+        description="Spans of one sampled request trace",
+        status_code=status.HTTP_200_OK,
+        tags=["TracingHandler"],
+    )
+    async def get_trace(self, trace_id: str):
+        trace = get_trace_store().get(trace_id)
+        if trace is None:
+            ex = ObjectNotFound("Trace not found or no longer buffered", object_name="trace")
+            return FastJSONResponse(content={"title": ex.title, "message": ex.message}, status_code=ex.status_code)
+        return FastJSONResponse(content=trace, status_code=status.HTTP_200_OK)
+
+
+class TracedRoute(APIRoute):
+    """Route class recording a ``handler`` span around request parsing, the endpoint and serialization."""
+
+    def get_route_handler(self):
+        route_handler = super().get_route_handler()
+        name = self.endpoint.__qualname__
+
+        async def traced_route_handler(request):
+            with span(name, "handler"):
+                return await route_handler(request)
+
+        return traced_route_handler
+
+
+class TracingMiddleware:
+    """ASGI middleware tracing a random sample of the HTTP requests.
+
+    A sampled request gets a ``Trace`` keyed by its request id; the spans opened by handlers,
+    services, repositories and SQL statements while serving it are attached to that trace, which
+    is handed to the ``TraceStore`` once the response is sent.
+    """
+
+    def __init__(self, app, sample_rate: float, store: TraceStore = None):
+        self.app = app
+        self._sample_rate = sample_rate
+        self._store = store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self._sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(get_request_id() or uuid.uuid4().hex)
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                trace.status_code = message["status"]
+            await send(message)
+
+        try:
+            with start_trace(trace), span("http", "http", method=scope["method"], path=scope["path"]):
+                await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            trace.name = f'{scope["method"]} {getattr(route, "path", "unmatched")}'
+            trace.duration_ms = trace.offset_ms(time.perf_counter())
+            (self._store or get_trace_store()).add(trace)
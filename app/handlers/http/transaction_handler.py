@@ -1,31 +1,44 @@
 from datetime import date
+from typing import Optional
 
-from fastapi import Query, status
+from fastapi import Depends, Query, status
 
 from fastapi_utils.inferring_router import InferringRouter
 from fastapi_utils.cbv import cbv
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 
 import logging
 
+from app.config.enums.transaction import StatementExportFormat
 from app.config.exceptions.general import ExceptionMessageBuilder
-from app.interfaces.transaction import RequestDepositInterface, RequestStatementInterface, RequestWithdrawInterface
+from app.config.settings import Settings
+from app.interfaces.transaction import (
+    RequestBatchTransactionInterface,
+    RequestDepositInterface,
+    RequestStatementInterface,
+    RequestWithdrawInterface,
+)
+from app.handlers.http.dependencies import get_transaction_service
+from app.handlers.http.tracing_handler import TracedRoute
 from app.services.transaction_service import TransactionService
 
 from app.utils import generate_error_response
+from app.utils.serialization import FastJSONResponse
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-logger = logging.getLogger()
-router = InferringRouter()
+logger = logging.getLogger(__name__)
+router = InferringRouter(route_class=TracedRoute)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+EXPORT_MEDIA_TYPES = {
+    StatementExportFormat.NDJSON: "application/x-ndjson",
+    StatementExportFormat.CSV: "text/csv",
+}
 
 
 @cbv(router)
 class TransactionHandler:
-    def __init__(
-        self,
-    ):
-        self.transaction_service = TransactionService()
+    transaction_service: TransactionService = Depends(get_transaction_service)
 
     @staticmethod
     def get_router():
@@ -41,7 +54,56 @@ class TransactionHandler:
         self,
         account_id: int,
         start_date: date = Query(description="Start date in YYYY-MM-DD format"),
-        end_date: date = Query(description="End date in YYYY-MM-DD format")
+        end_date: date = Query(description="End date in YYYY-MM-DD format"),
+        limit: Optional[int] = Query(
+            default=None,
+            ge=1,
+            le=Settings.get_settings().statement_max_page_size,
+            description=(
+                "Page size. When set (or when a cursor is sent) the response is a page with a next_cursor; "
+                "otherwise it is the first STATEMENT_DEFAULT_PAGE_SIZE transactions, with the cursor of the "
+                "next ones in the X-Next-Cursor header"
+            ),
+        ),
+        cursor: Optional[str] = Query(default=None, description="next_cursor returned by the previous page"),
+    ):
+        try:
+            payload = RequestStatementInterface(
+                account_id=account_id,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+                cursor=cursor,
+            )
+            page = await self.transaction_service.get_statement_page(payload=payload)
+            if limit is not None or cursor is not None:
+                return FastJSONResponse(content=page, status_code=status.HTTP_200_OK)
+            # Without limit and cursor the response keeps the plain list of the first page.
+            headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+            return FastJSONResponse(content=page.transactions, status_code=status.HTTP_200_OK, headers=headers)
+        except ExceptionMessageBuilder as ex:
+            return FastJSONResponse(
+                content={"title": ex.title, "message": ex.message},
+                status_code=ex.status_code,
+            )
+        except Exception as err:
+            logger.error("Failed %s", err)
+            return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
+
+    @router.get(
+        "/statement/{account_id}/export",
+        description="Stream the full statement for an account as NDJSON or CSV",
+        status_code=status.HTTP_200_OK,
+        tags=["TransactionHandler"],
+    )
+    async def export_statement_by_period(
+        self,
+        account_id: int,
+        start_date: date = Query(description="Start date in YYYY-MM-DD format"),
+        end_date: date = Query(description="End date in YYYY-MM-DD format"),
+        format: StatementExportFormat = Query(
+            default=StatementExportFormat.NDJSON, description="Export format: ndjson or csv"
+        ),
     ):
         try:
             payload = RequestStatementInterface(
@@ -49,15 +111,20 @@ class TransactionHandler:
                 start_date=start_date,
                 end_date=end_date,
             )
-            response = await self.transaction_service.get_statement_by_period(payload=payload)
-            return JSONResponse(content=jsonable_encoder(response), status_code=status.HTTP_200_OK)
+            filename = f"statement-{account_id}-{start_date}-{end_date}.{format.value}"
+            chunks = await self.transaction_service.stream_statement_by_period(payload=payload, export_format=format)
+            return StreamingResponse(
+                chunks,
+                media_type=EXPORT_MEDIA_TYPES[format],
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            )
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
 
     @router.post(
@@ -69,14 +136,14 @@ class TransactionHandler:
     async def deposit(self, payload: RequestDepositInterface):
         try:
             response = await self.transaction_service.deposit(payload=payload)
-            return JSONResponse(content=jsonable_encoder(response), status_code=status.HTTP_200_OK)
+            return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
 
     @router.post(
@@ -88,12 +155,31 @@ class TransactionHandler:
     async def withdraw(self, payload: RequestWithdrawInterface):
         try:
             response = await self.transaction_service.withdraw(payload=payload)
-            return JSONResponse(content=jsonable_encoder(response), status_code=status.HTTP_200_OK)
+            return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
+        except ExceptionMessageBuilder as ex:
+            return FastJSONResponse(
+                content={"title": ex.title, "message": ex.message},
+                status_code=ex.status_code,
+            )
+        except Exception as err:
+            logger.error("Failed %s", err)
+            return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
+
+    @router.post(
+        "/batch",
+        description="Apply many deposits and withdrawals at once, returning one result per item",
+        status_code=status.HTTP_200_OK,
+        tags=["TransactionHandler"],
+    )
+    async def batch(self, payload: RequestBatchTransactionInterface):
+        try:
+            response = await self.transaction_service.apply_batch(payload=payload)
+            return FastJSONResponse(content=response, status_code=status.HTTP_200_OK)
         except ExceptionMessageBuilder as ex:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"title": ex.title, "message": ex.message},
                 status_code=ex.status_code,
             )
         except Exception as err:
-            logger.error(f"Failed {err}")
+            logger.error("Failed %s", err)
             return generate_error_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
@@ -1,43 +1,164 @@
 import sys
 import os
+import time
+
+# Taken before the framework and application imports below, which dominate a cold start.
+_imports_started_at = time.perf_counter()
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI
-import uvicorn
+import contextlib
+import gc
+import logging
+
+from fastapi import Depends, FastAPI, Request
+from starlette.concurrency import run_in_threadpool
 
+from app.config.exceptions.general import ExceptionMessageBuilder
+from app.config.logging import configure_logging
 from app.config.settings import Settings
+from app.container import Container
 
 from app.handlers.http.account_handler import AccountHandler
+from app.handlers.http.dependencies import require_profiling_token, require_tracing_token
+from app.handlers.http.metrics_handler import MetricsHandler, MetricsMiddleware
+from app.handlers.http.profiling_handler import ProfilingHandler, ProfilingMiddleware
+from app.handlers.http.tracing_handler import TracingHandler, TracingMiddleware
 from app.handlers.http.transaction_handler import TransactionHandler
+from app.utils.request_context import RequestIdMiddleware
+from app.utils.serialization import FastJSONResponse
+from app.utils.startup import get_startup_report, install_openapi_cache
 
 
 API_VERSION = "v1"
 
+logger = logging.getLogger(__name__)
+
+get_startup_report().record("import", _imports_started_at)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The modules and routes built so far live as long as the process; freezing them keeps the
+    # collector from rescanning them on every full collection (the first one landed mid-startup).
+    gc.freeze()
+    container = Container(Settings.get_settings())
+    container.start()
+    app.state.container = container
+
+    # cbv builds each handler instance in the thread pool; starting the pool here (importing anyio's
+    # asyncio backend, spawning its first worker) keeps that one-off cost off the first request.
+    started_at = time.perf_counter()
+    await run_in_threadpool(lambda: None)
+    get_startup_report().record("threadpool", started_at)
+    try:
+        yield
+    finally:
+        await container.close()
+
+
+async def exception_message_response(request: Request, ex: ExceptionMessageBuilder) -> FastJSONResponse:
+    return FastJSONResponse(content={"title": ex.title, "message": ex.message}, status_code=ex.status_code)
+
 
 def create_app() -> FastAPI:
+    started_at = time.perf_counter()
+    configure_logging()
+    settings = Settings.get_settings()
     app = FastAPI(
         title="Core Accounts API",
         description="Simple bank account management",
         version=API_VERSION,
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
 
     app.include_router(
-        AccountHandler().get_router(),
+        AccountHandler.get_router(),
         prefix=f"/{API_VERSION}/accounts",
         tags=["AccountHandler"],
     )
 
     app.include_router(
-        TransactionHandler().get_router(),
+        TransactionHandler.get_router(),
         prefix=f"/{API_VERSION}/transactions",
         tags=["TransactionHandler"],
     )
 
+    app.include_router(
+        MetricsHandler.get_router(),
+        tags=["MetricsHandler"],
+    )
+
+    # Traces and profiles expose internals (statements, call stacks): each is only served with its
+    # own token configured, to callers presenting it.
+    if settings.tracing_token:
+        app.include_router(
+            TracingHandler.get_router(),
+            prefix="/debug",
+            tags=["TracingHandler"],
+            dependencies=[Depends(require_tracing_token)],
+        )
+
+    if settings.profiling_token:
+        app.include_router(
+            ProfilingHandler.get_router(),
+            prefix="/debug",
+            tags=["ProfilingHandler"],
+            dependencies=[Depends(require_profiling_token)],
+        )
+
+    app.add_exception_handler(ExceptionMessageBuilder, exception_message_response)
+
+    # Middlewares added first run innermost.
+    if settings.profiling_token:
+        app.add_middleware(
+            ProfilingMiddleware,
+            sample_rate=settings.profiling_sample_rate,
+            token=settings.profiling_token,
+        )
+    elif settings.profiling_sample_rate > 0:
+        logger.warning("PROFILING_SAMPLE_RATE is ignored without PROFILING_TOKEN: no route could read the profiles.")
+    if settings.tracing_sample_rate > 0:
+        app.add_middleware(TracingMiddleware, sample_rate=settings.tracing_sample_rate)
+
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+
+    install_openapi_cache(app, settings.openapi_cache_path)
+    get_startup_report().record("create_app", started_at)
     return app
 
 
 if __name__ == "__main__":  # pragma: no cover
+    # Only the launcher needs uvicorn, so importing the app (tests, benchmarks, uvicorn itself) skips it.
+    import uvicorn
+
+    configure_logging()
     settings = Settings.get_settings()
-    params = {"host": "0.0.0.0", "port": settings.fast_api_port}
-    uvicorn.run(create_app(), **params)
+    if settings.fast_api_workers > 1 and settings.account_cache_max_size > 0:
+        if settings.account_cache_multi_worker:
+            logger.warning(
+                "Account cache is per worker: with %s workers an account read may be up to %ss stale.",
+                settings.fast_api_workers,
+                settings.account_cache_ttl_seconds,
+            )
+        else:
+            logger.info(
+                "Account cache disabled: it is per worker and %s workers are configured. "
+                "Set ACCOUNT_CACHE_MULTI_WORKER=true to keep it.",
+                settings.fast_api_workers,
+            )
+    uvicorn.run(
+        "app.http_server:create_app",
+        factory=True,
+        host=settings.fast_api_host,
+        port=settings.fast_api_port,
+        workers=settings.fast_api_workers,
+        backlog=settings.fast_api_backlog,
+        timeout_keep_alive=settings.fast_api_keep_alive_seconds,
+        limit_concurrency=settings.fast_api_limit_concurrency,
+        timeout_graceful_shutdown=settings.fast_api_graceful_shutdown_seconds,
+        # uvicorn's own loggers propagate to the root queue handler instead of writing synchronously.
+        log_config=None,
+    )
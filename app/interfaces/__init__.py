@@ -12,6 +12,18 @@ class CustomBaseModel(BaseModel):
     def as_json(self) -> dict:
         return jsonable_encoder(self)
 
+    @classmethod
+    def from_row(cls, values: dict):
+        """Builds the model from values the database already typed, without validating them.
+
+        A leaner ``construct``: ``values`` becomes the instance ``__dict__`` as is, so it must carry
+        every field of the model, already converted to the field type.
+        """
+        instance = cls.__new__(cls)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__fields_set__", set(values))
+        return instance
+
 
 class CustomTimableModel(CustomBaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
@@ -38,3 +38,9 @@ class RequestRemoveAccountOwnerInterface(CustomBaseModel):
         if not re.match(r'^\d{11}$', v):
             raise ValueError('CPF must contain only numbers and have 11 digits')
         return v
+
+
+class OnboardingImportReportInterface(CustomBaseModel):
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
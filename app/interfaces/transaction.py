@@ -1,5 +1,10 @@
 from datetime import date
-from typing import Optional, Union
+from typing import List, Optional, Union
+
+from pydantic import validator
+
+from app.config.enums.transaction import TransactionType
+from app.config.settings import Settings
 from app.interfaces import CustomBaseModel, CustomTimableModel
 from app.interfaces.account import AccountInterface
 
@@ -25,3 +30,46 @@ class RequestStatementInterface(CustomBaseModel):
     account_id: int
     start_date: date
     end_date: date
+    limit: Optional[int]
+    cursor: Optional[str]
+
+
+class StatementPageInterface(CustomBaseModel):
+    transactions: List[TransactionInterface]
+    next_cursor: Optional[str]
+
+
+class RequestBatchTransactionItemInterface(CustomBaseModel):
+    account_id: int
+    amount: float
+    transaction_type: TransactionType
+
+
+class RequestBatchTransactionInterface(CustomBaseModel):
+    items: List[RequestBatchTransactionItemInterface]
+
+    @validator('items')
+    def validate_items(cls, v):
+        max_items = Settings.get_settings().batch_max_items
+        if not v:
+            raise ValueError('Batch must contain at least one item')
+        if len(v) > max_items:
+            raise ValueError(f'Batch must contain at most {max_items} items')
+        return v
+
+
+class BatchTransactionErrorInterface(CustomBaseModel):
+    title: str
+    message: str
+
+
+class BatchTransactionResultInterface(CustomBaseModel):
+    index: int
+    transaction: Optional[TransactionInterface]
+    error: Optional[BatchTransactionErrorInterface]
+
+
+class BatchTransactionResponseInterface(CustomBaseModel):
+    applied: int
+    rejected: int
+    results: List[BatchTransactionResultInterface]
@@ -15,46 +15,51 @@ from app.interfaces.account import (
 from app.interfaces.account_owner import (
     AccountOwnerInterface, RequestCreateAccountOwnerInterface, RequestRemoveAccountOwnerInterface
 )
+from app.utils.tracing import traced
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-logger = logging.getLogger()
+logger = logging.getLogger(__name__)
 
 
 class AccountService:
     def __init__(
         self,
+        account_repository: AccountRepository = None,
+        account_owner_repository: AccountOwnerRepository = None,
     ):
-        self.account_repository = AccountRepository()
-        self.account_owner_repository = AccountOwnerRepository()
+        self.account_repository = account_repository or AccountRepository()
+        self.account_owner_repository = account_owner_repository or AccountOwnerRepository()
 
+    @traced("service")
     async def create_owner(self, payload: RequestCreateAccountOwnerInterface) -> AccountOwnerInterface:
         try:
-            logger.info(f"Creating account owner with cpf: {payload.cpf}")
+            logger.info("Creating account owner with cpf: %s", payload.cpf)
             account_owner = AccountOwnerInterface(
                 name=payload.name,
                 cpf=payload.cpf,
             )
             account_owner_inserted = await self.account_owner_repository.create_account_owner(account_owner)
-            logger.info(f"Account owner with cpf: {payload.cpf} created")
+            logger.info("Account owner with cpf: %s created", payload.cpf)
             return account_owner_inserted
         except Exception as e:
-            logger.error(f"Unable to create owner with cpf: {payload.cpf}. Error: {e}")
+            logger.error("Unable to create owner with cpf: %s. Error: %s", payload.cpf, e)
             raise e
 
+    @traced("service")
     async def remove_owner(self, payload: RequestRemoveAccountOwnerInterface):
         try:
-            logger.info(f"Removing account owner with cpf: {payload.cpf}")
+            logger.info("Removing account owner with cpf: %s", payload.cpf)
 
             await self.account_owner_repository.delete_account_owner(payload.cpf)
-            logger.info(f"Account owner with cpf: {payload.cpf} removed")
+            logger.info("Account owner with cpf: %s removed", payload.cpf)
         except Exception as e:
-          logger.error(f"Unable to remove owner with cpf: {payload.cpf}. Error: {e}")
+          logger.error("Unable to remove owner with cpf: %s. Error: %s", payload.cpf, e)
           raise e
 
+    @traced("service")
     async def create_account(self, payload: RequestCreateAccountInterface):
         try:
             logger.info(
-                f"Creating account with account_owner: {payload.account_owner_id}"
+                "Creating account with account_owner: %s", payload.account_owner_id
             )
 
             try:
@@ -63,7 +68,7 @@ class AccountService:
                 )
             except ObjectNotFound as e:
                 logger.error(
-                    f"Unable to get account owner with account_owner_id: {payload.account_owner_id}. Error: {e}"
+                    "Unable to get account owner with account_owner_id: %s. Error: %s", payload.account_owner_id, e
                 )
                 raise e
 
@@ -73,75 +78,79 @@ class AccountService:
                 account_owner=account_owner.id,
             )
             account_inserted = await self.account_repository.create_account(account)
-            logger.info(f"Account with account_owner: {account_owner.id} created")
+            logger.info("Account with account_owner: %s created", account_owner.id)
             return account_inserted
         except Exception as e:
-            logger.error(f"Unable to create account. Error: {e}")
+            logger.error("Unable to create account. Error: %s", e)
             raise e
 
+    @traced("service")
     async def get_account(self, account_id: int) -> AccountInterface:
         try:
-            logger.info(f"Getting account with account_id: {account_id}")
+            logger.info("Getting account with account_id: %s", account_id)
             account = await self.account_repository.get_account_by_id(account_id)
-            logger.info(f"Account with account_id: {account_id} retrieved")
+            logger.info("Account with account_id: %s retrieved", account_id)
             return account
         except ObjectNotFound as e:
-            logger.error(f"Unable to get account with account_id: {account_id}. Error: {e}")
+            logger.error("Unable to get account with account_id: %s. Error: %s", account_id, e)
             raise e
 
+    @traced("service")
     async def block_account(self, payload: RequestBlockAccountInterface) -> AccountInterface:
         try:
-            logger.info(f"Blocking account with account_id: {payload.account_id}")
+            logger.info("Blocking account with account_id: %s", payload.account_id)
             try:
                 account = await self.account_repository.get_account_by_id(payload.account_id)
             except ObjectNotFound as e:
-                logger.error(f"Unable to get account with account_id: {payload.account_id}. Error: {e}")
+                logger.error("Unable to get account with account_id: %s. Error: %s", payload.account_id, e)
                 raise e
 
             account_updated = await self.account_repository.block_account(
                 account_id=account.account_id,
             )
-            logger.info(f"Account with account_id: {payload.account_id} blocked")
+            logger.info("Account with account_id: %s blocked", payload.account_id)
             return account_updated
         except Exception as e:
-            logger.error(f"Unable to block account with account_id: {payload.account_id}. Error: {e}")
+            logger.error("Unable to block account with account_id: %s. Error: %s", payload.account_id, e)
             raise e
 
+    @traced("service")
     async def unblock_account(self, payload: RequestUnblockAccountInterface) -> AccountInterface:
         try:
-            logger.info(f"Unblocking account with account_id: {payload.account_id}")
+            logger.info("Unblocking account with account_id: %s", payload.account_id)
 
             try:
                 account = await self.account_repository.get_account_by_id(payload.account_id)
             except ObjectNotFound as e:
-                logger.error(f"Unable to get account with account_id: {payload.account_id}. Error: {e}")
+                logger.error("Unable to get account with account_id: %s. Error: %s", payload.account_id, e)
                 raise e
 
             account_updated = await self.account_repository.unblock_account(
                 account_id=account.account_id,
             )
-            logger.info(f"Account with account_id: {payload.account_id} unblocked")
+            logger.info("Account with account_id: %s unblocked", payload.account_id)
             return account_updated
         except Exception as e:
-            logger.error(f"Unable to unblock account with account_id: {payload.account_id}. Error: {e}")
+            logger.error("Unable to unblock account with account_id: %s. Error: %s", payload.account_id, e)
             raise e
 
+    @traced("service")
     async def close_account(self, payload: RequestCloseAccountInterface) -> AccountInterface:
         try:
-            logger.info(f"Closing account with account_id: {payload.account_id}")
+            logger.info("Closing account with account_id: %s", payload.account_id)
 
             try:
                 account = await self.account_repository.get_account_by_id(payload.account_id)
             except ObjectNotFound as e:
-                logger.error(f"Unable to get account with account_id: {payload.account_id}. Error: {e}")
+                logger.error("Unable to get account with account_id: %s. Error: %s", payload.account_id, e)
                 raise e
 
             account_updated = await self.account_repository.close_account(
                 account_id=account.account_id,
                 state=AccountStates.CLOSED.value
             )
-            logger.info(f"Account with account_id: {payload.account_id} closed")
+            logger.info("Account with account_id: %s closed", payload.account_id)
             return account_updated
         except Exception as e:
-            logger.error(f"Unable to close account with account_id: {payload.account_id}. Error: {e}")
+            logger.error("Unable to close account with account_id: %s. Error: %s", payload.account_id, e)
             raise e
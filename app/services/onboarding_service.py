@@ -0,0 +1,93 @@
+import logging
+import time
+from typing import Callable, Iterable, List, Tuple
+
+from pydantic import ValidationError
+
+from app.database.repositories.account_repository import AccountRepository
+from app.interfaces.account_owner import (
+    AccountOwnerInterface, OnboardingImportReportInterface, RequestCreateAccountOwnerInterface
+)
+from app.utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+RejectCallback = Callable[[int, dict, str], None]
+
+
+class OnboardingService:
+    def __init__(
+        self,
+        account_repository: AccountRepository = None,
+    ):
+        self._account_repository = account_repository or AccountRepository()
+
+    @traced("service")
+    async def import_owners(
+        self, rows: Iterable[dict], on_reject: RejectCallback, chunk_size: int = 5000
+    ) -> OnboardingImportReportInterface:
+        """Creates one owner and one account per row, chunk by chunk, reporting rejected rows to ``on_reject``."""
+        report = OnboardingImportReportInterface()
+        started_at = time.perf_counter()
+        seen_cpfs = set()
+        chunk: List[Tuple[int, dict, AccountOwnerInterface]] = []
+        try:
+            for line_number, row in enumerate(rows, start=1):
+                report.read += 1
+                if not isinstance(row, dict):
+                    report.rejected += 1
+                    on_reject(line_number, {"raw": row}, "row is not a JSON object")
+                    continue
+
+                try:
+                    payload = RequestCreateAccountOwnerInterface(name=row.get("name"), cpf=row.get("cpf"))
+                except ValidationError as e:
+                    report.rejected += 1
+                    on_reject(line_number, row, f"invalid row: {e.errors()[0]['msg']}")
+                    continue
+
+                if payload.cpf in seen_cpfs:
+                    report.rejected += 1
+                    on_reject(line_number, row, "duplicated cpf in file")
+                    continue
+
+                seen_cpfs.add(payload.cpf)
+                owner = AccountOwnerInterface.construct(name=payload.name, cpf=payload.cpf)
+                chunk.append((line_number, row, owner))
+                if len(chunk) >= chunk_size:
+                    await self._import_chunk(chunk, report, on_reject, started_at)
+                    chunk = []
+
+            if chunk:
+                await self._import_chunk(chunk, report, on_reject, started_at)
+
+            logger.info(
+                "Onboarding import finished: %s read, %s imported, %s rejected",
+                report.read, report.imported, report.rejected,
+            )
+            return report
+        except Exception as e:
+            logger.error("Unable to import owners after %s rows. Error: %s", report.read, e)
+            raise e
+
+    async def _import_chunk(
+        self,
+        chunk: List[Tuple[int, dict, AccountOwnerInterface]],
+        report: OnboardingImportReportInterface,
+        on_reject: RejectCallback,
+        started_at: float,
+    ):
+        existing_cpfs = await self._account_repository.bulk_create_accounts_with_owners(
+            [owner for _, _, owner in chunk]
+        )
+        for line_number, row, owner in chunk:
+            if owner.cpf in existing_cpfs:
+                report.rejected += 1
+                on_reject(line_number, row, "cpf already registered")
+
+        report.imported += len(chunk) - len(existing_cpfs)
+        elapsed = time.perf_counter() - started_at
+        logger.info(
+            "Imported %s owners (%s rejected) of %s rows read, %.0f rows/s",
+            report.imported, report.rejected, report.read, report.read / elapsed if elapsed else 0,
+        )
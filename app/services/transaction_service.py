@@ -1,21 +1,35 @@
-from datetime import datetime
+import csv
+import io
 import logging
-from typing import List
-from playhouse.shortcuts import model_to_dict
+import time
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
 
-from app.config.enums.account import AccountStates
-from app.config.enums.transaction import TransactionType
-from app.config.exceptions.general import (
-    DailyLimitReached, InsufficientBalance, ObjectNotFound, TransactionNotAllowed
-)
+from app.config.enums.transaction import StatementExportFormat, TransactionType
+from app.config.settings import Settings
+from app.config.exceptions.general import DailyLimitReached, ExceptionMessageBuilder, InsufficientBalance
 from app.database.repositories.account_repository import AccountRepository
 from app.database.repositories.transaction_repository import TransactionRepository
+from app.database.transaction_writer import TransactionWriter, get_transaction_writer
 from app.interfaces.transaction import (
-    RequestDepositInterface, RequestStatementInterface, RequestWithdrawInterface, TransactionInterface
+    BatchTransactionErrorInterface,
+    BatchTransactionResponseInterface,
+    BatchTransactionResultInterface,
+    RequestBatchTransactionInterface,
+    RequestDepositInterface,
+    RequestStatementInterface,
+    RequestWithdrawInterface,
+    StatementPageInterface,
+    TransactionInterface,
 )
+from app.utils.metrics import transaction_rejections_total, transactions_total
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.serialization import dumps
+from app.utils.tracing import traced
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-logger = logging.getLogger()
+logger = logging.getLogger(__name__)
+
+STATEMENT_EXPORT_COLUMNS = ("transaction_id", "account", "amount", "transaction_type", "created_at")
 
 
 class TransactionService:
@@ -23,87 +37,225 @@ class TransactionService:
         self,
         account_repository: AccountRepository = None,
         transaction_repository: TransactionRepository = None,
+        transaction_writer: TransactionWriter = None,
     ):
         self._account_repository = account_repository or AccountRepository()
         self._transaction_repository = transaction_repository or TransactionRepository()
+        self._transaction_writer = transaction_writer or get_transaction_writer()
 
-    async def get_statement_by_period(self, payload: RequestStatementInterface) -> List[TransactionInterface]:
+    @traced("service")
+    async def get_statement_page(self, payload: RequestStatementInterface) -> StatementPageInterface:
         try:
-            logger.info(f"Getting statement for account: {payload.account_id}")
-            transactions = await self._transaction_repository.get_transactions_by_period(
+            logger.info("Getting statement page for account: %s", payload.account_id)
+            limit = payload.limit or Settings.get_settings().statement_default_page_size
+            after = decode_cursor(payload.cursor) if payload.cursor else None
+            transactions = await self._transaction_repository.get_transactions_page(
                 account_id=payload.account_id,
                 start_date=payload.start_date,
                 end_date=payload.end_date,
+                limit=limit + 1,
+                after=after,
+            )
+
+            next_cursor = None
+            if len(transactions) > limit:
+                transactions = transactions[:limit]
+                last = transactions[-1]
+                next_cursor = encode_cursor(last.created_at, last.transaction_id)
+
+            logger.info("Got statement page for account: %s", payload.account_id)
+            return StatementPageInterface.construct(
+                transactions=transactions,
+                next_cursor=next_cursor,
             )
-            logger.info(f"Got statement for account: {payload.account_id}")
-            return [TransactionInterface(**model_to_dict(transaction)) for transaction in transactions]
         except Exception as e:
-            logger.error(f"Unable to get statement for account: {payload.account_id}. Error: {e}")
+            logger.error("Unable to get statement page for account: %s. Error: %s", payload.account_id, e)
             raise e
 
-    async def deposit(self, payload: RequestDepositInterface) -> TransactionInterface:
+    @traced("service")
+    async def stream_statement_by_period(
+        self, payload: RequestStatementInterface, export_format: StatementExportFormat
+    ) -> AsyncIterator[str]:
+        """Starts a statement export and returns the iterator of its chunks.
+
+        The account is resolved and the first chunk read here, before the response starts, so an
+        unknown account or a failing database becomes an error response instead of an empty or
+        truncated 200.
+        """
         try:
-            logger.info(f"Depositing {payload.amount} to account: {payload.account_id}")
+            logger.info("Streaming %s statement for account: %s", export_format.value, payload.account_id)
+            await self._account_repository.get_account_by_id(account_id=payload.account_id)
+            chunk_size = Settings.get_settings().statement_export_chunk_size
+            rows = await self._get_statement_chunk(payload, chunk_size)
+            return self._stream_statement_rows(payload, export_format, chunk_size, rows)
+        except Exception as e:
+            logger.error("Unable to export statement for account: %s. Error: %s", payload.account_id, e)
+            raise e
+
+    async def _stream_statement_rows(
+        self,
+        payload: RequestStatementInterface,
+        export_format: StatementExportFormat,
+        chunk_size: int,
+        rows: List[TransactionInterface],
+    ) -> AsyncIterator[str]:
+        if export_format == StatementExportFormat.CSV:
+            yield ",".join(STATEMENT_EXPORT_COLUMNS) + "\n"
+
+        rows_streamed = 0
+        while True:
+            if rows:
+                yield self._encode_statement_rows(rows, export_format)
+                rows_streamed += len(rows)
+            if len(rows) < chunk_size:
+                break
             try:
-                account = await self._account_repository.get_account_by_id(payload.account_id)
-            except ObjectNotFound as e:
-                logger.error(f"Unable to get account with account_id: {payload.account_id}. Error: {e}")
+                rows = await self._get_statement_chunk(
+                    payload, chunk_size, after=(rows[-1].created_at, rows[-1].transaction_id)
+                )
+            except Exception as e:
+                # The 200 is already sent: raising aborts the response without its final chunk, so
+                # the client sees a broken transfer rather than a complete-looking short file.
+                logger.error(
+                    "Statement export for account: %s failed after %s transactions. Error: %s",
+                    payload.account_id, rows_streamed, e,
+                )
                 raise e
 
-            if account.state != AccountStates.ACTIVE.value:
-                raise TransactionNotAllowed()
+        logger.info("Streamed %s transactions for account: %s", rows_streamed, payload.account_id)
+
+    async def _get_statement_chunk(
+        self, payload: RequestStatementInterface, chunk_size: int, after: Optional[Tuple[datetime, int]] = None
+    ) -> List[TransactionInterface]:
+        return await self._transaction_repository.get_transactions_page(
+            account_id=payload.account_id,
+            start_date=payload.start_date,
+            end_date=payload.end_date,
+            limit=chunk_size,
+            after=after,
+        )
+
+    @staticmethod
+    def _encode_statement_rows(rows: List[TransactionInterface], export_format: StatementExportFormat) -> str:
+        if export_format == StatementExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerows(
+                [
+                    row.transaction_id,
+                    row.account,
+                    row.amount,
+                    row.transaction_type,
+                    row.created_at.isoformat(),
+                ]
+                for row in rows
+            )
+            return buffer.getvalue()
+
+        return "".join(
+            dumps({
+                "transaction_id": row.transaction_id,
+                "account": row.account,
+                "amount": row.amount,
+                "transaction_type": row.transaction_type,
+                "created_at": row.created_at,
+            }).decode() + "\n"
+            for row in rows
+        )
+
+    @traced("service")
+    async def apply_batch(self, payload: RequestBatchTransactionInterface) -> BatchTransactionResponseInterface:
+        try:
+            logger.info("Applying batch of %s transactions", len(payload.items))
+            started_at = time.perf_counter()
+            group_size = Settings.get_settings().batch_group_size
+            transactions = [
+                TransactionInterface(
+                    account=item.account_id,
+                    amount=item.amount,
+                    transaction_type=item.transaction_type.value,
+                )
+                for item in payload.items
+            ]
+
+            outcomes = []
+            for start in range(0, len(transactions), group_size):
+                outcomes += await self._transaction_repository.apply_transactions_batch(
+                    transactions[start:start + group_size]
+                )
 
-            account.balance += payload.amount
-            account.updated_at = datetime.now()
-            await self._account_repository.update_account(account)
+            results = []
+            for index, outcome in enumerate(outcomes):
+                if isinstance(outcome, ExceptionMessageBuilder):
+                    transaction_rejections_total.inc(type(outcome).__name__)
+                    error = BatchTransactionErrorInterface(title=outcome.title, message=outcome.message)
+                    results.append(BatchTransactionResultInterface(index=index, error=error))
+                else:
+                    transactions_total.inc(TransactionType(outcome.transaction_type).name.lower())
+                    results.append(BatchTransactionResultInterface(index=index, transaction=outcome))
 
+            rejected = sum(1 for result in results if result.error is not None)
+            elapsed = time.perf_counter() - started_at
+            logger.info(
+                "Applied batch of %s transactions (%s rejected) in %.3fs, %.0f items/s",
+                len(results), rejected, elapsed, len(results) / elapsed if elapsed else 0,
+            )
+            return BatchTransactionResponseInterface(
+                applied=len(results) - rejected,
+                rejected=rejected,
+                results=results,
+            )
+        except Exception as e:
+            logger.error("Unable to apply batch of %s transactions. Error: %s", len(payload.items), e)
+            raise e
+
+    @traced("service")
+    async def deposit(self, payload: RequestDepositInterface) -> TransactionInterface:
+        try:
+            logger.info("Depositing %s to account: %s", payload.amount, payload.account_id)
             transaction = TransactionInterface(
-                account=account.account_id,
+                account=payload.account_id,
                 amount=payload.amount,
                 transaction_type=TransactionType.DEPOSIT.value,
             )
-            transaction_inserted = await self._transaction_repository.create_transaction(transaction)
+            try:
+                transaction_inserted = await self._transaction_writer.submit(transaction)
+            except ExceptionMessageBuilder as e:
+                transaction_rejections_total.inc(type(e).__name__)
+                raise e
 
-            logger.info(f"Deposited {payload.amount} to account: {payload.account_id}")
+            transactions_total.inc("deposit")
+            logger.info("Deposited %s to account: %s", payload.amount, payload.account_id)
             return transaction_inserted
         except Exception as e:
-            logger.error(f"Unable to deposit {payload.amount} to account: {payload.account_id}. Error: {e}")
+            logger.error("Unable to deposit %s to account: %s. Error: %s", payload.amount, payload.account_id, e)
             raise e
 
+    @traced("service")
     async def withdraw(self, payload: RequestWithdrawInterface) -> TransactionInterface:
         try:
-            try:
-                account = await self._account_repository.get_account_by_id(payload.account_id)
-            except ObjectNotFound as e:
-                logger.error(f"Unable to get account with account_id: {payload.account_id}. Error: {e}")
-                raise e
-
-            if account.state != AccountStates.ACTIVE.value:
-                raise TransactionNotAllowed()
-
-            if account.balance < payload.amount:
-                logger.error(f"Insufficient balance to withdraw {payload.amount} from account: {payload.account_id}")
-                raise InsufficientBalance()
-
-            today = datetime.now().date()
-            total_withdrawals_today = await self._transaction_repository.get_total_withdrawals(account.account_id, today)
-            if total_withdrawals_today + payload.amount > account.daily_limit:
-                logger.error(f"Daily limit reached for account: {payload.account_id}")
-                raise DailyLimitReached()
-
-            account.balance -= payload.amount
-            account.updated_at = datetime.now()
-            await self._account_repository.update_account(account)
-
             transaction = TransactionInterface(
-                account=account.account_id,
+                account=payload.account_id,
                 amount=payload.amount,
                 transaction_type=TransactionType.WITHDRAW.value,
             )
-            transaction_inserted = await self._transaction_repository.create_transaction(transaction)
+            try:
+                transaction_inserted = await self._transaction_writer.submit(transaction)
+            except InsufficientBalance as e:
+                transaction_rejections_total.inc(type(e).__name__)
+                logger.error("Insufficient balance to withdraw %s from account: %s", payload.amount, payload.account_id)
+                raise e
+            except DailyLimitReached as e:
+                transaction_rejections_total.inc(type(e).__name__)
+                logger.error("Daily limit reached for account: %s", payload.account_id)
+                raise e
+            except ExceptionMessageBuilder as e:
+                transaction_rejections_total.inc(type(e).__name__)
+                raise e
 
-            logger.info(f"Withdrawal {payload.amount} to account: {payload.account_id}")
+            transactions_total.inc("withdraw")
+            logger.info("Withdrawal %s to account: %s", payload.amount, payload.account_id)
             return transaction_inserted
         except Exception as e:
-            logger.error(f"Unable to withdraw {payload.amount} to account: {payload.account_id}. Error: {e}")
+            logger.error("Unable to withdraw %s to account: %s. Error: %s", payload.amount, payload.account_id, e)
             raise e
@@ -1,8 +1,8 @@
-from starlette.responses import JSONResponse
+from app.utils.serialization import FastJSONResponse
 
 
-def generate_error_response(*, status_code: int, content: dict) -> JSONResponse:
-    return JSONResponse(
+def generate_error_response(*, status_code: int, content: dict) -> FastJSONResponse:
+    return FastJSONResponse(
         content=content,
         status_code=status_code,
     )
@@ -0,0 +1,14 @@
+def cpf_check_digits(base: str) -> str:
+    """Computes the two check digits of a CPF from its first nine digits."""
+    digits = [int(digit) for digit in base]
+    for weight_start in (10, 11):
+        total = sum(digit * weight for digit, weight in zip(digits, range(weight_start, 1, -1)))
+        remainder = total * 10 % 11
+        digits.append(0 if remainder == 10 else remainder)
+    return "".join(str(digit) for digit in digits[9:])
+
+
+def generate_cpf(number: int) -> str:
+    """Builds a valid 11-digit CPF whose first nine digits are ``number`` zero-padded."""
+    base = f"{number % 10 ** 9:09d}"
+    return base + cpf_check_digits(base)
@@ -0,0 +1,190 @@
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class _ThreadShards:
+    """Per-thread dicts of partial values, merged only when the metrics are scraped.
+
+    Each thread only ever writes to its own shard, so recording a value never takes a lock;
+    the lock is taken once per thread (to register its shard) and on every scrape.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def copies(self) -> List[dict]:
+        with self._lock:
+            return [shard.copy() for shard in self._shards]
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._shards = _ThreadShards()
+
+    def _labels(self, labels: Tuple[str, ...]) -> str:
+        if not labels:
+            return ""
+        pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+        return "{" + pairs + "}"
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        shard = self._shards.get()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        totals = {}
+        for shard in self._shards.copies():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def _samples(self) -> Iterable[str]:
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{self._labels(labels)} {_number(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str):
+        shard = self._shards.get()
+        series = shard.get(labels)
+        if series is None:
+            # One slot per bucket plus +Inf, then sum and count.
+            series = shard[labels] = [0] * (len(self.buckets) + 3)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def _samples(self) -> Iterable[str]:
+        totals = {}
+        for shard in self._shards.copies():
+            for labels, series in shard.items():
+                merged = totals.setdefault(labels, [0] * len(series))
+                for index, value in enumerate(list(series)):
+                    merged[index] += value
+
+        for labels, series in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series):
+                cumulative += count
+                bucket_labels = self._labels(labels)[1:-1]
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                separator = "," if bucket_labels else ""
+                yield f'{self.name}_bucket{{{bucket_labels}{separator}le="{le}"}} {cumulative}'
+            yield f"{self.name}_sum{self._labels(labels)} {_number(series[-2])}"
+            yield f"{self.name}_count{self._labels(labels)} {series[-1]}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def counter(self, name: str, description: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, description, label_names))
+
+    def gauge(self, name: str, description: str, label_names: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, description, label_names))
+
+    def histogram(self, name: str, description: str, label_names: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, description, label_names, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]):
+        """Adds a callback that renders its own samples at scrape time (e.g. executor or cache stats)."""
+        self._collectors.append(collector)
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def render_stats(prefix: str, description: str, stats: dict) -> Iterable[str]:
+    """Renders the numeric fields of a ``get_stats()`` dict as gauges named ``<prefix>_<field>``."""
+    for field, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{field}"
+        yield f"# HELP {name} {description}: {field.replace('_', ' ')}."
+        yield f"# TYPE {name} gauge"
+        yield f"{name} {_number(value)}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ("method",),
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status"),
+)
+db_queries_total = registry.counter(
+    "db_queries_total", "SQL statements executed, by repository method.", ("method",),
+)
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds", "SQL statement duration, by repository method.", ("method",), QUERY_BUCKETS,
+)
+transactions_total = registry.counter(
+    "transactions_total", "Deposits and withdrawals applied.", ("type",),
+)
+transaction_rejections_total = registry.counter(
+    "transaction_rejections_total", "Deposits and withdrawals refused by a business rule.", ("reason",),
+)
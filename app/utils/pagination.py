@@ -0,0 +1,21 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+from app.config.exceptions.general import InvalidCursor
+
+
+def encode_cursor(created_at: datetime, transaction_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), transaction_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, transaction_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(transaction_id)
+    except (binascii.Error, TypeError, ValueError):
+        raise InvalidCursor()
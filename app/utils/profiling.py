@@ -0,0 +1,134 @@
+import collections
+import cProfile
+import pstats
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from app.config.settings import Settings
+
+_profile_store = None
+_profile_store_lock = threading.Lock()
+
+# The profile of the request being served, so work it hands to the database executors is
+# profiled on the executor thread as well.
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    """cProfile data of one request: the event loop part plus each repository call it made.
+
+    The profilers measure thread CPU time, so time spent waiting (the event loop polling, a
+    thread blocked on SQLite I/O) does not crowd out where the CPU actually went.
+    """
+
+    def __init__(self, profile_id: str):
+        self.profile_id = profile_id
+        self.name = ""
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+        self.event_loop_profile = cProfile.Profile(time.thread_time)
+        self._thread_profiles: List[cProfile.Profile] = []
+
+    def run_call(self, func, *args, **kwargs):
+        """Runs ``func`` on the calling thread under its own profiler, kept with this request."""
+        profile = cProfile.Profile(time.thread_time)
+        self._thread_profiles.append(profile)
+        return profile.runcall(func, *args, **kwargs)
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.event_loop_profile)
+        for profile in self._thread_profiles:
+            stats.add(profile)
+        return stats
+
+    def summary(self) -> dict:
+        return {
+            "profile_id": self.profile_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+        }
+
+
+def top_functions(stats: pstats.Stats, limit: int, sort: str = "tottime") -> List[dict]:
+    """The ``limit`` most expensive functions, each with the callers it spent most time under."""
+    stats.sort_stats(sort)
+    functions = []
+    for function in stats.fcn_list[:limit]:
+        primitive_calls, calls, own_time, cumulative_time, callers = stats.stats[function]
+        heaviest_callers = sorted(callers.items(), key=lambda item: item[1][3], reverse=True)[:3]
+        functions.append({
+            "function": pstats.func_std_string(function),
+            "calls": calls,
+            "own_ms": round(own_time * 1000, 3),
+            "cumulative_ms": round(cumulative_time * 1000, 3),
+            "callers": [pstats.func_std_string(caller) for caller, _ in heaviest_callers],
+        })
+    return functions
+
+
+class ProfileStore:
+    """Bounded store of recent request profiles plus one aggregated profile per route."""
+
+    def __init__(self, max_profiles: int, top_n: int):
+        self._top_n = top_n
+        self._profiles = collections.deque(maxlen=max_profiles)
+        self._routes: Dict[str, pstats.Stats] = {}
+        self._route_counts: Dict[str, int] = collections.Counter()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile):
+        """Aggregates a finished profile. Runs off the event loop: building the stats is not cheap."""
+        stats = profile.stats()
+        entry = {**profile.summary(), "top": top_functions(stats, self._top_n)}
+        with self._lock:
+            self._profiles.append(entry)
+            self._route_counts[profile.name] += 1
+            if profile.name in self._routes:
+                self._routes[profile.name].add(stats)
+            else:
+                self._routes[profile.name] = stats
+
+    def recent(self, limit: int) -> List[dict]:
+        with self._lock:
+            entries = list(self._profiles)[-limit:]
+        return [{key: value for key, value in entry.items() if key != "top"} for entry in reversed(entries)]
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        with self._lock:
+            for entry in reversed(self._profiles):
+                if entry["profile_id"] == profile_id:
+                    return entry
+        return None
+
+    def aggregate(self, route: str, sort: str = "tottime") -> Optional[dict]:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                return None
+            return {
+                "name": route,
+                "profiles": self._route_counts[route],
+                "sort": sort,
+                "top": top_functions(stats, self._top_n, sort),
+            }
+
+    def routes(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._route_counts)
+
+
+def get_profile_store() -> ProfileStore:
+    global _profile_store
+    if _profile_store is None:
+        with _profile_store_lock:
+            if _profile_store is None:
+                settings = Settings.get_settings()
+                _profile_store = ProfileStore(
+                    max_profiles=settings.profiling_buffer_size,
+                    top_n=settings.profiling_top_n,
+                )
+
+    return _profile_store
@@ -0,0 +1,69 @@
+import datetime
+import json
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Type
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional, the stdlib encoder is used instead
+    orjson = None
+
+_model_encoders: Dict[Type[BaseModel], Callable[[BaseModel], dict]] = {}
+
+
+def model_encoder(model: Type[BaseModel]) -> Callable[[BaseModel], dict]:
+    """Returns the encoder of a pydantic model class, built once from its fields.
+
+    The encoder reads the already validated values straight from the instance, without copying
+    or converting them; nested models, datetimes and enums are handled by the JSON backend.
+    """
+    encoder = _model_encoders.get(model)
+    if encoder is None:
+        fields = tuple((field.name, field.alias) for field in model.__fields__.values())
+
+        def encoder(instance: BaseModel) -> dict:
+            values = instance.__dict__
+            return {alias: values[name] for name, alias in fields}
+
+        _model_encoders[model] = encoder
+
+    return encoder
+
+
+def _default(value: Any):
+    if isinstance(value, BaseModel):
+        return model_encoder(type(value))(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _orjson_dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+
+dumps: Callable[[Any], bytes] = _orjson_dumps if orjson is not None else _stdlib_dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that serializes pydantic models (and lists of them) directly to bytes.
+
+    Handlers return their interfaces as the content, skipping ``jsonable_encoder``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+import fastapi
+import pydantic
+from fastapi import FastAPI
+
+from app.utils.metrics import registry, render_stats
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_startup_report = None
+_startup_report_lock = threading.Lock()
+
+
+class StartupReport:
+    """Duration of each startup phase of this process, in milliseconds, in the order they ran.
+
+    Phases are recorded once: an app built again in the same process (tests, a reload) does not
+    overwrite the cold numbers.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.first_request_pending = True
+
+    def add(self, phase: str, duration_ms: float):
+        self.phases.setdefault(phase, duration_ms)
+
+    def record(self, phase: str, started_at: float) -> float:
+        duration_ms = round((time.perf_counter() - started_at) * 1000, 3)
+        self.add(phase, duration_ms)
+        return duration_ms
+
+    def record_first_request(self, started_at: float, route: str):
+        self.first_request_pending = False
+        duration_ms = self.record("first_request", started_at)
+        logger.info("First request (%s) served in %.1f ms; startup phases: %s", route, duration_ms, self.phases)
+
+    def to_dict(self) -> dict:
+        return {"phases": dict(self.phases), "total_ms": round(sum(self.phases.values()), 3)}
+
+
+def get_startup_report() -> StartupReport:
+    global _startup_report
+    if _startup_report is None:
+        with _startup_report_lock:
+            if _startup_report is None:
+                _startup_report = StartupReport()
+
+    return _startup_report
+
+
+def collect_startup_stats():
+    yield from render_stats("startup_phase_ms", "Startup phase duration in milliseconds", get_startup_report().phases)
+
+
+registry.register_collector(collect_startup_stats)
+
+
+def openapi_cache_key(app: FastAPI) -> str:
+    """Changes whenever the schema can: a module of the app, FastAPI or pydantic was replaced or edited."""
+    digest = hashlib.sha256(f"{app.title} {app.version} {fastapi.__version__} {pydantic.VERSION}".encode())
+    for name, module in sorted(list(sys.modules.items())):
+        path = getattr(module, "__file__", None)
+        if path and path.startswith(APP_DIR + os.sep):
+            stat = os.stat(path)
+            digest.update(f"{name} {stat.st_mtime_ns} {stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def _load_openapi(cache_path: str, key: str) -> Optional[dict]:
+    try:
+        with open(cache_path, encoding="utf-8") as file:
+            cached = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable OpenAPI cache %s", cache_path, exc_info=True)
+        return None
+    return cached["schema"] if isinstance(cached, dict) and cached.get("key") == key else None
+
+
+def _store_openapi(cache_path: str, key: str, schema: dict):
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump({"key": key, "schema": schema}, file)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        logger.warning("Could not write the OpenAPI cache %s", cache_path, exc_info=True)
+
+
+def install_openapi_cache(app: FastAPI, cache_path: Optional[str]):
+    """Times the first OpenAPI generation and, given ``cache_path``, reuses the schema of a previous run.
+
+    FastAPI already builds the schema lazily, on the first ``/openapi.json`` or ``/docs`` request,
+    and keeps it for the life of the process; the file carries it across restarts until the code
+    it was generated from changes.
+    """
+    generate = app.openapi
+
+    def openapi() -> dict:
+        if app.openapi_schema is None:
+            started_at = time.perf_counter()
+            key = openapi_cache_key(app) if cache_path else None
+            schema = _load_openapi(cache_path, key) if cache_path else None
+            source = "loaded from cache"
+            if schema is None:
+                schema = generate()
+                source = "generated"
+                if cache_path:
+                    _store_openapi(cache_path, key, schema)
+            app.openapi_schema = schema
+            duration_ms = get_startup_report().record("openapi", started_at)
+            logger.info("OpenAPI schema %s in %.1f ms", source, duration_ms)
+        return app.openapi_schema
+
+    app.openapi = openapi
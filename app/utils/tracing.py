@@ -0,0 +1,224 @@
+import atexit
+import collections
+import contextlib
+import functools
+import inspect
+import itertools
+import json
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from typing import Iterable, List, Optional, Tuple
+
+from app.config.settings import Settings
+
+_trace_store = None
+_trace_store_lock = threading.Lock()
+
+# The spans a new span is attached to, as (trace, parent span id) pairs. Normally a single pair;
+# the transaction writer sets one pair per traced request in a batch, so the commit they share
+# shows up in each of their traces.
+SpanParents = Tuple[Tuple["Trace", Optional[int]], ...]
+_current_parents: ContextVar[Optional[SpanParents]] = ContextVar("trace_span_parents", default=None)
+
+
+class Trace:
+    """Spans recorded for one sampled request, timed relative to the start of the request."""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.name = ""
+        self.status_code = None
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+        self.spans: List[dict] = []
+        self._started_perf = time.perf_counter()
+        self._span_ids = itertools.count(1)
+
+    def next_span_id(self) -> int:
+        return next(self._span_ids)
+
+    def offset_ms(self, perf_counter: float) -> float:
+        return round((perf_counter - self._started_perf) * 1000, 3)
+
+    def summary(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "spans": len(self.spans),
+        }
+
+    def to_dict(self) -> dict:
+        return {**self.summary(), "spans": sorted(self.spans, key=lambda span: span["start_ms"])}
+
+
+def capture_parents() -> Optional[SpanParents]:
+    """The span context of the caller, to be resumed later from another task (see ``linked_span``)."""
+    return _current_parents.get()
+
+
+@contextlib.contextmanager
+def start_trace(trace: Trace):
+    token = _current_parents.set(((trace, None),))
+    try:
+        yield trace
+    finally:
+        _current_parents.reset(token)
+
+
+def is_tracing() -> bool:
+    return _current_parents.get() is not None
+
+
+@contextlib.contextmanager
+def span(name: str, kind: str, **attributes):
+    """Times the enclosed block as a child of the current span. A no-op outside a sampled trace."""
+    parents = _current_parents.get()
+    if not parents:
+        yield
+        return
+
+    children = tuple((trace, trace.next_span_id()) for trace, _ in parents)
+    token = _current_parents.set(children)
+    started_at = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        attributes["error"] = type(e).__name__
+        raise
+    finally:
+        finished_at = time.perf_counter()
+        _current_parents.reset(token)
+        _record(parents, children, name, kind, started_at, finished_at, attributes)
+
+
+def record_span(name: str, kind: str, started_at: float, finished_at: float, **attributes):
+    """Records an already timed leaf span (``time.perf_counter`` values) under the current span."""
+    parents = _current_parents.get()
+    if parents:
+        children = tuple((trace, trace.next_span_id()) for trace, _ in parents)
+        _record(parents, children, name, kind, started_at, finished_at, attributes)
+
+
+def _record(
+    parents: SpanParents, children: SpanParents, name: str, kind: str, started_at: float, finished_at: float,
+    attributes: dict,
+):
+    for (trace, parent_id), (_, span_id) in zip(parents, children):
+        trace.spans.append({
+            "span_id": span_id,
+            "parent_id": parent_id,
+            "name": name,
+            "kind": kind,
+            "start_ms": trace.offset_ms(started_at),
+            "duration_ms": round((finished_at - started_at) * 1000, 3),
+            **attributes,
+        })
+
+
+@contextlib.contextmanager
+def linked_span(name: str, kind: str, parents: Iterable[Optional[SpanParents]], **attributes):
+    """Records one span under every given span context, for work done on behalf of several requests."""
+    merged = tuple(pair for captured in parents if captured for pair in captured)
+    token = _current_parents.set(merged or None)
+    try:
+        with span(name, kind, **attributes):
+            yield
+    finally:
+        _current_parents.reset(token)
+
+
+def traced(kind: str, name: str = None):
+    """Records a span around each call of the decorated function or coroutine function."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_parents.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name, kind):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_parents.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class JsonlTraceExporter:
+    """Appends finished traces to a JSON Lines file from a background thread."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def export(self, trace: Trace):
+        self._queue.put(trace)
+
+    def _run(self):
+        with open(self._path, "a", encoding="utf-8") as file:
+            while True:
+                trace = self._queue.get()
+                if trace is None:
+                    return
+                file.write(json.dumps(trace.to_dict(), default=str) + "\n")
+                if self._queue.empty():
+                    file.flush()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+class TraceStore:
+    """Ring buffer of the most recent sampled traces, optionally exported to a JSONL file."""
+
+    def __init__(self, max_traces: int, exporter: JsonlTraceExporter = None):
+        self._traces = collections.deque(maxlen=max_traces)
+        self._exporter = exporter
+
+    def add(self, trace: Trace):
+        self._traces.append(trace)
+        if self._exporter is not None:
+            self._exporter.export(trace)
+
+    def recent(self, limit: int, min_duration_ms: float = 0.0) -> List[dict]:
+        traces = [trace for trace in reversed(self._traces) if trace.duration_ms >= min_duration_ms]
+        return [trace.summary() for trace in traces[:limit]]
+
+    def get(self, trace_id: str) -> Optional[dict]:
+        for trace in reversed(self._traces):
+            if trace.trace_id == trace_id:
+                return trace.to_dict()
+        return None
+
+
+def get_trace_store() -> TraceStore:
+    global _trace_store
+    if _trace_store is None:
+        with _trace_store_lock:
+            if _trace_store is None:
+                settings = Settings.get_settings()
+                exporter = JsonlTraceExporter(settings.tracing_export_path) if settings.tracing_export_path else None
+                _trace_store = TraceStore(max_traces=settings.tracing_buffer_size, exporter=exporter)
+
+    return _trace_store
@@ -0,0 +1,320 @@
+"""Load and latency benchmark for the HTTP API.
+
+Drives ``create_app()`` in-process through ``httpx.ASGITransport`` (default), a real uvicorn
+server started on localhost (``--server``) or an already running instance (``--url``), runs the
+scripted request mixes below and prints throughput and p50/p95/p99 latency per route as JSON.
+
+    python -m benchmarks.http_benchmark --mix all --requests 2000 --concurrency 32 --output bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEPOSIT = 1
+WITHDRAW = 2
+SETUP_BATCH_SIZE = 5000
+
+
+class BenchmarkRequest(NamedTuple):
+    method: str
+    route: str
+    path: str
+    json: Optional[dict] = None
+    params: Optional[dict] = None
+
+
+class Mix(NamedTuple):
+    name: str
+    description: str
+    next_request: Callable[[random.Random, List[int]], BenchmarkRequest]
+    initial_balance: float = 0.0
+    statement_rows: int = 0
+
+
+def deposit(account_id: int, amount: float) -> BenchmarkRequest:
+    return BenchmarkRequest("POST", "POST /v1/transactions/deposit", "/v1/transactions/deposit",
+                            json={"account_id": account_id, "amount": amount})
+
+
+def withdraw(account_id: int, amount: float) -> BenchmarkRequest:
+    return BenchmarkRequest("POST", "POST /v1/transactions/withdraw", "/v1/transactions/withdraw",
+                            json={"account_id": account_id, "amount": amount})
+
+
+def get_account(account_id: int) -> BenchmarkRequest:
+    return BenchmarkRequest("GET", "GET /v1/accounts/{account_id}", f"/v1/accounts/{account_id}")
+
+
+def get_statement(account_id: int, limit: int = None) -> BenchmarkRequest:
+    params = {
+        "start_date": (date.today() - timedelta(days=365)).isoformat(),
+        "end_date": (date.today() + timedelta(days=1)).isoformat(),
+    }
+    route = "GET /v1/transactions/statement/{account_id}"
+    if limit is not None:
+        params["limit"] = limit
+        route += "?limit"
+    return BenchmarkRequest("GET", route, f"/v1/transactions/statement/{account_id}", params=params)
+
+
+def deposit_heavy(rng: random.Random, accounts: List[int]) -> BenchmarkRequest:
+    roll = rng.random()
+    account_id = rng.choice(accounts)
+    if roll < 0.8:
+        return deposit(account_id, rng.randint(1, 500))
+    if roll < 0.9:
+        return withdraw(account_id, rng.randint(1, 50))
+    return get_account(account_id)
+
+
+def withdraw_near_limit(rng: random.Random, accounts: List[int]) -> BenchmarkRequest:
+    account_id = rng.choice(accounts)
+    if rng.random() < 0.9:
+        return withdraw(account_id, rng.randint(50, 250))
+    return get_account(account_id)
+
+
+def large_statements(rng: random.Random, accounts: List[int]) -> BenchmarkRequest:
+    account_id = rng.choice(accounts)
+    if rng.random() < 0.5:
+        return get_statement(account_id)
+    return get_statement(account_id, limit=100)
+
+
+def hot_account(rng: random.Random, accounts: List[int]) -> BenchmarkRequest:
+    account_id = accounts[0] if rng.random() < 0.9 else rng.choice(accounts)
+    roll = rng.random()
+    if roll < 0.5:
+        return deposit(account_id, rng.randint(1, 100))
+    if roll < 0.8:
+        return withdraw(account_id, rng.randint(1, 20))
+    return get_account(account_id)
+
+
+MIXES: Dict[str, Mix] = {
+    mix.name: mix for mix in (
+        Mix("deposit_heavy", "80% deposits, 10% small withdrawals, 10% account reads over all accounts",
+            deposit_heavy),
+        Mix("withdraw_near_limit", "Withdrawals that run into the daily limit, plus account reads",
+            withdraw_near_limit, initial_balance=100000.0),
+        Mix("large_statements", "Default and explicitly sized statement pages over accounts with a long history",
+            large_statements, statement_rows=5000),
+        Mix("hot_account", "Deposits, withdrawals and reads where 90% of requests hit one account",
+            hot_account, initial_balance=100000.0),
+    )
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: Dict[str, List[float]], statuses: Dict[str, Counter], elapsed: float) -> dict:
+    routes = {}
+    for route in sorted(latencies):
+        values = sorted(latencies[route])
+        routes[route] = {
+            "count": len(values),
+            "errors": sum(count for code, count in statuses[route].items() if not code.startswith(("2", "4"))),
+            "status_codes": dict(statuses[route]),
+            "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+            "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+        }
+
+    total = sum(route["count"] for route in routes.values())
+    return {
+        "requests": total,
+        "duration_seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+async def create_accounts(client: httpx.AsyncClient, count: int, initial_balance: float) -> List[int]:
+    cpf_base = random.randrange(10 ** 10)
+    accounts = []
+    for index in range(count):
+        owner = await client.post("/v1/accounts/owner", json={
+            "name": f"Benchmark {index}", "cpf": f"{(cpf_base + index) % 10 ** 11:011d}",
+        })
+        owner.raise_for_status()
+        account = await client.post("/v1/accounts/create", json={"account_owner_id": owner.json()["id"]})
+        account.raise_for_status()
+        accounts.append(account.json()["account_id"])
+
+    if initial_balance:
+        await apply_deposits(client, [(account_id, initial_balance) for account_id in accounts])
+    return accounts
+
+
+async def apply_deposits(client: httpx.AsyncClient, deposits: List[tuple]):
+    for start in range(0, len(deposits), SETUP_BATCH_SIZE):
+        items = [
+            {"account_id": account_id, "amount": amount, "transaction_type": DEPOSIT}
+            for account_id, amount in deposits[start:start + SETUP_BATCH_SIZE]
+        ]
+        response = await client.post("/v1/transactions/batch", json={"items": items})
+        response.raise_for_status()
+
+
+async def run_mix(
+    client: httpx.AsyncClient, mix: Mix, accounts_count: int, requests: int, concurrency: int, seed: int
+) -> dict:
+    accounts = await create_accounts(client, accounts_count, mix.initial_balance)
+    if mix.statement_rows:
+        statement_accounts = accounts[:min(len(accounts), 5)]
+        await apply_deposits(client, [
+            (account_id, 1.0) for account_id in statement_accounts for _ in range(mix.statement_rows)
+        ])
+        accounts = statement_accounts
+
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    remaining = iter(range(requests))
+
+    async def worker(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        for _ in remaining:
+            request = mix.next_request(rng, accounts)
+            started_at = time.perf_counter()
+            try:
+                response = await client.request(request.method, request.path, json=request.json,
+                                                params=request.params)
+                status_code = str(response.status_code)
+            except httpx.HTTPError as e:
+                status_code = type(e).__name__
+            latencies[request.route].append(time.perf_counter() - started_at)
+            statuses[request.route][status_code] += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[worker(worker_id) for worker_id in range(concurrency)])
+    report = summarize(latencies, statuses, time.perf_counter() - started_at)
+    return {"mix": mix.name, "description": mix.description, "accounts": len(accounts), **report}
+
+
+@contextlib.asynccontextmanager
+async def in_process_client():
+    from app.http_server import create_app
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            yield client
+
+
+@contextlib.asynccontextmanager
+async def uvicorn_client(env: dict, workers: int):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.http_server:create_app", "--factory",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/openapi.json")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(args: argparse.Namespace, mixes: List[Mix]) -> dict:
+    if args.url:
+        mode = "url"
+        client_context = httpx.AsyncClient(base_url=args.url, timeout=60)
+    elif args.server:
+        mode = "uvicorn"
+        client_context = uvicorn_client(dict(os.environ), args.workers)
+    else:
+        mode = "in-process"
+        client_context = in_process_client()
+
+    async with client_context as client:
+        results = [
+            await run_mix(client, mix, args.accounts, args.requests, args.concurrency, args.seed)
+            for mix in mixes
+        ]
+
+    return {
+        "commit": git_commit(),
+        "mode": mode,
+        "concurrency": args.concurrency,
+        "mixes": {result.pop("mix"): result for result in results},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency benchmark for the HTTP API.")
+    parser.add_argument("--mix", default="all", choices=["all", *MIXES], help="Request mix to run.")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests sent per mix.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight at the same time.")
+    parser.add_argument("--accounts", type=int, default=100, help="Accounts created for each mix.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the request sequence.")
+    parser.add_argument("--db", default=None, help="Database file (default: a new temporary file).")
+    parser.add_argument("--server", action="store_true", help="Run against a real uvicorn on localhost.")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when --server is set.")
+    parser.add_argument("--url", default=None, help="Benchmark an already running API instead.")
+    parser.add_argument("--log-level", default="WARNING", help="Application log level while benchmarking.")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file.")
+    args = parser.parse_args()
+
+    if not args.url:
+        os.environ["DB_PATH"] = args.db or os.path.join(tempfile.mkdtemp(prefix="benchmark-"), "accounts.db")
+    os.environ["LOG_LEVEL"] = args.log_level
+    logging.basicConfig(level=args.log_level, force=True)
+
+    mixes = list(MIXES.values()) if args.mix == "all" else [MIXES[args.mix]]
+    report = json.dumps(asyncio.run(run_benchmark(args, mixes)), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+    print(report)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
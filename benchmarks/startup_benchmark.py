@@ -0,0 +1,115 @@
+"""Cold start benchmark for the HTTP API.
+
+Starts the application in a fresh interpreter per run and prints, as JSON, the median and worst
+duration of every startup phase: the imports, ``create_app()``, each container phase (the schema
+check among them), the first request and the first OpenAPI generation. ``cold`` runs get a new
+database file and OpenAPI cache each time; ``warm`` runs restart on the files a previous run left.
+
+    python -m benchmarks.startup_benchmark --runs 10 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.http_benchmark import ROOT_DIR, git_commit, percentile
+
+REPORT_PREFIX = "STARTUP_REPORT "
+
+# Run in the child interpreter: the app is imported, started and queried exactly once.
+CHILD_SCRIPT = f"""
+import asyncio
+import json
+
+import httpx
+
+from app.http_server import create_app
+from app.utils.startup import get_startup_report
+
+
+async def main():
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            await client.get("/v1/accounts/1")
+            (await client.get("/openapi.json")).raise_for_status()
+
+
+asyncio.run(main())
+print({REPORT_PREFIX!r} + json.dumps(get_startup_report().phases), flush=True)
+"""
+
+
+def run_once(env: dict) -> Dict[str, float]:
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT], cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    process_ms = round((time.perf_counter() - started_at) * 1000, 3)
+    for line in result.stdout.splitlines():
+        if line.startswith(REPORT_PREFIX):
+            return {**json.loads(line[len(REPORT_PREFIX):]), "process": process_ms}
+    raise RuntimeError(f"No startup report in the output of the child process:\n{result.stdout}{result.stderr}")
+
+
+def summarize(runs: List[Dict[str, float]]) -> dict:
+    phases: Dict[str, List[float]] = {}
+    for run in runs:
+        for phase, duration_ms in run.items():
+            phases.setdefault(phase, []).append(duration_ms)
+
+    summary = {}
+    for phase, values in phases.items():
+        values.sort()
+        summary[phase] = {"p50_ms": round(percentile(values, 0.50), 3), "max_ms": round(values[-1], 3)}
+    return {"runs": len(runs), "phases": summary}
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    base_env = {**os.environ, "LOG_LEVEL": args.log_level}
+    results = {}
+
+    cold_runs = []
+    for _ in range(args.runs):
+        directory = tempfile.mkdtemp(prefix="startup-benchmark-")
+        cold_runs.append(run_once({
+            **base_env,
+            "DB_PATH": os.path.join(directory, "accounts.db"),
+            "OPENAPI_CACHE_PATH": os.path.join(directory, "openapi.json"),
+        }))
+    results["cold"] = summarize(cold_runs)
+
+    directory = tempfile.mkdtemp(prefix="startup-benchmark-")
+    warm_env = {
+        **base_env,
+        "DB_PATH": os.path.join(directory, "accounts.db"),
+        "OPENAPI_CACHE_PATH": os.path.join(directory, "openapi.json"),
+    }
+    # The first start creates the schema and the OpenAPI cache the measured restarts reuse.
+    run_once(warm_env)
+    results["warm"] = summarize([run_once(warm_env) for _ in range(args.runs)])
+
+    return {"commit": git_commit(), "python": sys.version.split()[0], "modes": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time benchmark for the HTTP API.")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes started per mode.")
+    parser.add_argument("--log-level", default="WARNING", help="Application log level while benchmarking.")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file.")
+    args = parser.parse_args()
+
+    report = json.dumps(run_benchmark(args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+    print(report)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
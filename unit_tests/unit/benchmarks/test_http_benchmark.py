@@ -0,0 +1,31 @@
+from collections import Counter
+
+from benchmarks.http_benchmark import percentile, summarize
+
+
+def test_percentile_uses_nearest_rank():
+    # Scenario
+    values = [float(value) for value in range(1, 101)]
+
+    # Action / Result
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.99) == 0.0
+
+
+def test_summarize_reports_latency_and_errors_per_route():
+    # Scenario
+    latencies = {"POST /v1/transactions/deposit": [0.001, 0.002, 0.003, 0.004]}
+    statuses = {"POST /v1/transactions/deposit": Counter({"200": 2, "422": 1, "500": 1})}
+
+    # Action
+    report = summarize(latencies, statuses, elapsed=2.0)
+
+    # Result
+    route = report["routes"]["POST /v1/transactions/deposit"]
+    assert report["requests"] == 4
+    assert report["throughput_rps"] == 2.0
+    assert route["errors"] == 1
+    assert route["p50_ms"] == 2.0
+    assert route["p99_ms"] == 4.0
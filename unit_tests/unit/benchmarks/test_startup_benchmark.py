@@ -0,0 +1,20 @@
+from benchmarks.startup_benchmark import summarize
+
+
+def test_summarize_reports_median_and_worst_duration_per_phase():
+    # Scenario
+    runs = [
+        {"import": 200.0, "schema_check": 5.0, "first_request": 4.0},
+        {"import": 220.0, "schema_check": 0.2, "first_request": 3.0},
+        {"import": 210.0, "schema_check": 0.3},
+    ]
+
+    # Action
+    report = summarize(runs)
+
+    # Result
+    assert report["runs"] == 3
+    assert list(report["phases"]) == ["import", "schema_check", "first_request"]
+    assert report["phases"]["import"] == {"p50_ms": 210.0, "max_ms": 220.0}
+    assert report["phases"]["schema_check"] == {"p50_ms": 0.3, "max_ms": 5.0}
+    assert report["phases"]["first_request"] == {"p50_ms": 3.0, "max_ms": 4.0}
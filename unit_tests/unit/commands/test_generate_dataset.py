@@ -0,0 +1,47 @@
+import sqlite3
+
+from peewee import SqliteDatabase
+
+from app.commands.generate_dataset import DAILY_LIMIT, DatasetGenerator
+from app.database import models
+
+
+def test_generate_keeps_balances_consistent_with_the_ledger(tmp_path):
+    # Scenario
+    database_path = str(tmp_path / "accounts.db")
+    database = SqliteDatabase(database_path)
+    with database.bind_ctx(models):
+        database.create_tables(models)
+    database.close()
+    generator = DatasetGenerator(
+        accounts=20,
+        transactions_per_account=50,
+        hot_fraction=0.1,
+        hot_share=0.5,
+        days=10,
+        batch_size=100,
+        seed=1,
+    )
+
+    # Action
+    report = generator.generate(database_path)
+
+    # Result
+    conn = sqlite3.connect(database_path)
+    mismatched_balances = conn.execute(
+        'SELECT COUNT(*) FROM account a WHERE ABS(a.balance - (SELECT COALESCE(SUM(CASE t.transaction_type '
+        'WHEN 1 THEN t.amount ELSE -t.amount END), 0) FROM "transaction" t WHERE t.account_id = a.account_id)) > 0.01'
+    ).fetchone()[0]
+    largest_daily_withdrawal = conn.execute(
+        'SELECT MAX(total) FROM (SELECT SUM(amount) AS total FROM "transaction" WHERE transaction_type = 2 '
+        'GROUP BY account_id, DATE(created_at))'
+    ).fetchone()[0]
+    indexes = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transaction'"
+    ).fetchone()[0]
+    conn.close()
+
+    assert report["transactions"] == 1000
+    assert mismatched_balances == 0
+    assert largest_daily_withdrawal <= DAILY_LIMIT
+    assert indexes == 2
@@ -0,0 +1,43 @@
+import csv
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.commands.import_onboarding import import_file
+
+
+@pytest.mark.asyncio
+async def test_import_file_rejects_ndjson_lines_that_are_not_objects(tmp_path):
+    # Scenario
+    path = tmp_path / "owners.ndjson"
+    lines = [
+        {"name": "Yuri Fernandes", "cpf": "39410675839"},
+        [1, 2],
+        "x",
+        3,
+        {"name": "Maria", "cpf": "22222222222"},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n", encoding="utf-8")
+    rejects_path = tmp_path / "owners.rejects.csv"
+
+    # Action
+    with patch("app.services.onboarding_service.AccountRepository") as MockAccountRepository:
+        bulk_create = MockAccountRepository.return_value.bulk_create_accounts_with_owners = AsyncMock(
+            return_value=set()
+        )
+        report = await import_file(str(path), str(rejects_path), chunk_size=10)
+
+    # Result
+    assert report.read == 5
+    assert report.imported == 2
+    assert report.rejected == 3
+    assert [owner.cpf for owner in bulk_create.call_args.args[0]] == ["39410675839", "22222222222"]
+    with open(rejects_path, newline="", encoding="utf-8") as file:
+        rejects = list(csv.reader(file))
+    assert rejects == [
+        ["line", "name", "cpf", "reason"],
+        ["2", "", "", "row is not a JSON object"],
+        ["3", "", "", "row is not a JSON object"],
+        ["4", "", "", "row is not a JSON object"],
+    ]
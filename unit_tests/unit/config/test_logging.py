@@ -0,0 +1,46 @@
+import json
+import logging
+import queue
+
+from app.config.logging import ContextQueueHandler, JsonFormatter, SuccessPathSampler, parse_logger_levels
+from app.utils.request_context import request_id_var
+
+
+def test_queued_record_is_formatted_as_json_with_the_request_id():
+    # Scenario
+    log_queue = queue.SimpleQueue()
+    handler = ContextQueueHandler(log_queue)
+    record = logging.makeLogRecord({
+        "name": "app.services.transaction_service", "levelno": logging.INFO, "levelname": "INFO",
+        "msg": "Deposit of %s applied to account_id: %s", "args": (10.0, 1), "account_id": 1,
+    })
+
+    # Action
+    token = request_id_var.set("3f2a")
+    try:
+        handler.handle(record)
+    finally:
+        request_id_var.reset(token)
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+
+    # Result
+    assert entry["message"] == "Deposit of 10.0 applied to account_id: 1"
+    assert entry["request_id"] == "3f2a"
+    assert entry["account_id"] == 1
+    assert entry["level"] == "INFO"
+
+
+def test_sampler_only_drops_application_info_records():
+    # Scenario
+    sampler = SuccessPathSampler(sample_rate=0)
+
+    def record(name, level):
+        return logging.makeLogRecord({"name": name, "levelno": level})
+
+    # Action / Result
+    assert not sampler.filter(record("app.services.account_service", logging.INFO))
+    assert sampler.filter(record("app.services.account_service", logging.ERROR))
+    assert sampler.filter(record("uvicorn.error", logging.INFO))
+    assert parse_logger_levels("app.database=warning, uvicorn.access=ERROR,") == {
+        "app.database": "WARNING", "uvicorn.access": "ERROR",
+    }
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+from app.config.settings import Settings
+from app.database.cache import AccountCache, account_cache_max_size
+from app.interfaces.account import AccountInterface
+
+
+def build_account(account_id: int, balance: float = 0.0) -> AccountInterface:
+    return AccountInterface(
+        account_id=account_id,
+        account_owner=1,
+        agency="0001",
+        checking_account_number=12345,
+        balance=balance,
+    )
+
+
+def test_get_returns_cached_account():
+    # Scenario
+    cache = AccountCache(max_size=10, ttl_seconds=30)
+    cache.set(1, build_account(1, balance=100.0))
+
+    # Action
+    result = cache.get(1)
+
+    # Result
+    assert result.balance == 100.0
+    assert cache.get(2) is None
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used():
+    # Scenario
+    cache = AccountCache(max_size=2, ttl_seconds=30)
+    cache.set(1, build_account(1))
+    cache.set(2, build_account(2))
+    cache.get(1)
+
+    # Action
+    cache.set(3, build_account(3))
+
+    # Result
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.get(3) is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_expires_after_ttl():
+    # Scenario
+    cache = AccountCache(max_size=10, ttl_seconds=30)
+    with patch("app.database.cache.time.monotonic", return_value=1000.0):
+        cache.set(1, build_account(1))
+
+    # Action
+    with patch("app.database.cache.time.monotonic", return_value=1031.0):
+        result = cache.get(1)
+
+    # Result
+    assert result is None
+    assert cache.get_stats()["expirations"] == 1
+
+
+def test_invalidate_rejects_load_started_before_write():
+    # Scenario
+    cache = AccountCache(max_size=10, ttl_seconds=30)
+    generation = cache.generation(1)
+
+    # Action
+    cache.invalidate([1])
+    cache.set(1, build_account(1, balance=100.0), generation=generation)
+
+    # Result
+    assert cache.get(1) is None
+
+
+def test_cache_is_disabled_with_several_workers_unless_opted_in():
+    # Scenario
+    single_worker = Settings(fast_api_workers=1, account_cache_max_size=100)
+    several_workers = Settings(fast_api_workers=4, account_cache_max_size=100)
+    opted_in = Settings(fast_api_workers=4, account_cache_max_size=100, account_cache_multi_worker=True)
+
+    # Action / Result
+    assert account_cache_max_size(single_worker) == 100
+    assert account_cache_max_size(several_workers) == 0
+    assert account_cache_max_size(opted_in) == 100
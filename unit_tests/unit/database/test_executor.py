@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.config.exceptions.general import DatabaseBusy
+from app.database.executor import DatabaseExecutor
+
+
+@pytest.fixture
+def build_executor():
+    """Executors whose threads do not connect to the application database."""
+    executors = []
+
+    def build(max_workers: int, max_queue_size: int) -> DatabaseExecutor:
+        executor = DatabaseExecutor(max_workers=max_workers, max_queue_size=max_queue_size)
+        executors.append(executor)
+        return executor
+
+    with patch.object(DatabaseExecutor, "_init_worker"):
+        yield build
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_calls_beyond_the_queue_bound(build_executor):
+    # Scenario
+    executor = build_executor(max_workers=1, max_queue_size=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_call():
+        started.set()
+        release.wait(timeout=5)
+        return "done"
+
+    running = asyncio.ensure_future(executor.run(blocking_call))
+    await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+    queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+    await asyncio.sleep(0)
+
+    # Action
+    with pytest.raises(DatabaseBusy):
+        await executor.run(lambda: "rejected")
+    stats = executor.get_stats()
+    release.set()
+
+    # Result
+    assert await running == "done"
+    assert await queued == "queued"
+    assert stats["running"] == 1
+    assert stats["queue_depth"] == 1
+    assert stats["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_bounds_concurrency_and_records_wait_and_completion(build_executor):
+    # Scenario
+    executor = build_executor(max_workers=2, max_queue_size=100)
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def slow_call():
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+
+    # Action
+    await asyncio.gather(*[executor.run(slow_call) for _ in range(6)])
+
+    # Result
+    stats = executor.get_stats()
+    assert peak == 2
+    assert stats["submitted"] == 6
+    assert stats["completed"] == 6
+    assert stats["running"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["max_wait_seconds"] >= 0.02
+    assert 0 < stats["avg_wait_seconds"] <= stats["max_wait_seconds"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_calls_release_their_queue_slot(build_executor):
+    # Scenario
+    executor = build_executor(max_workers=1, max_queue_size=2)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_call():
+        started.set()
+        release.wait(timeout=5)
+        return "done"
+
+    running = asyncio.ensure_future(executor.run(blocking_call))
+    await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+    queued = [asyncio.ensure_future(executor.run(lambda: "never runs")) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    # Action
+    for call in queued:
+        call.cancel()
+    await asyncio.gather(*queued, return_exceptions=True)
+    stats = executor.get_stats()
+    release.set()
+
+    # Result
+    assert all(call.cancelled() for call in queued)
+    assert stats["queue_depth"] == 0
+    assert stats["cancelled"] == 2
+    assert await running == "done"
+    assert await executor.run(lambda: "accepted") == "accepted"
+
+
+@pytest.mark.asyncio
+async def test_calls_after_shutdown_release_their_queue_slot(build_executor):
+    # Scenario
+    executor = build_executor(max_workers=1, max_queue_size=1)
+    executor.shutdown(wait=True)
+
+    # Action
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await executor.run(lambda: "never runs")
+
+    # Result
+    stats = executor.get_stats()
+    assert stats["queue_depth"] == 0
+    assert stats["rejected"] == 2
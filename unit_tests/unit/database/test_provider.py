@@ -0,0 +1,62 @@
+import threading
+
+from peewee import OperationalError
+
+from app.config.enums.database import DatabaseProfile
+from app.config.settings import Settings
+from app.database import db
+from app.database.provider import BaseModel, DATABASE_PROFILES, DataBaseProvider, RoutedSqliteDatabase
+
+
+def test_get_pragmas_applies_overrides_on_top_of_profile():
+    # Scenario
+    settings = Settings(db_profile=DatabaseProfile.THROUGHPUT, db_synchronous="full", db_cache_size=-1000)
+
+    # Action
+    pragmas = DataBaseProvider.get_pragmas(settings)
+
+    # Result
+    assert pragmas == {
+        **DATABASE_PROFILES[DatabaseProfile.THROUGHPUT],
+        "synchronous": "full",
+        "cache_size": -1000,
+    }
+
+
+def test_models_and_repositories_share_one_database_handle():
+    # Action
+    provider = DataBaseProvider.get_provider()
+
+    # Result
+    assert provider is DataBaseProvider.get_provider()
+    assert BaseModel._meta.database is provider
+    assert db is provider
+
+
+def test_reader_threads_open_read_only_connections(tmp_path):
+    # Scenario
+    database = RoutedSqliteDatabase(str(tmp_path / "accounts.db"), pragmas={"journal_mode": "wal"})
+    database.execute_sql("CREATE TABLE counter (value INTEGER)")
+    database.execute_sql("INSERT INTO counter VALUES (1)")
+    errors = []
+
+    def read_then_write():
+        database.use_read_only_connections()
+        errors.append(database.execute_sql("SELECT value FROM counter").fetchone()[0])
+        try:
+            database.execute_sql("INSERT INTO counter VALUES (2)")
+        except OperationalError as e:
+            errors.append(str(e))
+        finally:
+            database.close()
+
+    # Action
+    reader = threading.Thread(target=read_then_write)
+    reader.start()
+    reader.join()
+
+    # Result
+    assert errors[0] == 1
+    assert "readonly" in errors[1]
+    assert not database.is_read_only
+    database.close()
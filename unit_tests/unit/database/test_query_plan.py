@@ -0,0 +1,37 @@
+import logging
+
+from peewee import SqliteDatabase
+
+from app.database import models
+from app.database.query_plan import verify_query_plans
+
+
+def test_hot_queries_are_served_by_indexes_on_the_current_schema(tmp_path):
+    # Scenario
+    database = SqliteDatabase(str(tmp_path / "accounts.db"))
+    with database.bind_ctx(models):
+        database.create_tables(models)
+
+        # Action
+        problems = verify_query_plans(database)
+
+    # Result
+    assert problems == {}
+    database.close()
+
+
+def test_dropping_the_account_created_at_index_is_reported(tmp_path, caplog):
+    # Scenario
+    database = SqliteDatabase(str(tmp_path / "accounts.db"))
+    with database.bind_ctx(models):
+        database.create_tables(models)
+        database.execute_sql('DROP INDEX "transactionentity_account_id_created_at"')
+
+        # Action
+        with caplog.at_level(logging.WARNING, logger="app.database.query_plan"):
+            problems = verify_query_plans(database)
+
+    # Result
+    assert "statement_by_period" in problems
+    assert "Query statement_by_period is not fully served by an index" in caplog.text
+    database.close()
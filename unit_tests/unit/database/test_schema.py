@@ -0,0 +1,73 @@
+import threading
+import time
+from unittest.mock import patch
+
+from peewee import SqliteDatabase
+
+from app.database import ensure_schema, models, schema_fingerprint
+
+
+def test_restart_on_an_up_to_date_file_skips_the_schema_ddl(tmp_path):
+    # Scenario
+    database = SqliteDatabase(str(tmp_path / "accounts.db"))
+    with database.bind_ctx(models):
+        created = ensure_schema(database)
+
+        # Action
+        with patch.object(database, "execute_sql", wraps=database.execute_sql) as execute_sql:
+            created_again = ensure_schema(database)
+
+    # Result
+    assert created is True
+    assert created_again is False
+    assert [call.args[0] for call in execute_sql.call_args_list] == ["PRAGMA user_version"]
+    assert database.pragma("user_version") == schema_fingerprint()
+    database.close()
+
+
+def test_changed_models_run_the_schema_ddl_again(tmp_path):
+    # Scenario
+    database = SqliteDatabase(str(tmp_path / "accounts.db"))
+    with database.bind_ctx(models):
+        ensure_schema(database)
+
+        # Action
+        with patch("app.database.schema_fingerprint", return_value=1):
+            created = ensure_schema(database)
+
+    # Result
+    assert created is True
+    assert database.pragma("user_version") == 1
+    database.close()
+
+
+def test_workers_starting_together_run_the_schema_ddl_once(tmp_path):
+    # Scenario
+    path = str(tmp_path / "accounts.db")
+    workers = [SqliteDatabase(path, timeout=5) for _ in range(2)]
+    barrier = threading.Barrier(len(workers))
+    results = []
+
+    def start_worker(database: SqliteDatabase):
+        create_tables = database.create_tables
+
+        def slow_create_tables(*args, **kwargs):
+            # Keeps the lock held long enough for the other worker to find the schema missing too.
+            time.sleep(0.1)
+            return create_tables(*args, **kwargs)
+
+        with patch.object(database, "create_tables", side_effect=slow_create_tables) as patched:
+            barrier.wait()
+            results.append((ensure_schema(database), patched.call_count))
+        database.close()
+
+    threads = [threading.Thread(target=start_worker, args=(database,)) for database in workers]
+
+    # Action
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Result
+    assert sorted(results) == [(False, 0), (True, 1)]
@@ -0,0 +1,43 @@
+import json
+import logging
+import sqlite3
+
+from app.database.slow_query import SlowQueryLog, normalize_sql
+
+
+def test_normalize_sql_collapses_literals_and_placeholder_lists():
+    # Scenario
+    sql = '''SELECT "t1"."amount" FROM "transaction" AS "t1"
+             WHERE ("t1"."account_id" IN (?, ?, ?)) AND "t1"."amount" > 10.5 AND "t1"."agency" = '0001' '''
+
+    # Action
+    shape = normalize_sql(sql)
+
+    # Result
+    assert shape == (
+        'SELECT "t1"."amount" FROM "transaction" AS "t1" '
+        'WHERE ("t1"."account_id" IN (?, ...)) AND "t1"."amount" > ? AND "t1"."agency" = ?'
+    )
+
+
+def test_record_logs_redacted_params_and_explains_each_shape_once(caplog):
+    # Scenario
+    conn = sqlite3.connect(":memory:")
+    conn.execute('CREATE TABLE "transaction" (account_id INTEGER, created_at TEXT)')
+    slow_query_log = SlowQueryLog(threshold_seconds=0.01, log_params=False, explain=True)
+    sql = 'SELECT * FROM "transaction" WHERE DATE(created_at) = ?'
+
+    # Action
+    with caplog.at_level(logging.WARNING):
+        slow_query_log.record(conn, sql, ["2023-01-01"], 0.001, "TransactionRepository.fast")
+        slow_query_log.record(conn, sql, ["2023-01-01"], 0.5, "TransactionRepository.slow")
+        slow_query_log.record(conn, sql, ["2023-01-02"], 0.5, "TransactionRepository.slow")
+
+    # Result
+    entries = [json.loads(record.getMessage().split(" ", 2)[2]) for record in caplog.records]
+    assert len(entries) == 2
+    assert entries[0]["method"] == "TransactionRepository.slow"
+    assert entries[0]["params"] == ["?"]
+    assert entries[0]["duration_ms"] == 500.0
+    assert entries[0]["plan_problems"] == ['SCAN transaction']
+    assert "plan" not in entries[1]
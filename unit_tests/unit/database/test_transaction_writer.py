@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.config.enums.transaction import TransactionType
+from app.config.exceptions.general import InsufficientBalance
+from app.database.transaction_writer import TransactionWriter
+from app.interfaces.transaction import TransactionInterface
+
+
+def build_transaction(amount: float) -> TransactionInterface:
+    return TransactionInterface(account=1, amount=amount, transaction_type=TransactionType.WITHDRAW.value)
+
+
+@pytest.mark.asyncio
+async def test_submit_groups_concurrent_transactions_and_resolves_each_caller():
+    # Scenario
+    async def apply_transactions_group(transactions):
+        return [
+            InsufficientBalance() if transaction.amount > 100 else transaction
+            for transaction in transactions
+        ]
+
+    transaction_repository = AsyncMock()
+    transaction_repository.apply_transactions_group = AsyncMock(side_effect=apply_transactions_group)
+    writer = TransactionWriter(
+        transaction_repository=transaction_repository,
+        max_batch_size=3,
+        max_linger_seconds=0.01,
+        max_queue_size=100,
+    )
+    amounts = [10, 20, 500, 40, 50]
+
+    # Action
+    results = await asyncio.gather(
+        *[writer.submit(build_transaction(amount)) for amount in amounts],
+        return_exceptions=True,
+    )
+    await writer.close()
+
+    # Result
+    groups = [call.args[0] for call in transaction_repository.apply_transactions_group.call_args_list]
+    assert [[transaction.amount for transaction in group] for group in groups] == [[10, 20, 500], [40, 50]]
+    assert isinstance(results[2], InsufficientBalance)
+    assert [result.amount for index, result in enumerate(results) if index != 2] == [10, 20, 40, 50]
+    assert writer.get_stats()["batches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_submit_fails_every_caller_when_the_group_commit_fails():
+    # Scenario
+    transaction_repository = AsyncMock()
+    transaction_repository.apply_transactions_group = AsyncMock(side_effect=RuntimeError("disk I/O error"))
+    writer = TransactionWriter(
+        transaction_repository=transaction_repository,
+        max_batch_size=10,
+        max_linger_seconds=0,
+        max_queue_size=100,
+    )
+
+    # Action
+    results = await asyncio.gather(
+        *[writer.submit(build_transaction(amount)) for amount in (10, 20)],
+        return_exceptions=True,
+    )
+    await writer.close()
+
+    # Result
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.config.exceptions.general import ExceptionMessageBuilder
+from app.config.settings import Settings
+from app.handlers.http.profiling_handler import ProfilingMiddleware
+from app.http_server import create_app
+
+
+def test_debug_routes_are_not_mounted_without_their_tokens():
+    # Scenario
+    with patch.object(Settings, "get_settings", return_value=Settings(profiling_token=None, tracing_token=None)):
+        app = create_app()
+        client = TestClient(app)
+
+        # Action
+        responses = [client.get(path) for path in ("/debug/traces", "/debug/profiles")]
+
+    # Result
+    assert [response.status_code for response in responses] == [404, 404]
+    assert ExceptionMessageBuilder in app.exception_handlers
+
+
+def test_profiling_sample_rate_without_a_token_adds_no_profiler():
+    # Scenario
+    settings = Settings(profiling_token=None, profiling_sample_rate=1.0)
+    with patch.object(Settings, "get_settings", return_value=settings):
+        # Action
+        app = create_app()
+
+    # Result
+    assert ProfilingMiddleware not in [middleware.cls for middleware in app.user_middleware]
+
+
+def test_profile_routes_require_the_profiling_token():
+    # Scenario
+    with patch.object(Settings, "get_settings", return_value=Settings(profiling_token="secret", tracing_token=None)):
+        client = TestClient(create_app())
+
+        # Action
+        missing = client.get("/debug/profiles")
+        wrong = client.get("/debug/profiles", headers={"X-Profile": "guess"})
+        granted = client.get("/debug/profiles", headers={"X-Profile": "secret"})
+        traces = client.get("/debug/traces", headers={"X-Profile": "secret"})
+
+    # Result
+    assert missing.status_code == 403
+    assert missing.json()["title"] == "Access denied"
+    assert wrong.status_code == 403
+    assert granted.status_code == 200
+    assert traces.status_code == 404
+
+
+def test_trace_routes_require_the_tracing_token():
+    # Scenario
+    with patch.object(Settings, "get_settings", return_value=Settings(profiling_token=None, tracing_token="secret")):
+        client = TestClient(create_app())
+
+        # Action
+        missing = client.get("/debug/traces")
+        wrong = client.get("/debug/traces", headers={"X-Trace-Token": "guess"})
+        granted = client.get("/debug/traces", headers={"X-Trace-Token": "secret"})
+        profiles = client.get("/debug/profiles", headers={"X-Trace-Token": "secret"})
+
+    # Result
+    assert missing.status_code == 403
+    assert wrong.status_code == 403
+    assert granted.status_code == 200
+    assert profiles.status_code == 404
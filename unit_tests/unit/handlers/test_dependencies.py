@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.enums.transaction import TransactionType
+from app.config.settings import Settings
+from app.container import Container
+from app.database.transaction_writer import TransactionWriter
+from app.http_server import create_app
+from app.interfaces.account import AccountInterface
+from app.interfaces.transaction import TransactionInterface
+
+
+@pytest.mark.asyncio
+async def test_container_builds_the_object_graph_once_and_tears_it_down():
+    # Scenario
+    database = MagicMock()
+    container = Container(Settings(db_verify_query_plans=False))
+
+    # Action
+    with patch("app.container.connect_database", return_value=database):
+        with patch("app.container.ensure_schema", return_value=False):
+            container.start()
+    await container.close()
+
+    # Result
+    assert list(container.startup_timings) == ["database", "schema_check", "infrastructure", "repositories", "services"]
+    assert container.account_service.account_repository is container.account_repository
+    assert container.transaction_service._account_repository is container.account_repository
+    assert container.transaction_service._transaction_writer is container.transaction_writer
+    database.close.assert_called_once()
+
+
+def test_handlers_receive_the_services_of_the_container():
+    # Scenario
+    account = AccountInterface(account_id=1, checking_account_number=123, account_owner=1)
+    account_service = SimpleNamespace(get_account=AsyncMock(return_value=account))
+    app = create_app()
+    app.state.container = SimpleNamespace(account_service=account_service)
+
+    # Action
+    response = TestClient(app).get("/v1/accounts/1")
+
+    # Result
+    assert response.status_code == 200
+    assert response.json()["account_id"] == 1
+    account_service.get_account.assert_awaited_once_with(account_id=1)
+
+
+@pytest.mark.asyncio
+async def test_lifespan_exit_commits_queued_writes_before_closing_the_database():
+    # Scenario
+    events = []
+
+    async def apply_transactions_group(transactions):
+        events.append("commit")
+        return transactions
+
+    transaction_repository = AsyncMock()
+    transaction_repository.apply_transactions_group = AsyncMock(side_effect=apply_transactions_group)
+    writer = TransactionWriter(
+        transaction_repository=transaction_repository,
+        max_batch_size=8,
+        max_linger_seconds=0.05,
+        max_queue_size=10,
+    )
+    database = MagicMock()
+    database.close.side_effect = lambda: events.append("close")
+    app = create_app()
+
+    # Action
+    with patch("app.container.connect_database", return_value=database):
+        with patch("app.container.ensure_schema", return_value=False):
+            with patch("app.container.verify_query_plans"):
+                with patch("app.container.get_transaction_writer", return_value=writer):
+                    async with app.router.lifespan_context(app):
+                        deposit = asyncio.ensure_future(writer.submit(TransactionInterface(
+                            account=1, amount=10.0, transaction_type=TransactionType.DEPOSIT.value,
+                        )))
+                        await asyncio.sleep(0)
+
+    # Result
+    assert deposit.done()
+    assert deposit.result().amount == 10.0
+    assert events == ["commit", "close"]
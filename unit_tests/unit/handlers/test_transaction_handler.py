@@ -0,0 +1,103 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.enums.transaction import TransactionType
+from app.config.exceptions.general import ObjectNotFound
+from app.handlers.http.dependencies import get_transaction_service
+from app.http_server import create_app
+from app.interfaces.transaction import StatementPageInterface, TransactionInterface
+
+STATEMENT_PARAMS = {"start_date": "2023-01-01", "end_date": "2023-01-31"}
+
+
+@pytest.fixture
+def transaction_service():
+    return AsyncMock()
+
+
+@pytest.fixture
+def client(transaction_service):
+    app = create_app()
+    app.dependency_overrides[get_transaction_service] = lambda: transaction_service
+    return TestClient(app)
+
+
+def statement_page(next_cursor=None) -> StatementPageInterface:
+    transaction = TransactionInterface(
+        transaction_id=1,
+        account=1,
+        amount=10.0,
+        transaction_type=TransactionType.DEPOSIT.value,
+        created_at=datetime(2023, 1, 2),
+    )
+    return StatementPageInterface(transactions=[transaction], next_cursor=next_cursor)
+
+
+def test_statement_without_limit_returns_the_first_page_as_a_list(client, transaction_service):
+    # Scenario
+    transaction_service.get_statement_page.return_value = statement_page(next_cursor="next")
+
+    # Action
+    response = client.get("/v1/transactions/statement/1", params=STATEMENT_PARAMS)
+
+    # Result
+    assert response.status_code == 200
+    assert [transaction["transaction_id"] for transaction in response.json()] == [1]
+    assert response.headers["X-Next-Cursor"] == "next"
+    assert transaction_service.get_statement_page.call_args.kwargs["payload"].limit is None
+
+
+def test_statement_with_limit_returns_a_page(client, transaction_service):
+    # Scenario
+    transaction_service.get_statement_page.return_value = statement_page()
+
+    # Action
+    response = client.get("/v1/transactions/statement/1", params={**STATEMENT_PARAMS, "limit": 1})
+
+    # Result
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] is None
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_export_of_an_unknown_account_is_not_found(client, transaction_service):
+    # Scenario
+    transaction_service.stream_statement_by_period.side_effect = ObjectNotFound(object_name="account_entity")
+
+    # Action
+    response = client.get("/v1/transactions/statement/404/export", params=STATEMENT_PARAMS)
+
+    # Result
+    assert response.status_code == 404
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_export_failing_before_the_first_chunk_is_a_server_error(client, transaction_service):
+    # Scenario
+    transaction_service.stream_statement_by_period.side_effect = Exception("database is locked")
+
+    # Action
+    response = client.get("/v1/transactions/statement/1/export", params=STATEMENT_PARAMS)
+
+    # Result
+    assert response.status_code == 500
+    assert "content-disposition" not in response.headers
+
+
+def test_export_failing_mid_stream_does_not_complete_the_response(client, transaction_service):
+    # Scenario
+    async def chunks():
+        yield '{"transaction_id": 1}\n'
+        raise Exception("database is locked")
+
+    transaction_service.stream_statement_by_period.return_value = chunks()
+
+    # Action
+    with pytest.raises(ExceptionGroup) as error:
+        client.get("/v1/transactions/statement/1/export", params=STATEMENT_PARAMS)
+
+    # Result
+    assert error.group_contains(Exception, match="database is locked")
@@ -0,0 +1,41 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.database import db, models
+from app.database.cache import get_account_cache
+from app.database.executor import shutdown_database_executors
+
+
+def reset_database_executors():
+    """Stops the executor threads, so the next repository call opens connections to the current file."""
+    asyncio.run(shutdown_database_executors())
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """The application's database handle pointed at a temporary file, recording every statement in ``queries``.
+
+    The handle itself is re-initialized instead of binding the models to another one, so the
+    repositories' ``@db.atomic()`` transactions and the executor threads' connections use the
+    temporary file as well and never touch the real database.
+    """
+    original_path = db.database
+    reset_database_executors()
+    db.init(str(tmp_path / "accounts.db"), timeout=db._timeout)
+    queries = []
+    execute_sql = db.execute_sql
+
+    def recording_execute_sql(sql, params=None, *args, **kwargs):
+        queries.append(sql)
+        return execute_sql(sql, params, *args, **kwargs)
+
+    with patch.object(db, "execute_sql", side_effect=recording_execute_sql):
+        with patch.object(db, "queries", queries, create=True):
+            db.create_tables(models)
+            yield db
+
+    reset_database_executors()
+    db.init(original_path, timeout=db._timeout)
+    get_account_cache().clear()
@@ -0,0 +1,50 @@
+import pytest
+
+from app.config.enums.account import AccountStates
+from app.database.cache import get_account_cache
+from app.database.models.account import AccountEntity
+from app.database.models.account_owner import AccountOwnerEntity
+from app.database.repositories.account_repository import AccountRepository
+from app.interfaces.account import AccountInterface
+from app.interfaces.account_owner import AccountOwnerInterface
+
+
+def create_account() -> int:
+    owner = AccountOwnerEntity.create(name="Yuri Fernandes", cpf="12345678901")
+    account = AccountEntity.create(checking_account_number=1, account_owner=owner, balance=150.5)
+    return account.account_id
+
+
+@pytest.mark.asyncio
+async def test_get_account_by_id_reads_account_and_owner_in_one_query(test_db):
+    # Scenario
+    account_id = create_account()
+    get_account_cache().clear()
+    test_db.queries.clear()
+
+    # Action
+    account = await AccountRepository().get_account_by_id(account_id)
+
+    # Result
+    assert len([sql for sql in test_db.queries if sql.startswith("SELECT")]) == 1
+    assert isinstance(account.account_owner, AccountOwnerInterface)
+    assert account == AccountInterface(**account.dict())
+    assert account.balance == 150.5
+    assert account.state == AccountStates.ACTIVE
+
+
+@pytest.mark.asyncio
+async def test_block_account_returns_the_new_row_without_a_second_select(test_db):
+    # Scenario
+    account_id = create_account()
+    test_db.queries.clear()
+
+    # Action
+    account = await AccountRepository().block_account(account_id)
+
+    # Result
+    assert not any(sql.startswith("SELECT") for sql in test_db.queries)
+    assert account.state == AccountStates.BLOCKED
+    assert account.updated_at is not None
+    assert account.account_owner.name == "Yuri Fernandes"
+    assert account == AccountInterface(**account.dict())
@@ -0,0 +1,357 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.commands.rebuild_daily_withdrawal_totals import rebuild
+from app.config.enums.account import AccountStates
+from app.config.enums.transaction import TransactionType
+from app.config.exceptions.general import (
+    DailyLimitReached,
+    InsufficientBalance,
+    ObjectNotFound,
+    TransactionNotAllowed,
+)
+from app.database.models.account import AccountEntity
+from app.database.models.account_owner import AccountOwnerEntity
+from app.database.models.daily_withdrawal_total import DailyWithdrawalTotalEntity
+from app.database.models.transaction import TransactionEntity
+from app.database.repositories.transaction_repository import TransactionRepository
+from app.interfaces.account_owner import AccountOwnerInterface
+from app.interfaces.transaction import TransactionInterface
+
+
+def create_account_with_transactions(transactions_count: int) -> int:
+    owner = AccountOwnerEntity.create(name="Yuri Fernandes", cpf=f"{transactions_count:011d}")
+    account = AccountEntity.create(checking_account_number=1, account_owner=owner)
+    created_at = datetime.combine(date(2023, 1, 1), datetime.min.time())
+    TransactionEntity.insert_many([
+        {
+            "account": account.account_id,
+            "amount": 10.0,
+            "transaction_type": TransactionType.DEPOSIT.value,
+            "created_at": created_at + timedelta(minutes=index),
+        }
+        for index in range(transactions_count)
+    ]).execute()
+    return account.account_id
+
+
+async def count_statement_queries(test_db, account_id: int) -> int:
+    test_db.queries.clear()
+    statement = await TransactionRepository().get_transactions_page(
+        account_id=account_id,
+        start_date=date(2023, 1, 1),
+        end_date=date(2023, 1, 31),
+        limit=1000,
+    )
+    assert all(transaction.account == account_id for transaction in statement)
+    return len([sql for sql in test_db.queries if sql.startswith("SELECT")])
+
+
+@pytest.mark.asyncio
+async def test_statement_query_count_is_constant(test_db):
+    # Scenario
+    small_account_id = create_account_with_transactions(5)
+    large_account_id = create_account_with_transactions(500)
+
+    # Action
+    small_statement_queries = await count_statement_queries(test_db, small_account_id)
+    large_statement_queries = await count_statement_queries(test_db, large_account_id)
+
+    # Result
+    assert small_statement_queries == 1
+    assert large_statement_queries == small_statement_queries
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_the_statement_once_across_equal_timestamps(test_db):
+    # Scenario
+    account_id = create_account_with_transactions(0)
+    TransactionEntity.insert_many([
+        {
+            "account": account_id,
+            "amount": index + 1,
+            "transaction_type": TransactionType.DEPOSIT.value,
+            "created_at": datetime(2023, 1, day, 12),
+        }
+        for index, day in enumerate([1, 2, 2, 2, 2, 3, 3, 4, 4, 4, 5])
+    ]).execute()
+    expected = [
+        row.transaction_id
+        for row in (TransactionEntity
+                    .select()
+                    .where(TransactionEntity.account == account_id)
+                    .order_by(TransactionEntity.created_at.desc(), TransactionEntity.transaction_id.desc()))
+    ]
+    repository = TransactionRepository()
+
+    # Action
+    pages = []
+    after = None
+    while True:
+        page = await repository.get_transactions_page(
+            account_id=account_id, start_date=date(2023, 1, 1), end_date=date(2023, 1, 31), limit=3, after=after,
+        )
+        if not page:
+            break
+        pages.append([transaction.transaction_id for transaction in page])
+        after = (page[-1].created_at, page[-1].transaction_id)
+
+    # Result
+    assert [len(page) for page in pages] == [3, 3, 3, 2]
+    assert [transaction_id for page in pages for transaction_id in page] == expected
+
+
+def deposit(account_id: int, amount: float, **fields) -> TransactionInterface:
+    return TransactionInterface(
+        account=account_id, amount=amount, transaction_type=TransactionType.DEPOSIT.value, **fields
+    )
+
+
+def withdraw(account_id: int, amount: float, **fields) -> TransactionInterface:
+    return TransactionInterface(
+        account=account_id, amount=amount, transaction_type=TransactionType.WITHDRAW.value, **fields
+    )
+
+
+def account_balance(account_id: int) -> float:
+    return float(AccountEntity.get_by_id(account_id).balance)
+
+
+def ledger_amounts(account_id: int) -> list:
+    return [
+        float(row.amount)
+        for row in TransactionEntity.select().where(TransactionEntity.account == account_id).order_by(
+            TransactionEntity.transaction_id
+        )
+    ]
+
+
+def daily_withdrawal_totals() -> dict:
+    return {
+        (row["account"], str(row["day"])): float(row["total"])
+        for row in DailyWithdrawalTotalEntity.select().dicts()
+    }
+
+
+@pytest.mark.asyncio
+async def test_single_and_batch_withdrawals_keep_the_daily_counter_in_step(test_db):
+    # Scenario
+    account_id = create_account_with_transactions(0)
+    repository = TransactionRepository()
+
+    # Action
+    await repository.apply_transaction(deposit(account_id, 500.0))
+    await repository.apply_transaction(withdraw(account_id, 30.0))
+    await repository.apply_transactions_batch([
+        withdraw(account_id, 20.0), deposit(account_id, 50.0), withdraw(account_id, 5.0),
+    ])
+
+    # Result
+    assert daily_withdrawal_totals() == {(account_id, date.today().isoformat()): 55.0}
+
+
+@pytest.mark.asyncio
+async def test_applied_transaction_returns_the_account_with_its_owner(test_db):
+    # Scenario
+    account_id = create_account_with_transactions(0)
+    repository = TransactionRepository()
+
+    # Action
+    deposited = await repository.apply_transaction(deposit(account_id, 100.0))
+    withdrawn = await repository.apply_transaction(withdraw(account_id, 40.0))
+
+    # Result
+    for result, balance in [(deposited, 100.0), (withdrawn, 60.0)]:
+        account = result.account
+        assert isinstance(account.account_owner, AccountOwnerInterface)
+        assert account.account_owner.name == "Yuri Fernandes"
+        assert account.account_owner.cpf == f"{0:011d}"
+        assert account.balance == balance
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("state", [AccountStates.BLOCKED.value, AccountStates.CLOSED.value])
+async def test_transaction_on_an_inactive_account_is_not_allowed(test_db, state):
+    # Scenario
+    account_id = create_account_with_transactions(0)
+    AccountEntity.update(state=state, balance=100).where(AccountEntity.account_id == account_id).execute()
+    repository = TransactionRepository()
+
+    # Action / Result
+    with pytest.raises(TransactionNotAllowed):
+        await repository.apply_transaction(deposit(account_id, 10.0))
+    with pytest.raises(TransactionNotAllowed):
+        await repository.apply_transaction(withdraw(account_id, 10.0))
+    assert account_balance(account_id) == 100.0
+    assert ledger_amounts(account_id) == []
+
+
+@pytest.mark.asyncio
+async def test_transaction_on_a_missing_account_is_not_found(test_db):
+    # Scenario
+    repository = TransactionRepository()
+
+    # Action / Result
+    with pytest.raises(ObjectNotFound):
+        await repository.apply_transaction(deposit(404, 10.0))
+
+
+@pytest.mark.asyncio
+async def test_withdraw_above_the_balance_is_rejected(test_db):
+    # Scenario
+    account_id = create_account_with_transactions(0)
+    repository = TransactionRepository()
+    await repository.apply_transaction(deposit(account_id, 50.0))
+
+    # Action / Result
+    with pytest.raises(InsufficientBalance):
+        await repository.apply_transaction(withdraw(account_id, 50.01))
+    assert account_balance(account_id) == 50.0
+    assert ledger_amounts(account_id) == [50.0]
+    assert daily_withdrawal_totals() == {}
+
+
+@pytest.mark.asyncio
+async def test_withdraw_above_the_daily_limit_is_rejected(test_db):
+    # Scenario
+    account_id = create_account_with_transactions(0)
+    AccountEntity.update(daily_limit=100).where(AccountEntity.account_id == account_id).execute()
+    repository = TransactionRepository()
+    await repository.apply_transaction(deposit(account_id, 500.0))
+    await repository.apply_transaction(withdraw(account_id, 80.0))
+
+    # Action / Result
+    with pytest.raises(DailyLimitReached):
+        await repository.apply_transaction(withdraw(account_id, 20.01))
+    assert account_balance(account_id) == 420.0
+    assert daily_withdrawal_totals() == {(account_id, date.today().isoformat()): 80.0}
+
+
+@pytest.mark.asyncio
+async def test_group_rejects_a_withdraw_sharing_the_timestamp_of_an_applied_deposit(test_db):
+    # Scenario
+    account_id = create_account_with_transactions(0)
+    created_at = datetime(2023, 1, 1, 12)
+    repository = TransactionRepository()
+
+    # Action
+    outcomes = await repository.apply_transactions_group([
+        deposit(account_id, 100.0, created_at=created_at),
+        withdraw(account_id, 1000.0, created_at=created_at),
+        withdraw(account_id, 30.0, created_at=created_at),
+    ])
+
+    # Result
+    assert isinstance(outcomes[0], TransactionInterface)
+    assert isinstance(outcomes[1], InsufficientBalance)
+    assert isinstance(outcomes[2], TransactionInterface)
+    assert account_balance(account_id) == 70.0
+    assert ledger_amounts(account_id) == [100.0, 30.0]
+    assert daily_withdrawal_totals() == {(account_id, "2023-01-01"): 30.0}
+
+
+@pytest.mark.asyncio
+async def test_batch_checks_each_item_against_the_state_left_by_the_previous_ones(test_db):
+    # Scenario
+    account_id = create_account_with_transactions(0)
+    blocked_account_id = create_account_with_transactions(1)
+    AccountEntity.update(daily_limit=100).where(AccountEntity.account_id == account_id).execute()
+    AccountEntity.update(state=AccountStates.BLOCKED.value).where(
+        AccountEntity.account_id == blocked_account_id
+    ).execute()
+    repository = TransactionRepository()
+
+    # Action
+    outcomes = await repository.apply_transactions_batch([
+        deposit(account_id, 150.0),
+        deposit(blocked_account_id, 10.0),
+        withdraw(404, 10.0),
+        withdraw(account_id, 60.0),
+        withdraw(account_id, 95.0),
+        withdraw(account_id, 50.0),
+        withdraw(account_id, 40.0),
+    ])
+
+    # Result
+    assert [type(outcome) for outcome in outcomes] == [
+        TransactionInterface,
+        TransactionNotAllowed,
+        ObjectNotFound,
+        TransactionInterface,
+        InsufficientBalance,
+        DailyLimitReached,
+        TransactionInterface,
+    ]
+    assert account_balance(account_id) == 50.0
+    assert account_balance(blocked_account_id) == 0.0
+    assert ledger_amounts(account_id) == [150.0, 60.0, 40.0]
+    assert ledger_amounts(blocked_account_id) == [10.0]
+    assert daily_withdrawal_totals() == {(account_id, date.today().isoformat()): 100.0}
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_the_ledger_ids_and_embeds_the_account_like_single_transactions(test_db):
+    # Scenario
+    account_id = create_account_with_transactions(0)
+    repository = TransactionRepository()
+    single = await repository.apply_transaction(deposit(account_id, 100.0))
+
+    # Action
+    outcomes = await repository.apply_transactions_batch([
+        withdraw(account_id, 10.0), withdraw(404, 10.0), deposit(account_id, 5.0), withdraw(account_id, 10.0),
+    ])
+
+    # Result
+    applied = [outcome for outcome in outcomes if isinstance(outcome, TransactionInterface)]
+    ledger_ids = [
+        row.transaction_id
+        for row in TransactionEntity.select().where(TransactionEntity.transaction_id > single.transaction_id)
+    ]
+    assert [transaction.transaction_id for transaction in applied] == ledger_ids
+    assert ledger_ids == list(range(single.transaction_id + 1, single.transaction_id + 4))
+    assert [float(TransactionEntity.get_by_id(transaction_id).amount) for transaction_id in ledger_ids] == [
+        10.0, 5.0, 10.0,
+    ]
+    assert [transaction.account.balance for transaction in applied] == [90.0, 95.0, 85.0]
+    for transaction in [single, *applied]:
+        assert isinstance(transaction.account.account_owner, AccountOwnerInterface)
+        assert transaction.account.account_owner.name == "Yuri Fernandes"
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_the_ledger_withdrawals_per_account_and_day(test_db):
+    # Scenario
+    first_account_id = create_account_with_transactions(1)
+    second_account_id = create_account_with_transactions(2)
+    TransactionEntity.insert_many([
+        {
+            "account": account_id,
+            "amount": amount,
+            "transaction_type": TransactionType.WITHDRAW.value,
+            "created_at": datetime(2023, 1, day, hour),
+        }
+        for account_id, amount, day, hour in [
+            (first_account_id, 10.0, 1, 9),
+            (first_account_id, 15.5, 1, 18),
+            (first_account_id, 7.0, 2, 9),
+            (second_account_id, 40.0, 2, 23),
+        ]
+    ]).execute()
+    DailyWithdrawalTotalEntity.create(account=first_account_id, day=date(2023, 1, 1), total=999)
+
+    # Action
+    rows = await rebuild()
+
+    # Result
+    ledger = {
+        (account_id, day): total
+        for account_id, day, total in test_db.execute_sql(
+            'SELECT account_id, DATE(created_at), SUM(amount) FROM "transaction" '
+            "WHERE transaction_type = ? GROUP BY account_id, DATE(created_at)",
+            (TransactionType.WITHDRAW.value,),
+        ).fetchall()
+    }
+    assert rows == 3
+    assert daily_withdrawal_totals() == ledger
+    assert ledger[(first_account_id, "2023-01-01")] == 25.5
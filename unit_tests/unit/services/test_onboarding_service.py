@@ -0,0 +1,46 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.onboarding_service import OnboardingService
+
+
+@pytest.fixture
+def onboarding_service():
+    with patch('app.services.onboarding_service.AccountRepository') as MockAccountRepository:
+        account_repository = MockAccountRepository.return_value
+        service = OnboardingService()
+        service._account_repository = account_repository
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_import_owners(onboarding_service):
+    # Scenario
+    rows = [
+        {"name": "Yuri Fernandes", "cpf": "39410675839"},
+        {"name": "Invalid", "cpf": "123"},
+        {"name": "Duplicated", "cpf": "39410675839"},
+        {"name": "Registered", "cpf": "11111111111"},
+        {"name": "Maria", "cpf": "22222222222"},
+    ]
+    rejects = []
+
+    onboarding_service._account_repository.bulk_create_accounts_with_owners = AsyncMock(
+        side_effect=[{"11111111111"}, set()]
+    )
+
+    # Action
+    report = await onboarding_service.import_owners(
+        rows, on_reject=lambda line, row, reason: rejects.append((line, reason)), chunk_size=2
+    )
+
+    # Result
+    assert report.read == 5
+    assert report.imported == 2
+    assert report.rejected == 3
+    assert [line for line, _ in rejects] == [2, 3, 4]
+    assert rejects[2][1] == "cpf already registered"
+    chunks = onboarding_service._account_repository.bulk_create_accounts_with_owners.call_args_list
+    assert [[owner.cpf for owner in call.args[0]] for call in chunks] == [
+        ["39410675839", "11111111111"], ["22222222222"]
+    ]
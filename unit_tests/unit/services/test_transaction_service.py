@@ -1,18 +1,21 @@
-import sys
-
 import pytest
 from unittest.mock import AsyncMock, patch
-from playhouse.shortcuts import model_to_dict
 
 from app.config.enums.account import AccountStates
-from app.config.enums.transaction import TransactionType
-from app.database.models.transaction import TransactionEntity
+from app.config.enums.transaction import StatementExportFormat, TransactionType
+from app.config.exceptions.general import (
+    DailyLimitReached, InsufficientBalance, InvalidCursor, ObjectNotFound, TransactionNotAllowed
+)
+from app.config.settings import Settings
 from app.interfaces.account import AccountInterface
 from app.services.transaction_service import TransactionService
 from app.interfaces.transaction import (
-    RequestDepositInterface, RequestWithdrawInterface, TransactionInterface, RequestStatementInterface
+    RequestBatchTransactionInterface, RequestDepositInterface, RequestWithdrawInterface, TransactionInterface,
+    RequestStatementInterface
 )
+from app.utils.pagination import encode_cursor
 from datetime import datetime
+from decimal import Decimal
 
 @pytest.fixture
 def transaction_service():
@@ -20,10 +23,11 @@ def transaction_service():
         transaction_repository = MockTransactionRepository.return_value
         service = TransactionService()
         service._transaction_repository = transaction_repository
+        service._transaction_writer = AsyncMock()
         yield service
 
-@pytest.mark.skipif(sys.platform == "linux", reason="Não executa na Action do Github")
-async def test_get_statement_by_period(transaction_service):
+@pytest.mark.asyncio
+async def test_get_statement_page_defaults_to_the_configured_page_size(transaction_service):
     # Scenario
     payload = RequestStatementInterface(
         account_id=1,
@@ -31,70 +35,62 @@ async def test_get_statement_by_period(transaction_service):
         end_date=datetime(2023, 12, 31)
     )
     transactions = [
-        TransactionEntity(
-            transaction_id=1,
-            account=1,
-            amount=100.0,
-            transaction_type=TransactionType.DEPOSIT.value,
-            created_at=datetime(2023, 1, 10)
-        ),
-        TransactionEntity(
-            transaction_id=2,
-            account=1,
-            amount=-50.0,
-            transaction_type=TransactionType.WITHDRAW.value,
-            created_at=datetime(2023, 1, 15)
-        )
+        {
+            "transaction_id": 2,
+            "account": 1,
+            "amount": Decimal("50.0"),
+            "transaction_type": TransactionType.WITHDRAW.value,
+            "created_at": datetime(2023, 1, 15),
+        },
+        {
+            "transaction_id": 1,
+            "account": 1,
+            "amount": Decimal("100.0"),
+            "transaction_type": TransactionType.DEPOSIT.value,
+            "created_at": datetime(2023, 1, 10),
+        },
     ]
 
-    transaction_service._transaction_repository.get_transactions_by_period = AsyncMock(return_value=transactions)
+    transaction_service._transaction_repository.get_transactions_page = AsyncMock(
+        return_value=[TransactionInterface(**transaction) for transaction in transactions]
+    )
     
     # Action
-    result = await transaction_service.get_statement_by_period(payload)
+    with patch.object(Settings.get_settings(), "statement_default_page_size", 1):
+        result = await transaction_service.get_statement_page(payload)
     
     # Result
-    expected_result = [TransactionInterface(**model_to_dict(transaction)) for transaction in transactions]
-    assert result == expected_result
-    transaction_service._transaction_repository.get_transactions_by_period.assert_called_once_with(
+    assert result.transactions == [TransactionInterface(**transactions[0])]
+    assert result.next_cursor == encode_cursor(datetime(2023, 1, 15), 2)
+    transaction_service._transaction_repository.get_transactions_page.assert_called_once_with(
         account_id=payload.account_id,
         start_date=payload.start_date,
-        end_date=payload.end_date
+        end_date=payload.end_date,
+        limit=2,
+        after=None,
     )
 
 
 @pytest.mark.asyncio
-async def test_get_statement_by_period_exception(transaction_service):
+async def test_get_statement_page_exception(transaction_service):
     payload = RequestStatementInterface(
         account_id=1,
         start_date=datetime(2023, 1, 1),
         end_date=datetime(2023, 12, 31)
     )
 
-    transaction_service._transaction_repository.get_transactions_by_period = AsyncMock(side_effect=Exception("Error"))
+    transaction_service._transaction_repository.get_transactions_page = AsyncMock(side_effect=Exception("Error"))
 
     with pytest.raises(Exception, match="Error"):
-        await transaction_service.get_statement_by_period(payload)
+        await transaction_service.get_statement_page(payload)
 
-    transaction_service._transaction_repository.get_transactions_by_period.assert_called_once_with(
-        account_id=payload.account_id,
-        start_date=payload.start_date,
-        end_date=payload.end_date
-    )
+    transaction_service._transaction_repository.get_transactions_page.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_deposit(transaction_service):
     # Scenario
     payload = RequestDepositInterface(account_id=1, amount=100.0)
-    account = AccountInterface(
-        account_id=1,
-        account_owner=1,
-        agency="0001",
-        checking_account_number=12345,
-        state=AccountStates.ACTIVE.value,
-        balance=0.0,
-        daily_limit=2000.0
-    )
     updated_account = AccountInterface(
         account_id=1,
         account_owner=1,
@@ -106,15 +102,13 @@ async def test_deposit(transaction_service):
     )
     transaction = TransactionInterface(
         transaction_id=1,
-        account=1,
+        account=updated_account,
         amount=100.0,
         transaction_type=TransactionType.DEPOSIT.value,
         created_at=datetime.now()
     )
 
-    transaction_service._account_repository.get_account_by_id = AsyncMock(return_value=account)
-    transaction_service._account_repository.update_account = AsyncMock(return_value=None)
-    transaction_service._transaction_repository.create_transaction = AsyncMock(return_value=transaction)
+    transaction_service._transaction_writer.submit = AsyncMock(return_value=transaction)
     
     # Action
     result = await transaction_service.deposit(payload)
@@ -122,23 +116,32 @@ async def test_deposit(transaction_service):
     # Result
     assert result.amount == payload.amount
     assert result.transaction_type == TransactionType.DEPOSIT.value
-    transaction_service._account_repository.get_account_by_id.assert_called_once_with(payload.account_id)
-    transaction_service._account_repository.update_account.assert_called_once()
+    transaction_service._transaction_writer.submit.assert_called_once()
+    applied = transaction_service._transaction_writer.submit.call_args.args[0]
+    assert applied.account == payload.account_id
+    assert applied.amount == payload.amount
+    assert applied.transaction_type == TransactionType.DEPOSIT.value
+
+
+@pytest.mark.asyncio
+async def test_deposit_not_allowed(transaction_service):
+    # Scenario
+    payload = RequestDepositInterface(account_id=1, amount=100.0)
+
+    transaction_service._transaction_writer.submit = AsyncMock(side_effect=TransactionNotAllowed())
+
+    # Action
+    with pytest.raises(TransactionNotAllowed):
+        await transaction_service.deposit(payload)
+
+    # Result
+    transaction_service._transaction_writer.submit.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_withdraw(transaction_service):
     # Scenario
     payload = RequestWithdrawInterface(account_id=1, amount=100.0)
-    account = AccountInterface(
-        account_id=1,
-        account_owner=1,
-        agency="0001",
-        checking_account_number=12345,
-        state=AccountStates.ACTIVE.value,
-        balance=200.0,
-        daily_limit=2000.0
-    )
     updated_account = AccountInterface(
         account_id=1,
         account_owner=1,
@@ -150,25 +153,226 @@ async def test_withdraw(transaction_service):
     )
     transaction = TransactionInterface(
         transaction_id=1,
-        account=1,
-        amount=-100.0,
+        account=updated_account,
+        amount=100.0,
         transaction_type=TransactionType.WITHDRAW.value,
         created_at=datetime.now()
     )
 
-    transaction_service._account_repository.get_account_by_id = AsyncMock(return_value=account)
-    transaction_service._account_repository.update_account = AsyncMock(return_value=None)
-    transaction_service._transaction_repository.get_total_withdrawals = AsyncMock(return_value=0.0)
-    transaction_service._transaction_repository.create_transaction = AsyncMock(return_value=transaction)
+    transaction_service._transaction_writer.submit = AsyncMock(return_value=transaction)
     
     # Action
     result = await transaction_service.withdraw(payload)
     
     # Result
-    assert result.amount == -payload.amount
+    assert result.amount == payload.amount
     assert result.transaction_type == TransactionType.WITHDRAW.value
-    transaction_service._account_repository.get_account_by_id.assert_called_once_with(payload.account_id)
-    transaction_service._account_repository.update_account.assert_called_once()
-    transaction_service._transaction_repository.get_total_withdrawals.assert_called_once_with(
-        payload.account_id, datetime.now().date()
+    applied = transaction_service._transaction_writer.submit.call_args.args[0]
+    assert applied.account == payload.account_id
+    assert applied.transaction_type == TransactionType.WITHDRAW.value
+
+
+@pytest.mark.asyncio
+async def test_withdraw_insufficient_balance(transaction_service):
+    # Scenario
+    payload = RequestWithdrawInterface(account_id=1, amount=100.0)
+
+    transaction_service._transaction_writer.submit = AsyncMock(side_effect=InsufficientBalance())
+
+    # Action
+    with pytest.raises(InsufficientBalance):
+        await transaction_service.withdraw(payload)
+
+    # Result
+    transaction_service._transaction_writer.submit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_withdraw_daily_limit_reached(transaction_service):
+    # Scenario
+    payload = RequestWithdrawInterface(account_id=1, amount=100.0)
+
+    transaction_service._transaction_writer.submit = AsyncMock(side_effect=DailyLimitReached())
+
+    # Action
+    with pytest.raises(DailyLimitReached):
+        await transaction_service.withdraw(payload)
+
+    # Result
+    transaction_service._transaction_writer.submit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_statement_page_resumes_from_cursor(transaction_service):
+    # Scenario
+    last_seen = (datetime(2023, 1, 15, 10, 30), 42)
+    payload = RequestStatementInterface(
+        account_id=1,
+        start_date=datetime(2023, 1, 1),
+        end_date=datetime(2023, 12, 31),
+        limit=10,
+        cursor=encode_cursor(*last_seen),
+    )
+
+    transaction_service._transaction_repository.get_transactions_page = AsyncMock(return_value=[])
+
+    # Action
+    result = await transaction_service.get_statement_page(payload)
+
+    # Result
+    assert result.transactions == []
+    assert result.next_cursor is None
+    transaction_service._transaction_repository.get_transactions_page.assert_called_once_with(
+        account_id=payload.account_id,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        limit=11,
+        after=last_seen,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_statement_page_invalid_cursor(transaction_service):
+    payload = RequestStatementInterface(
+        account_id=1,
+        start_date=datetime(2023, 1, 1),
+        end_date=datetime(2023, 12, 31),
+        cursor="not-a-cursor",
+    )
+
+    transaction_service._transaction_repository.get_transactions_page = AsyncMock(return_value=[])
+
+    with pytest.raises(InvalidCursor):
+        await transaction_service.get_statement_page(payload)
+
+    transaction_service._transaction_repository.get_transactions_page.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_statement_by_period_csv(transaction_service):
+    # Scenario
+    payload = RequestStatementInterface(
+        account_id=1,
+        start_date=datetime(2023, 1, 1),
+        end_date=datetime(2023, 12, 31)
+    )
+    rows = [
+        {
+            "transaction_id": 2,
+            "account": 1,
+            "amount": Decimal("50.0"),
+            "transaction_type": TransactionType.WITHDRAW.value,
+            "created_at": datetime(2023, 1, 15),
+        },
+        {
+            "transaction_id": 1,
+            "account": 1,
+            "amount": Decimal("100.0"),
+            "transaction_type": TransactionType.DEPOSIT.value,
+            "created_at": datetime(2023, 1, 10),
+        },
+    ]
+
+    transaction_service._account_repository.get_account_by_id = AsyncMock()
+    transaction_service._transaction_repository.get_transactions_page = AsyncMock(
+        return_value=[TransactionInterface(**row) for row in rows]
+    )
+
+    # Action
+    stream = await transaction_service.stream_statement_by_period(payload, StatementExportFormat.CSV)
+    chunks = [chunk async for chunk in stream]
+
+    # Result
+    assert "".join(chunks).splitlines() == [
+        "transaction_id,account,amount,transaction_type,created_at",
+        "2,1,50.0,2,2023-01-15T00:00:00",
+        "1,1,100.0,1,2023-01-10T00:00:00",
+    ]
+    transaction_service._transaction_repository.get_transactions_page.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_statement_by_period_unknown_account(transaction_service):
+    # Scenario
+    payload = RequestStatementInterface(
+        account_id=404,
+        start_date=datetime(2023, 1, 1),
+        end_date=datetime(2023, 12, 31)
+    )
+    transaction_service._account_repository.get_account_by_id = AsyncMock(
+        side_effect=ObjectNotFound(object_name="account_entity")
+    )
+    transaction_service._transaction_repository.get_transactions_page = AsyncMock(return_value=[])
+
+    # Action / Result
+    with pytest.raises(ObjectNotFound):
+        await transaction_service.stream_statement_by_period(payload, StatementExportFormat.NDJSON)
+    transaction_service._transaction_repository.get_transactions_page.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_statement_by_period_fails_on_a_later_chunk(transaction_service):
+    # Scenario
+    payload = RequestStatementInterface(
+        account_id=1,
+        start_date=datetime(2023, 1, 1),
+        end_date=datetime(2023, 12, 31)
+    )
+    row = TransactionInterface(
+        transaction_id=1,
+        account=1,
+        amount=10.0,
+        transaction_type=TransactionType.DEPOSIT.value,
+        created_at=datetime(2023, 1, 10),
+    )
+    transaction_service._account_repository.get_account_by_id = AsyncMock()
+    transaction_service._transaction_repository.get_transactions_page = AsyncMock(
+        side_effect=[[row], Exception("Error")]
+    )
+
+    # Action
+    with patch.object(Settings.get_settings(), "statement_export_chunk_size", 1):
+        stream = await transaction_service.stream_statement_by_period(payload, StatementExportFormat.NDJSON)
+        chunks = []
+        with pytest.raises(Exception, match="Error"):
+            async for chunk in stream:
+                chunks.append(chunk)
+
+    # Result
+    assert len(chunks) == 1
+    assert transaction_service._transaction_repository.get_transactions_page.call_args.kwargs["after"] == (
+        datetime(2023, 1, 10), 1,
     )
+
+
+@pytest.mark.asyncio
+async def test_apply_batch(transaction_service):
+    # Scenario
+    payload = RequestBatchTransactionInterface(items=[
+        {"account_id": 1, "amount": 100.0, "transaction_type": TransactionType.DEPOSIT.value},
+        {"account_id": 1, "amount": 500.0, "transaction_type": TransactionType.WITHDRAW.value},
+    ])
+    transaction = TransactionInterface(
+        transaction_id=1,
+        account=1,
+        amount=100.0,
+        transaction_type=TransactionType.DEPOSIT.value,
+        created_at=datetime.now()
+    )
+
+    transaction_service._transaction_repository.apply_transactions_batch = AsyncMock(
+        return_value=[transaction, InsufficientBalance()]
+    )
+
+    # Action
+    result = await transaction_service.apply_batch(payload)
+
+    # Result
+    assert result.applied == 1
+    assert result.rejected == 1
+    assert result.results[0].transaction == transaction
+    assert result.results[1].error.title == "Insufficient balance"
+    applied = transaction_service._transaction_repository.apply_transactions_batch.call_args.args[0]
+    assert [item.transaction_type for item in applied] == [
+        TransactionType.DEPOSIT.value, TransactionType.WITHDRAW.value
+    ]
@@ -0,0 +1,16 @@
+from app.utils.cpf import cpf_check_digits, generate_cpf
+
+
+def test_cpf_check_digits():
+    # Action / Result
+    assert cpf_check_digits("529982247") == "25"
+    assert cpf_check_digits("000000001") == "91"
+
+
+def test_generate_cpf_is_unique_per_number():
+    # Action
+    cpfs = {generate_cpf(number) for number in range(1000)}
+
+    # Result
+    assert len(cpfs) == 1000
+    assert all(len(cpf) == 11 and cpf.isdigit() for cpf in cpfs)
@@ -0,0 +1,43 @@
+import threading
+
+from app.utils.metrics import MetricsRegistry
+
+
+def test_counter_merges_increments_from_every_thread():
+    # Scenario
+    registry = MetricsRegistry()
+    counter = registry.counter("deposits_total", "Deposits.", ("type",))
+
+    def increment():
+        for _ in range(1000):
+            counter.inc("deposit")
+
+    threads = [threading.Thread(target=increment) for _ in range(8)]
+
+    # Action
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Result
+    assert counter.values() == {("deposit",): 8000}
+    assert 'deposits_total{type="deposit"} 8000' in registry.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    # Scenario
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+
+    # Action
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/v1/accounts/{account_id}")
+    output = registry.render()
+
+    # Result
+    assert 'latency_seconds_bucket{route="/v1/accounts/{account_id}",le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{route="/v1/accounts/{account_id}",le="1"} 3' in output
+    assert 'latency_seconds_bucket{route="/v1/accounts/{account_id}",le="+Inf"} 4' in output
+    assert 'latency_seconds_count{route="/v1/accounts/{account_id}"} 4' in output
+    assert 'latency_seconds_sum{route="/v1/accounts/{account_id}"} 6.05' in output
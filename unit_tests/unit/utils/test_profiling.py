@@ -0,0 +1,55 @@
+import pytest
+
+from app.handlers.http.profiling_handler import ProfilingMiddleware
+from app.utils.profiling import ProfileStore, RequestProfile, current_profile
+
+
+def build_profile(profile_id: str) -> RequestProfile:
+    profile = RequestProfile(profile_id)
+    profile.name = "POST /v1/transactions/withdraw"
+    profile.event_loop_profile.runcall(sorted, range(1000))
+    profile.run_call(sum, range(1000))
+    return profile
+
+
+def test_store_keeps_recent_profiles_and_aggregates_them_per_route():
+    # Scenario
+    store = ProfileStore(max_profiles=1, top_n=5)
+
+    # Action
+    store.add(build_profile("request-1"))
+    store.add(build_profile("request-2"))
+
+    # Result
+    assert [entry["profile_id"] for entry in store.recent(limit=10)] == ["request-2"]
+    assert store.get("request-1") is None
+    functions = [function["function"] for function in store.get("request-2")["top"]]
+    assert any("sorted" in function for function in functions)
+    assert any("sum" in function for function in functions)
+    aggregate = store.aggregate("POST /v1/transactions/withdraw", sort="ncalls")
+    assert aggregate["profiles"] == 2
+    assert store.aggregate("GET /unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_profiles_only_requests_with_the_token():
+    # Scenario
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(current_profile.get())
+
+    store = ProfileStore(max_profiles=10, top_n=5)
+    middleware = ProfilingMiddleware(app, sample_rate=0.0, token="s3cret", store=store)
+
+    def scope(token: bytes):
+        return {"type": "http", "method": "POST", "path": "/", "headers": [(b"x-profile", token)]}
+
+    # Action
+    await middleware(scope(b"wrong"), None, None)
+    await middleware(scope(b"s3cret"), None, None)
+
+    # Result
+    assert seen[0] is None
+    assert isinstance(seen[1], RequestProfile)
+    assert [entry["name"] for entry in store.recent(limit=10)] == ["POST unmatched"]
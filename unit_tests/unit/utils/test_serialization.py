@@ -0,0 +1,37 @@
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.config.enums.account import AccountStates
+from app.interfaces.account import AccountInterface
+from app.interfaces.account_owner import AccountOwnerInterface
+from app.interfaces.transaction import StatementPageInterface, TransactionInterface
+from app.utils import serialization
+
+
+@pytest.mark.parametrize("dumps", [serialization._orjson_dumps, serialization._stdlib_dumps])
+def test_dumps_matches_jsonable_encoder_for_nested_interfaces(dumps):
+    # Scenario
+    owner = AccountOwnerInterface(id=3, name="Maria", cpf="12345678901")
+    account = AccountInterface(
+        account_id=1, checking_account_number=7, account_owner=owner, state=AccountStates.BLOCKED, balance=10.5,
+    )
+    page = StatementPageInterface(
+        transactions=[
+            TransactionInterface(
+                transaction_id=index, account=account, amount=1.25, transaction_type=1,
+                created_at=datetime(2026, 1, 1, 12, 0, 0, 123456),
+            )
+            for index in range(3)
+        ],
+        next_cursor=None,
+    )
+
+    # Action
+    body = dumps(page)
+
+    # Result
+    assert json.loads(body) == jsonable_encoder(page)
+    assert json.loads(dumps([account, {"title": "ok"}])) == [jsonable_encoder(account), {"title": "ok"}]
@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI
+
+from app.utils.startup import StartupReport, install_openapi_cache
+
+
+def test_startup_report_keeps_the_first_duration_of_each_phase():
+    # Scenario
+    report = StartupReport()
+
+    # Action
+    report.add("database", 2.0)
+    report.add("database", 9.0)
+    report.add("schema_check", 0.5)
+
+    # Result
+    assert report.to_dict() == {"phases": {"database": 2.0, "schema_check": 0.5}, "total_ms": 2.5}
+
+
+def test_openapi_schema_is_reused_across_restarts(tmp_path):
+    # Scenario
+    cache_path = str(tmp_path / "openapi.json")
+    first_run = FastAPI(title="Core Accounts API")
+    install_openapi_cache(first_run, cache_path)
+    schema = first_run.openapi()
+    restarted = FastAPI(title="Core Accounts API")
+    generate = MagicMock()
+    restarted.openapi = generate
+    install_openapi_cache(restarted, cache_path)
+
+    # Action
+    cached_schema = restarted.openapi()
+
+    # Result
+    assert cached_schema == schema
+    assert restarted.openapi_schema == schema
+    generate.assert_not_called()
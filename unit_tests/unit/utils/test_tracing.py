@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.utils.tracing import Trace, TraceStore, capture_parents, linked_span, span, start_trace, traced
+
+
+@traced("service")
+async def fetch_account():
+    await asyncio.get_running_loop().run_in_executor(None, lambda: None)
+    with span("sql", "sql", statement="SELECT ?"):
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_spans_are_linked_to_their_parent_within_a_trace():
+    # Scenario
+    trace = Trace("request-1")
+
+    # Action
+    with start_trace(trace), span("http", "http"):
+        await fetch_account()
+    untraced = await fetch_account()
+
+    # Result
+    spans = {span["name"]: span for span in trace.to_dict()["spans"]}
+    assert set(spans) == {"http", "fetch_account", "sql"}
+    assert spans["http"]["parent_id"] is None
+    assert spans["fetch_account"]["parent_id"] == spans["http"]["span_id"]
+    assert spans["sql"]["parent_id"] == spans["fetch_account"]["span_id"]
+    assert spans["sql"]["statement"] == "SELECT ?"
+    assert untraced == 1
+
+
+def test_linked_span_is_recorded_in_every_trace_and_store_keeps_the_latest():
+    # Scenario
+    traces = [Trace(f"request-{index}") for index in range(3)]
+    parents = []
+    for trace in traces:
+        with start_trace(trace):
+            parents.append(capture_parents())
+    store = TraceStore(max_traces=2)
+
+    # Action
+    with linked_span("TransactionWriter.commit", "writer", [*parents, None], batch_size=4):
+        pass
+    for trace in traces:
+        store.add(trace)
+
+    # Result
+    assert all(trace.spans[0]["batch_size"] == 4 for trace in traces)
+    assert [summary["trace_id"] for summary in store.recent(limit=10)] == ["request-2", "request-1"]
+    assert store.get("request-0") is None